@@ -0,0 +1,61 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.api.admission import AdmissionController, AdmissionMetrics
+from app.api.dependencies import get_admission_controller, get_request_profiler
+from app.api.profiling import RequestProfile, RequestProfiler
+
+admin_router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@admin_router.get("/admission")
+async def get_admission_metrics(
+    admission_controller: AdmissionController = Depends(get_admission_controller),
+) -> AdmissionMetrics:
+    """
+    Get the state of the admission control: requests running and queued, and how
+    many were admitted, shed for load, or turned away for their client's rate.
+    """
+    return admission_controller.metrics()
+
+
+@admin_router.get("/profiles")
+async def list_profiles(
+    profiler: RequestProfiler = Depends(get_request_profiler),
+) -> list[RequestProfile]:
+    """
+    List the profiles kept of sampled and slow requests, newest first, with the
+    time each spent in game and storage operations.
+    """
+    return profiler.list_profiles()
+
+
+@admin_router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: Literal["pstats", "text"] = "pstats",
+    limit: int = Query(50, ge=1),
+    profiler: RequestProfiler = Depends(get_request_profiler),
+) -> Response:
+    """
+    Download the cProfile stats of a sampled request: a `pstats` file, to open
+    with `python -m pstats` or snakeviz, or the `limit` functions taking the most
+    cumulative time as text.
+    """
+    profile = profiler.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if not profile.sampled:
+        raise HTTPException(
+            status_code=404,
+            detail="The request was slow but not sampled; it only has its phases.",
+        )
+
+    if format == "text":
+        return Response(profile.stats_text(limit), media_type="text/plain")
+    return Response(
+        profile.stats_bytes(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'},
+    )
@@ -0,0 +1,178 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+
+from pydantic import BaseModel
+
+DEFAULT_CLIENT_RATE = 20.0  # Requests per second, per client.
+DEFAULT_CLIENT_BURST = 40
+DEFAULT_MAX_CLIENTS = 10_000
+DEFAULT_MAX_CONCURRENT = 64
+DEFAULT_MAX_QUEUED = 256
+SHED_RETRY_AFTER = 1  # Seconds.
+
+
+class RateLimitedException(Exception):
+    """Exception raised when a client sends requests faster than its rate."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many requests; retry after {retry_after:.2f}s.")
+        self.retry_after = retry_after
+
+
+class OverloadedException(Exception):
+    """Exception raised when the server sheds a request because it is too busy."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("The server is too busy; try again later.")
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    A token bucket per client: each client may send `burst` requests at once, and
+    `rate` requests per second on average.
+
+    Buckets are refilled lazily when used, so idle clients cost nothing. Only the
+    `max_clients` most recent clients are tracked; a forgotten client starts over
+    with a full bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_CLIENT_RATE,
+        burst: int = DEFAULT_CLIENT_BURST,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.num_limited = 0
+        self._clock = clock
+        # Client -> (tokens, when they were counted).
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    @property
+    def num_clients(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, client: str):
+        """Take a token from the client's bucket.
+
+        :raises RateLimitedException: If the bucket is empty.
+        """
+        now = self._clock()
+        tokens, counted_at = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - counted_at) * self.rate)
+        if tokens < 1:
+            self._buckets[client] = (tokens, now)
+            self.num_limited += 1
+            raise RateLimitedException((1 - tokens) / self.rate)
+        self._buckets[client] = (tokens - 1, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+
+
+class ConcurrencyLimiter:
+    """
+    Runs at most `max_concurrent` requests at once, queueing up to `max_queued` more.
+    Requests arriving to a full queue are shed right away, rather than waiting for
+    seconds behind everyone else.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.num_active = 0
+        self.num_queued = 0
+        self.num_admitted = 0
+        self.num_shed = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the concurrent slots while the block runs.
+
+        :raises OverloadedException: If all slots are taken and the queue is full.
+        """
+        if self._semaphore.locked() and self.num_queued >= self.max_queued:
+            self.num_shed += 1
+            raise OverloadedException(SHED_RETRY_AFTER)
+
+        self.num_queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.num_queued -= 1
+        self.num_active += 1
+        self.num_admitted += 1
+        try:
+            yield
+        finally:
+            self.num_active -= 1
+            self._semaphore.release()
+
+
+class AdmissionMetrics(BaseModel):
+    active: int
+    queued: int
+    admitted: int
+    shed: int
+    rate_limited: int
+    tracked_clients: int
+    max_concurrent: int
+    max_queued: int
+
+
+class AdmissionController:
+    """
+    Decides which requests for expensive work are let in: a client over its rate is
+    turned away first, then the request waits for a concurrent slot or is shed.
+
+    :param rate_limiter: None to not limit the rate of clients.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+    ):
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter or ConcurrencyLimiter()
+
+    @asynccontextmanager
+    async def admit(self, client: str) -> AsyncIterator[None]:
+        """
+        :raises RateLimitedException: If the client is over its rate.
+        :raises OverloadedException: If the server is too busy.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(client)
+        async with self.concurrency_limiter.slot():
+            yield
+
+    def metrics(self) -> AdmissionMetrics:
+        concurrency = self.concurrency_limiter
+        return AdmissionMetrics(
+            active=concurrency.num_active,
+            queued=concurrency.num_queued,
+            admitted=concurrency.num_admitted,
+            shed=concurrency.num_shed,
+            rate_limited=self.rate_limiter.num_limited if self.rate_limiter else 0,
+            tracked_clients=self.rate_limiter.num_clients if self.rate_limiter else 0,
+            max_concurrent=concurrency.max_concurrent,
+            max_queued=concurrency.max_queued,
+        )
+
+
+def retry_after_header(retry_after: float) -> dict[str, str]:
+    """Retry-After is a whole number of seconds."""
+    return {"Retry-After": str(max(1, math.ceil(retry_after)))}
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query, Response
+
+from app.api.dependencies import get_clue_autocomplete
+from app.bll.clue_autocomplete import ClueAutocomplete, DEFAULT_NUM_COMPLETIONS
+
+MAX_NUM_COMPLETIONS = 50
+# The vocabulary only changes on deploy, so clients and proxies may keep answers.
+AUTOCOMPLETE_CACHE_CONTROL = "public, max-age=3600"
+
+clue_router = APIRouter(prefix="/clues", tags=["clues"])
+
+
+@clue_router.get("/autocomplete")
+async def autocomplete_clue(
+    response: Response,
+    prefix: str = Query(min_length=1),
+    limit: int = Query(DEFAULT_NUM_COMPLETIONS, ge=1, le=MAX_NUM_COMPLETIONS),
+    autocomplete: ClueAutocomplete = Depends(get_clue_autocomplete),
+):
+    """
+    Get the top clue words starting with a prefix, most common first.
+    """
+    response.headers["Cache-Control"] = AUTOCOMPLETE_CACHE_CONTROL
+    return {"prefix": prefix, "completions": autocomplete.complete(prefix, limit)}
@@ -1,3 +1,5 @@
+from app.bll.clue_autocomplete import ClueAutocomplete
+from app.bll.clue_validator import ClueVocabulary, InvalidClueException
 from app.bll.game import Game
 from app.bll.game_utils import change_player
 from app.bll.human_players import HumanSpymaster, HumanOperative
@@ -12,15 +14,17 @@ class ConsoleCodenames:
         self.dal = LocalDataAccess("data")
 
     def run_new_game(self):
-        self.game = Game.new_game(self.dal)
+        clue_words = self.dal.load_clue_words()
+        self.game = Game.new_game(self.dal, clue_vocabulary=ClueVocabulary(clue_words))
+        autocomplete = ClueAutocomplete(clue_words)
 
         self.players = {
             AgentType.RED: (
-                HumanSpymaster(AgentType.RED),
+                HumanSpymaster(AgentType.RED, autocomplete),
                 HumanOperative(AgentType.RED),
             ),
             AgentType.BLUE: (
-                HumanSpymaster(AgentType.BLUE),
+                HumanSpymaster(AgentType.BLUE, autocomplete),
                 HumanOperative(AgentType.BLUE),
             ),
         }
@@ -35,21 +39,29 @@ class ConsoleCodenames:
             spymaster, operative = self.players[current_player]
 
             spymaster.prefix_turn(self.game.get_game_description(is_spymaster=True))
-            self.game.set_clue(spymaster.offer_clue())
+            while True:
+                try:
+                    self.game.set_clue(spymaster.offer_clue())
+                    break
+                except InvalidClueException as e:
+                    print(e)
 
             operative.prefix_turn(self.game.get_game_description(is_spymaster=False))
             should_turn_end = False
             while not should_turn_end and not game_end:
+                guess = operative.guess_word(
+                    self.game.get_game_description(is_spymaster=False)
+                )
+                if guess is None:
+                    self.game.end_turn()
+                    break
+
                 (
                     guess_outcome,
                     game_end_status,
                     current_turn_state,
                     should_turn_end,
-                ) = self.game.make_move(
-                    operative.guess_word(
-                        self.game.get_game_description(is_spymaster=False)
-                    )
-                )
+                ) = self.game.make_move(guess)
 
                 if game_end_status != GameEndStatus.ONGOING:
                     game_end = True
@@ -0,0 +1,121 @@
+import os
+from functools import lru_cache
+from typing import AsyncIterator, Optional
+
+from fastapi import Depends, HTTPException, Request
+
+from app.api.admission import (
+    DEFAULT_CLIENT_BURST,
+    DEFAULT_CLIENT_RATE,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MAX_QUEUED,
+    AdmissionController,
+    ConcurrencyLimiter,
+    OverloadedException,
+    RateLimitedException,
+    RateLimiter,
+    retry_after_header,
+)
+from app.api.profiling import RequestProfiler
+from app.api.response_cache import ResponseCache
+from app.bll.clue_autocomplete import ClueAutocomplete
+from app.bll.clue_validator import ClueVocabulary
+from app.bll.game_manager import GameManager
+from app.bll.lobby import Lobby
+from app.bll.types import TurnTimeLimits
+from app.dal.base_data_access import BaseDataAccess
+from app.dal.local_dal import LocalDataAccess
+
+DATA_DIR_ENV_VAR = "CODENAMES_DATA_DIR"
+DEFAULT_DATA_DIR = "data"
+# A client rate of 0 turns rate limiting off.
+CLIENT_RATE_ENV_VAR = "CODENAMES_CLIENT_RATE"
+CLIENT_BURST_ENV_VAR = "CODENAMES_CLIENT_BURST"
+MAX_CONCURRENT_ENV_VAR = "CODENAMES_MAX_CONCURRENT"
+MAX_QUEUED_ENV_VAR = "CODENAMES_MAX_QUEUED"
+# Turns time out only if both limits are set.
+CLUE_SECONDS_ENV_VAR = "CODENAMES_CLUE_SECONDS"
+GUESS_SECONDS_ENV_VAR = "CODENAMES_GUESS_SECONDS"
+# Profiling is off unless a sample rate or a slow request threshold is set.
+PROFILE_SAMPLE_RATE_ENV_VAR = "CODENAMES_PROFILE_SAMPLE_RATE"
+PROFILE_SLOW_SECONDS_ENV_VAR = "CODENAMES_PROFILE_SLOW_SECONDS"
+
+
+@lru_cache(maxsize=None)
+def get_data_access() -> BaseDataAccess:
+    return LocalDataAccess(os.environ.get(DATA_DIR_ENV_VAR, DEFAULT_DATA_DIR))
+
+
+@lru_cache(maxsize=None)
+def get_clue_autocomplete() -> ClueAutocomplete:
+    return ClueAutocomplete(get_data_access().load_clue_words())
+
+
+def get_turn_time_limits() -> Optional[TurnTimeLimits]:
+    clue_seconds = os.environ.get(CLUE_SECONDS_ENV_VAR)
+    guess_seconds = os.environ.get(GUESS_SECONDS_ENV_VAR)
+    if clue_seconds is None or guess_seconds is None:
+        return None
+    return TurnTimeLimits(clue_seconds=clue_seconds, guess_seconds=guess_seconds)
+
+
+@lru_cache(maxsize=None)
+def get_game_manager() -> GameManager:
+    dal = get_data_access()
+    return GameManager(
+        dal,
+        ClueVocabulary(dal.load_clue_words()),
+        turn_time_limits=get_turn_time_limits(),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_lobby() -> Lobby:
+    return Lobby(get_game_manager())
+
+
+@lru_cache(maxsize=None)
+def get_response_cache() -> ResponseCache:
+    return ResponseCache()
+
+
+@lru_cache(maxsize=None)
+def get_admission_controller() -> AdmissionController:
+    rate = float(os.environ.get(CLIENT_RATE_ENV_VAR, DEFAULT_CLIENT_RATE))
+    burst = int(os.environ.get(CLIENT_BURST_ENV_VAR, DEFAULT_CLIENT_BURST))
+    return AdmissionController(
+        RateLimiter(rate, burst) if rate > 0 else None,
+        ConcurrencyLimiter(
+            int(os.environ.get(MAX_CONCURRENT_ENV_VAR, DEFAULT_MAX_CONCURRENT)),
+            int(os.environ.get(MAX_QUEUED_ENV_VAR, DEFAULT_MAX_QUEUED)),
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_request_profiler() -> RequestProfiler:
+    slow_seconds = os.environ.get(PROFILE_SLOW_SECONDS_ENV_VAR)
+    return RequestProfiler(
+        float(os.environ.get(PROFILE_SAMPLE_RATE_ENV_VAR, 0)),
+        None if slow_seconds is None else float(slow_seconds),
+    )
+
+
+async def admit_request(
+    request: Request,
+    admission_controller: AdmissionController = Depends(get_admission_controller),
+) -> AsyncIterator[None]:
+    """Hold the request until it is admitted, or turn it away: 429 when its client
+    is over its rate, 503 when the server is too busy."""
+    client = request.client.host if request.client else "unknown"
+    try:
+        async with admission_controller.admit(client):
+            yield
+    except RateLimitedException as e:
+        raise HTTPException(
+            429, detail=str(e), headers=retry_after_header(e.retry_after)
+        ) from e
+    except OverloadedException as e:
+        raise HTTPException(
+            503, detail=str(e), headers=retry_after_header(e.retry_after)
+        ) from e
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weakly, as for GETs)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, version: Optional[int]) -> Optional[Response]:
+    """
+    :return: A 304 response if the client already has this version, otherwise None.
+    """
+    if version is None:
+        return None
+    etag = make_etag(version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import get_data_access
+from app.bll.game_export import GameExportFilter, iter_exported_games
+from app.bll.types import GameEndStatus
+from app.dal.base_data_access import BaseDataAccess
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+export_router = APIRouter(prefix="/export", tags=["export"])
+
+
+@export_router.get("/games", response_class=StreamingResponse)
+async def export_games(
+    end_status: Optional[list[GameEndStatus]] = Query(None),
+    finished_after: Optional[datetime] = None,
+    finished_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    dal: BaseDataAccess = Depends(get_data_access),
+) -> StreamingResponse:
+    """
+    Stream the finished games as NDJSON, one compact record per game: the board,
+    the placements, the clues and guesses in order, and the winner. Games are in
+    game ID order; to resume an interrupted export, pass the `game_id` of the last
+    record received as the cursor. Dates without a time zone are in UTC.
+    """
+    export_filter = GameExportFilter(
+        end_statuses=end_status,
+        finished_after=finished_after,
+        finished_before=finished_before,
+    )
+    # A plain iterator is run in a thread pool, so the event loop never blocks on
+    # reading games.
+    return StreamingResponse(
+        iter_exported_games(dal, export_filter, cursor), media_type=NDJSON_MEDIA_TYPE
+    )
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.dependencies import admit_request, get_lobby
+from app.api.schemas import JoinLobbyRequest, LobbyTicketResponse
+from app.bll.lobby import Lobby, LobbyException, LobbyTicket
+
+MAX_WAIT_SECONDS = 60
+
+lobby_router = APIRouter(prefix="/lobby", tags=["lobby"])
+
+
+def _ticket_response(ticket: LobbyTicket) -> LobbyTicketResponse:
+    return LobbyTicketResponse(
+        ticket_id=ticket.ticket_id,
+        status="waiting" if ticket.assignment is None else "assigned",
+        assignment=ticket.assignment,
+    )
+
+
+def _get_ticket(lobby: Lobby, ticket_id: str) -> LobbyTicket:
+    try:
+        return lobby.get_ticket(ticket_id)
+    except LobbyException as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+@lobby_router.post("/join", dependencies=[Depends(admit_request)])
+async def join_lobby(
+    request: JoinLobbyRequest,
+    lobby: Lobby = Depends(get_lobby),
+) -> LobbyTicketResponse:
+    """
+    Wait in the lobby for a game, as a spymaster or an operative. When the player
+    completes a group, a game is started for it right away.
+    """
+    try:
+        ticket = await lobby.join(request.role, request.team, request.rating)
+    except LobbyException as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    return _ticket_response(ticket)
+
+
+@lobby_router.get("/tickets/{ticket_id}")
+async def get_ticket(
+    ticket_id: str,
+    wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS),
+    lobby: Lobby = Depends(get_lobby),
+) -> LobbyTicketResponse:
+    """
+    Get whether a player was assigned to a game. Long-polls: waits up to `wait`
+    seconds for the assignment before answering.
+    """
+    ticket = _get_ticket(lobby, ticket_id)
+    if wait:
+        await ticket.wait(wait)
+    return _ticket_response(ticket)
+
+
+@lobby_router.delete("/tickets/{ticket_id}")
+async def leave_lobby(ticket_id: str, lobby: Lobby = Depends(get_lobby)):
+    """
+    Stop waiting in the lobby.
+    """
+    ticket = _get_ticket(lobby, ticket_id)
+    try:
+        lobby.leave(ticket.ticket_id)
+    except LobbyException as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    return {"ticket_id": ticket_id, "message": "Left the lobby."}
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.api.dependencies import get_game_manager, get_response_cache
+from app.api.response_cache import ResponseCache
+from app.bll.clue_validator import get_clue_validator
+from app.bll.game_manager import GameManager
+from app.bll.metrics import ACTIVE_GAMES, CACHE_ENTRIES, REGISTRY
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+metrics_router = APIRouter(tags=["metrics"])
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(
+    game_manager: GameManager = Depends(get_game_manager),
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> PlainTextResponse:
+    """
+    Get the metrics of this worker in the Prometheus text format: request and
+    operation latency histograms, counters of games, moves and wins, and the sizes
+    of the caches.
+    """
+    ACTIVE_GAMES.set(game_manager.num_active_games)
+    CACHE_ENTRIES.labels("hot_games").set(game_manager.num_cached_games)
+    CACHE_ENTRIES.labels("responses").set(len(response_cache))
+    CACHE_ENTRIES.labels("clue_validators").set(
+        get_clue_validator.cache_info().currsize
+    )
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
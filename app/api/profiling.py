@@ -0,0 +1,180 @@
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from pydantic import BaseModel, PrivateAttr
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.bll.metrics import record_phases
+
+DEFAULT_MAX_PROFILES = 50
+
+
+class RequestProfile(BaseModel):
+    profile_id: str
+    method: str
+    path: str
+    status: int
+    started_at: float  # Seconds since the epoch.
+    duration_seconds: float
+    # Whether the request ran under cProfile; slow requests that were not sampled
+    # only have their phases.
+    sampled: bool
+    slow: bool
+    # Seconds spent in game and storage operations, e.g. `make_move`, `dal_save_game`.
+    phase_seconds: dict[str, float]
+
+    _profile: Optional[cProfile.Profile] = PrivateAttr(default=None)
+
+    def stats_bytes(self) -> Optional[bytes]:
+        """The cProfile stats in the format of `pstats` files, or None if the request
+        was not sampled."""
+        if self._profile is None:
+            return None
+        self._profile.create_stats()
+        return marshal.dumps(self._profile.stats)
+
+    def stats_text(self, limit: int) -> Optional[str]:
+        """The functions taking the most cumulative time, as `pstats` prints them, or
+        None if the request was not sampled."""
+        if self._profile is None:
+            return None
+        out = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return out.getvalue()
+
+
+class RequestProfiler:
+    """
+    Profiles a fraction of the requests under cProfile, and keeps the profiles of
+    the sampled and slow requests in a ring buffer.
+
+    Every profiled request records the time spent in each phase (game and storage
+    operations), which works even for the storage calls running in other threads.
+    cProfile only sees the event loop's thread, and everything running on it: the
+    requests interleaved with the sampled one show up too. Only one request is
+    under cProfile at a time, so sampling never stacks profilers.
+
+    :param sample_rate: The fraction of the requests to run under cProfile.
+    :param slow_seconds: Keep the phases of requests taking longer than this, or
+                         None to only keep sampled requests.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        slow_seconds: Optional[float] = None,
+        max_profiles: int = DEFAULT_MAX_PROFILES,
+        random_fraction: Callable[[], float] = random.random,
+    ):
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.max_profiles = max_profiles
+        self._random_fraction = random_fraction
+        self._profiling = False
+        self._profiles: OrderedDict[str, RequestProfile] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.slow_seconds is not None
+
+    def list_profiles(self) -> list[RequestProfile]:
+        """The profiles kept, newest first."""
+        return list(reversed(self._profiles.values()))
+
+    def get_profile(self, profile_id: str) -> Optional[RequestProfile]:
+        return self._profiles.get(profile_id)
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """Start profiling a request if it is sampled.
+
+        :return: The running profiler, or None if the request is not sampled.
+        """
+        if self._profiling or self._random_fraction() >= self.sample_rate:
+            return None
+        self._profiling = True
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish(
+        self,
+        profile: Optional[cProfile.Profile],
+        scope: Scope,
+        status: int,
+        started_at: float,
+        duration_seconds: float,
+        phase_seconds: dict[str, float],
+    ):
+        if profile is not None:
+            profile.disable()
+            self._profiling = False
+        slow = self.slow_seconds is not None and duration_seconds >= self.slow_seconds
+        if profile is None and not slow:
+            return
+
+        request_profile = RequestProfile(
+            profile_id=str(uuid.uuid4()),
+            method=scope["method"],
+            path=scope["path"],
+            status=status,
+            started_at=started_at,
+            duration_seconds=duration_seconds,
+            sampled=profile is not None,
+            slow=slow,
+            phase_seconds=phase_seconds,
+        )
+        request_profile._profile = profile
+        self._profiles[request_profile.profile_id] = request_profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+
+class ProfilingMiddleware:
+    """
+    Runs HTTP requests through a request profiler, when it is enabled.
+
+    :param get_profiler: Returns the profiler; called on every request, so that
+                         the profiler can be configured after the app is built.
+    """
+
+    def __init__(self, app: ASGIApp, get_profiler: Callable[[], RequestProfiler]):
+        self.app = app
+        self.get_profiler = get_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        profiler = self.get_profiler()
+        if scope["type"] != "http" or not profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        with record_phases() as phase_seconds:
+            profile = profiler.start()
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                profiler.finish(
+                    profile,
+                    scope,
+                    status_code,
+                    started_at,
+                    time.perf_counter() - start,
+                    phase_seconds,
+                )
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from typing import Optional
+
+from app.bll.game import Game
+from app.bll.types import Role
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class ResponseCache:
+    """
+    An LRU cache of the serialized views of games, keyed by (game_id, version, view).
+
+    A version never changes once written, so cached bytes never go stale: a newer
+    version is just a different key, and the old entry ages out. Operatives and
+    spectators see the same view and share entries.
+
+    Views are serialized straight to bytes by pydantic-core, which is much faster
+    than FastAPI's default `jsonable_encoder` and `json.dumps` path.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, int, bool], bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(game_id: str, version: int, role: Role) -> tuple[str, int, bool]:
+        return game_id, version, role == Role.SPYMASTER
+
+    def get(self, game_id: str, version: int, role: Role) -> Optional[bytes]:
+        key = self._key(game_id, version, role)
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def get_or_serialize(self, game: Game, role: Role) -> bytes:
+        body = self.get(game.game_id, game.version, role)
+        if body is None:
+            view = game.get_game_description(is_spymaster=role == Role.SPYMASTER)
+            body = view.__pydantic_serializer__.to_json(view)
+            self._entries[self._key(game.game_id, game.version, role)] = body
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
@@ -1,62 +1,247 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
-
-from app.api.schemas import OldGameState
+import asyncio
+from typing import Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+
+from app.api.dependencies import admit_request, get_game_manager, get_response_cache
+from app.api.etags import make_etag, not_modified
+from app.api.response_cache import ResponseCache
+from app.api.schemas import (
+    BatchStartGameRequest,
+    BatchStartGameResponse,
+    ClueMove,
+    GameStatusResponse,
+    GuessMove,
+    GuessesRequest,
+    Move,
+    StartGameRequest,
+    StartGameResponse,
+)
+from app.bll.clue_validator import InvalidClueException
+from app.bll.game import Game, InvalidGuessException
+from app.bll.game_broadcaster import Subscription, serialize_update
+from app.bll.game_manager import GameManager, GuessesResult, MoveResult
+from app.bll.types import GameState, Role
+from app.dal.base_data_access import StaleGameException
 
 game_router = APIRouter(prefix="/game", tags=["game"])
 
 
-# Dictionary to hold mock game data for demonstration
-games: Dict[int, OldGameState] = {}
-game_id_counter = 1
+async def _get_game(
+    game_manager: GameManager, game_id: str, version: Optional[int] = None
+) -> Game:
+    try:
+        return await game_manager.get_game(game_id, version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Game not found") from e
 
 
-@game_router.post("/start")
-async def start_new_game():
-    """
-    Start a new game by creating and initializing the board.
-    """
-    global game_id_counter
-    game_id = game_id_counter
-    game_id_counter += 1
+async def _get_version(game_manager: GameManager, game_id: str) -> int:
+    try:
+        return await game_manager.get_version(game_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Game not found") from e
 
-    # Initialize an empty game board for demonstration purposes
-    games[game_id] = OldGameState(board="Initialized", status="in_progress")
-    return {"game_id": game_id, "message": "Game started!"}
 
-
-@game_router.get("/{game_id}/board")
-async def get_board(game_id: int):
+@game_router.post("/start", dependencies=[Depends(admit_request)])
+async def start_new_game(
+    request: StartGameRequest | None = None,
+    game_manager: GameManager = Depends(get_game_manager),
+) -> StartGameResponse:
     """
-    Retrieve the state of the board for the given game.
+    Start a new game on a random board.
     """
-    game = games.get(game_id)
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
+    request = request or StartGameRequest()
+    game = await game_manager.create_game(random_seed=request.random_seed)
+    return StartGameResponse(game_id=game.game_id)
+
 
-    return {"game_id": game_id, "board": game.board}
+def _json_response(content: bytes | str, version: int) -> Response:
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"ETag": make_etag(version)},
+    )
 
 
-@game_router.post("/{game_id}/play")
-async def play_move(game_id: int, move: Dict[str, Any]):
+@game_router.post("/batch/start", dependencies=[Depends(admit_request)])
+async def start_new_games(
+    request: BatchStartGameRequest,
+    game_manager: GameManager = Depends(get_game_manager),
+) -> BatchStartGameResponse:
     """
-    Submit a clue or guess for the game.
+    Start several new games on random boards at once.
     """
-    game = games.get(game_id)
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
-
-    # TODO: Implement move validation and processing here
-    return {"game_id": game_id, "move": move, "message": "Move processed!"}
+    games = await game_manager.create_games(request.num_games, request.random_seed)
+    return BatchStartGameResponse(game_ids=[game.game_id for game in games])
+
+
+@game_router.get("/{game_id}/board", response_model=Game | GameState)
+async def get_board(
+    game_id: str,
+    request: Request,
+    role: Role = Role.OPERATIVE,
+    game_manager: GameManager = Depends(get_game_manager),
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
+    """
+    Retrieve the game as seen by the given role. Only spymasters see the agent
+    placements. Supports If-None-Match with the game's version as its ETag.
+    """
+    version = await _get_version(game_manager, game_id)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    if (content := response_cache.get(game_id, version, role)) is not None:
+        return _json_response(content, version)
+
+    game = await _get_game(game_manager, game_id, version)
+    if unchanged := not_modified(request, game.version):
+        return unchanged
+    return _json_response(response_cache.get_or_serialize(game, role), game.version)
+
+
+@game_router.post("/{game_id}/play", dependencies=[Depends(admit_request)])
+async def play_move(
+    game_id: str,
+    move: Move,
+    game_manager: GameManager = Depends(get_game_manager),
+) -> MoveResult:
+    """
+    Submit a clue, a guess, or the end of the operatives' turn.
+    """
+    try:
+        if isinstance(move, ClueMove):
+            return await game_manager.give_clue(game_id, move.clue)
+        if isinstance(move, GuessMove):
+            return await game_manager.guess(game_id, move.guess)
+        return await game_manager.end_turn(game_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Game not found") from e
+    except (InvalidClueException, InvalidGuessException, StaleGameException) as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+
+@game_router.post("/{game_id}/moves", dependencies=[Depends(admit_request)])
+async def play_guesses(
+    game_id: str,
+    request: GuessesRequest,
+    game_manager: GameManager = Depends(get_game_manager),
+) -> GuessesResult:
+    """
+    Submit several guesses of the current team at once. They are made in order until
+    one ends the turn; the rest are ignored. If any guess made is invalid, none are.
+    """
+    try:
+        return await game_manager.guesses(game_id, request.guesses)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Game not found") from e
+    except (InvalidGuessException, StaleGameException) as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
 
 
 @game_router.get("/{game_id}")
-async def get_game_status(game_id: int):
+async def get_game_status(
+    game_id: str,
+    request: Request,
+    response: Response,
+    game_manager: GameManager = Depends(get_game_manager),
+) -> GameStatusResponse:
     """
-    Get the current game status, including progress and scores.
+    Get the current game status: whose turn it is and whether the game is over.
+    Supports If-None-Match with the game's version as its ETag.
     """
-    game = games.get(game_id)
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
-
-    return {"game_id": game_id, "status": game.status}
+    version = await _get_version(game_manager, game_id)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    game = await _get_game(game_manager, game_id, version)
+    if unchanged := not_modified(request, game.version):
+        return unchanged
+
+    response.headers["ETag"] = make_etag(game.version)
+    return GameStatusResponse(
+        game_id=game_id,
+        version=game.version,
+        game_end_status=game.game_end_status,
+        current_turn=game.current_turn,
+    )
+
+
+@game_router.get("/{game_id}/updates")
+async def get_updates(
+    game_id: str,
+    request: Request,
+    role: Role = Role.OPERATIVE,
+    since: Optional[int] = Query(None, ge=0),
+    game_manager: GameManager = Depends(get_game_manager),
+):
+    """
+    Get what changed in the game since the client's last known version: a delta of
+    the revealed cards and turn state, or a snapshot of the role's view when the
+    client is too far behind (or sends no version). Supports If-None-Match with the
+    game's version as its ETag.
+    """
+    version = await _get_version(game_manager, game_id)
+    if unchanged := not_modified(request, version):
+        return unchanged
+    game = await _get_game(game_manager, game_id, version)
+    if unchanged := not_modified(request, game.version):
+        return unchanged
+
+    return _json_response(serialize_update(game, role, since), game.version)
+
+
+@game_router.websocket("/{game_id}/ws")
+async def watch_game(
+    websocket: WebSocket,
+    game_id: str,
+    role: Role = Role.SPECTATOR,
+    since: Optional[int] = None,
+    game_manager: GameManager = Depends(get_game_manager),
+):
+    """
+    Push the game's updates to the client: first what it needs to catch up from
+    `since` (a snapshot without it), then a delta after every clue, guess and end of
+    turn.
+    """
+    await websocket.accept()
+    try:
+        subscription = await game_manager.subscribe(game_id, role, since)
+    except FileNotFoundError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    try:
+        sender = asyncio.create_task(_send_updates(websocket, subscription))
+        receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+        done, pending = await asyncio.wait(
+            [sender, receiver], return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        for task in done:
+            try:
+                task.result()
+            except WebSocketDisconnect:
+                pass
+    finally:
+        game_manager.broadcaster.unsubscribe(subscription)
+
+
+async def _send_updates(websocket: WebSocket, subscription: Subscription):
+    while True:
+        await websocket.send_text(await subscription.get())
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
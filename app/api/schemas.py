@@ -1,7 +1,77 @@
-from pydantic import BaseModel
+from typing import Annotated, Literal, Optional, Union
 
+from pydantic import BaseModel, Field
 
-# Pydantic model for the game state
-class OldGameState(BaseModel):
-    board: str
-    status: str
+from app.bll.defaults import DEFAULT_BOARD_SIZE
+from app.bll.lobby import DEFAULT_RATING, Assignment
+from app.bll.types import (
+    Clue,
+    Coordinate,
+    CurrentTurnState,
+    GameEndStatus,
+    Role,
+    TeamColor,
+)
+
+MAX_BATCH_GAMES = 100
+
+
+class StartGameRequest(BaseModel):
+    random_seed: Optional[int] = None
+
+
+class StartGameResponse(BaseModel):
+    game_id: str
+    message: str = "Game started!"
+
+
+class BatchStartGameRequest(BaseModel):
+    num_games: int = Field(ge=1, le=MAX_BATCH_GAMES)
+    random_seed: Optional[int] = None
+
+
+class BatchStartGameResponse(BaseModel):
+    game_ids: list[str]
+    message: str = "Games started!"
+
+
+class ClueMove(BaseModel):
+    type: Literal["clue"] = "clue"
+    clue: Clue
+
+
+class GuessMove(BaseModel):
+    type: Literal["guess"] = "guess"
+    guess: Coordinate
+
+
+class EndTurnMove(BaseModel):
+    type: Literal["end_turn"] = "end_turn"
+
+
+# The body of a move: a spymaster's clue, or an operative's guess or end of turn.
+Move = Annotated[Union[ClueMove, GuessMove, EndTurnMove], Field(discriminator="type")]
+
+
+class GuessesRequest(BaseModel):
+    # A turn cannot have more guesses than there are cards.
+    guesses: list[Coordinate] = Field(min_length=1, max_length=DEFAULT_BOARD_SIZE**2)
+
+
+class GameStatusResponse(BaseModel):
+    game_id: str
+    version: int
+    game_end_status: GameEndStatus
+    current_turn: CurrentTurnState
+
+
+class JoinLobbyRequest(BaseModel):
+    role: Role
+    team: Optional[TeamColor] = None
+    rating: int = Field(DEFAULT_RATING, ge=0)
+
+
+class LobbyTicketResponse(BaseModel):
+    ticket_id: str
+    status: Literal["waiting", "assigned"]
+    assignment: Optional[Assignment] = None
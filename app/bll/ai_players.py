@@ -0,0 +1,331 @@
+from typing import Optional
+
+import numpy as np
+
+from app.bll.ann_index import IVFIndex
+from app.bll.embeddings import WordEmbeddings
+from app.bll.game import Game
+from app.bll.game_utils import change_player
+from app.bll.player import Operative, Spymaster
+from app.bll.similarity_matrix import SimilarityMatrices
+from app.bll.types import AgentType, Clue, Coordinate, GameState, TeamColor
+
+DEFAULT_MAX_NUM_GUESSES = 4
+DEFAULT_CANDIDATES_PER_WORD = 64
+DEFAULT_CONFIDENCE_THRESHOLD = 0.2
+LEGALITY_SLACK = 16
+
+
+class AISpymaster(Spymaster):
+    """
+    A spymaster that picks clues by embedding similarity.
+
+    The whole clue vocabulary is scored against the unrevealed board words with a
+    single (board x vocabulary) matrix multiply. A clue may target as many of its own
+    team's words as are more similar to it than the most dangerous other word
+    (opponent, innocent or black) by at least `margin`.
+
+    When a `clue_index` is given, only the clues it retrieves as nearest neighbours of
+    the team's own words are rescored, instead of the whole vocabulary. When
+    `similarity_matrices` are given, the similarities are sliced from them instead of
+    being computed.
+    """
+
+    def __init__(
+        self,
+        team: TeamColor,
+        embeddings: WordEmbeddings,
+        clue_words: list[str],
+        margin: float = 0.05,
+        innocent_slack: float = 0.05,
+        black_margin: float = 0.1,
+        max_num_guesses: int = DEFAULT_MAX_NUM_GUESSES,
+        clue_index: Optional[IVFIndex] = None,
+        candidates_per_word: int = DEFAULT_CANDIDATES_PER_WORD,
+        similarity_matrices: Optional[SimilarityMatrices] = None,
+    ):
+        super().__init__(team)
+
+        self.embeddings = embeddings
+        self.clue_words = [word for word in clue_words if word in embeddings]
+        self.clue_vectors = embeddings.vectors_for(self.clue_words)
+        self._clue_index = {
+            WordEmbeddings.normalize_word(word): i
+            for i, word in enumerate(self.clue_words)
+        }
+
+        self.margin = margin
+        self.innocent_slack = innocent_slack
+        self.black_margin = black_margin
+        self.max_num_guesses = max_num_guesses
+
+        self.clue_index = clue_index
+        self.candidates_per_word = candidates_per_word
+        if clue_index is not None:
+            self._index_to_clue_id = np.array(
+                [
+                    self._clue_index.get(WordEmbeddings.normalize_word(word), -1)
+                    for word in clue_index.words
+                ],
+                dtype=np.int64,
+            )
+
+        if (
+            similarity_matrices is not None
+            and similarity_matrices.clue_words != self.clue_words
+        ):
+            raise ValueError(
+                "The similarity matrices were built for a different clue vocabulary."
+            )
+        self.similarity_matrices = similarity_matrices
+
+        self.current_turn = {}
+
+    def prefix_turn(self, game: Game):
+        self.current_turn["game"] = game
+
+    def offer_clue(self) -> Clue:
+        """
+        :raises ValueError: If none of the clue words is a legal clue for the board.
+        """
+        ranked = self.rank_clues(self.current_turn["game"], top_k=1)
+        if not ranked:
+            raise ValueError("There is no legal clue for this board in the clue words.")
+        clue, _ = ranked[0]
+        return clue
+
+    def rank_clues(
+        self, game: Game, top_k: int = 10, team: Optional[TeamColor] = None
+    ) -> list[tuple[Clue, float]]:
+        """Rank the best clues for the current board, best first.
+
+        :param game: The full game, including the agent placements.
+        :param top_k: How many clues to return.
+        :param team: The team to clue for, defaults to the spymaster's own team.
+        :return: A list of (clue, score) pairs sorted by descending score; empty when
+                 no clue word is a legal clue.
+        """
+        team = team or self.team
+        words_by_type = self._unrevealed_words_by_type(game)
+        own_words = words_by_type[team]
+        if not own_words:
+            raise ValueError(f"{team} has no unrevealed words left to clue.")
+        if not self.clue_words:
+            return []
+
+        groups = [
+            own_words,
+            words_by_type[change_player(team)],
+            words_by_type[AgentType.INNOCENT],
+            words_by_type[AgentType.BLACK],
+        ]
+        board_words = [word for group in groups for word in group]
+        board_vectors = self.embeddings.vectors_for(board_words)
+
+        candidate_ids = self._candidate_clue_ids(board_vectors[: len(own_words)])
+        similarities = self._board_clue_similarities(
+            board_words, board_vectors, candidate_ids
+        )
+        scores, num_guesses = self._score_clues(
+            similarities, [len(group) for group in groups]
+        )
+
+        # Board words (and their other forms) are dropped while picking the top
+        # clues; look a bit past `top_k` so that usually one pass is enough.
+        pool_size = min(top_k + LEGALITY_SLACK, len(scores))
+        while True:
+            pool = np.argpartition(-scores, pool_size - 1)[:pool_size]
+            ranked = []
+            for index in pool[np.argsort(-scores[pool])]:
+                word = self.clue_words[
+                    index if candidate_ids is None else candidate_ids[index]
+                ]
+                if game.clue_validator.is_legal(word):
+                    clue = Clue(clue=word, num_guesses=int(num_guesses[index]))
+                    ranked.append((clue, float(scores[index])))
+            if len(ranked) >= top_k or pool_size == len(scores):
+                return ranked[:top_k]
+            pool_size = min(2 * pool_size, len(scores))
+
+    def _board_clue_similarities(
+        self,
+        board_words: list[str],
+        board_vectors: np.ndarray,
+        candidate_ids: np.ndarray | None,
+    ) -> np.ndarray:
+        """
+        Slice the precomputed similarities when every board word has a row in them,
+        and fall back to multiplying the embeddings otherwise.
+        """
+        if self.similarity_matrices is not None and all(
+            word in self.similarity_matrices for word in board_words
+        ):
+            return self.similarity_matrices.card_clue_similarities(
+                board_words, candidate_ids
+            )
+
+        clue_vectors = (
+            self.clue_vectors
+            if candidate_ids is None
+            else self.clue_vectors[candidate_ids]
+        )
+        return board_vectors @ clue_vectors.T
+
+    def _candidate_clue_ids(self, own_vectors: np.ndarray) -> np.ndarray | None:
+        """Retrieve the clues worth exact rescoring from the nearest-neighbour index.
+
+        :param own_vectors: The vectors of the team's unrevealed words.
+        :return: Sorted positions in `self.clue_words`, or None to score every clue.
+        """
+        if self.clue_index is None:
+            return None
+
+        index_ids, _ = self.clue_index.search(own_vectors, k=self.candidates_per_word)
+        clue_ids = self._index_to_clue_id[index_ids[index_ids >= 0]]
+        clue_ids = np.unique(clue_ids[clue_ids >= 0])
+        return clue_ids if len(clue_ids) > 0 else None
+
+    def _score_clues(
+        self, similarities: np.ndarray, group_sizes: list[int]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score every clue (column) of a (board words x clues) similarity matrix.
+
+        Board words are the rows so that every reduction below runs over contiguous
+        memory, which matters with a 100k-word vocabulary.
+
+        :param similarities: Similarities with the rows ordered as own, opponent,
+                             innocent and black words.
+        :param group_sizes: The number of rows of each of the four groups.
+        :return: The score and the number of guesses to announce for every clue.
+        """
+        bounds = np.cumsum([0, *group_sizes])
+        num_clues = similarities.shape[1]
+
+        def group_max(group: int, offset: float) -> np.ndarray:
+            start, end = bounds[group], bounds[group + 1]
+            if start == end:
+                return np.full(num_clues, -1.0, dtype=np.float32)
+            return similarities[start:end].max(axis=0) + offset
+
+        danger = np.maximum.reduce(
+            [
+                group_max(1, 0.0),
+                group_max(2, -self.innocent_slack),
+                group_max(3, self.black_margin),
+            ]
+        )
+
+        own = similarities[: bounds[1]]
+        is_target = own > danger + self.margin
+        num_guesses = np.minimum(is_target.sum(axis=0), self.max_num_guesses)
+        weakest_target = np.where(is_target, own, np.inf).min(axis=0)
+        separation = np.where(num_guesses > 0, weakest_target, own.max(axis=0)) - danger
+        return num_guesses + separation, np.maximum(num_guesses, 1)
+
+    @staticmethod
+    def _unrevealed_words_by_type(game: Game) -> dict[AgentType, list[str]]:
+        words_by_type = {
+            AgentType.RED: [],
+            AgentType.BLUE: [],
+            AgentType.INNOCENT: [],
+            AgentType.BLACK: [],
+        }
+        board = game.board
+        for x, row in enumerate(board.words):
+            for y, card in enumerate(row):
+                if card.card_type == AgentType.UNKNOWN:
+                    agent_type = board.agent_placements.shadow_board[x][y]
+                    words_by_type[agent_type].append(card.word)
+        return words_by_type
+
+
+class AIOperative(Operative):
+    """
+    An operative that guesses the unrevealed cards most similar to the clue.
+
+    The unrevealed cards are ranked against the clue once, when the clue is first
+    seen, and the ranking is reused for the rest of the turn, so every later guess
+    only advances a cursor. Guessing stops when the clue's number of guesses was used
+    up, or when the next card's similarity falls below `confidence_threshold` (the
+    first guess of a turn is always made).
+
+    Only the operative's view of the game (`GameState`) is used.
+    """
+
+    def __init__(
+        self,
+        team: TeamColor,
+        embeddings: WordEmbeddings,
+        confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        similarity_matrices: Optional[SimilarityMatrices] = None,
+    ):
+        super().__init__(team)
+
+        self.embeddings = embeddings
+        self.confidence_threshold = confidence_threshold
+        self.similarity_matrices = similarity_matrices
+
+        self.current_turn = {}
+        self._ranking_key = None
+        self._ranking: list[tuple[Coordinate, float]] = []
+        self._next_guess = 0
+
+    def prefix_turn(self, game: GameState):
+        self.current_turn["game"] = game
+
+    def guess_word(self, game: GameState) -> Coordinate | None:
+        self.current_turn["game"] = game
+
+        turn = game.current_turn
+        if turn.clue is None or turn.guesses_made >= turn.clue.num_guesses:
+            return None
+
+        ranking_key = (game.game_id, turn.team, turn.clue.clue, turn.clue.num_guesses)
+        if ranking_key != self._ranking_key or turn.guesses_made == 0:
+            self._ranking = self.rank_cards(game)
+            self._ranking_key = ranking_key
+            self._next_guess = 0
+
+        # Skip cards that were revealed since the ranking was made.
+        while self._next_guess < len(self._ranking):
+            coordinate, similarity = self._ranking[self._next_guess]
+            if game.words[coordinate.x][coordinate.y].card_type == AgentType.UNKNOWN:
+                break
+            self._next_guess += 1
+        else:
+            return None
+
+        if turn.guesses_made > 0 and similarity < self.confidence_threshold:
+            return None
+
+        self._next_guess += 1
+        return coordinate
+
+    def rank_cards(self, game: GameState) -> list[tuple[Coordinate, float]]:
+        """Rank the unrevealed cards by their similarity to the current clue.
+
+        :param game: The operative's view of the game.
+        :return: A list of (coordinate, similarity) pairs, most similar first.
+        """
+        coordinates = []
+        words = []
+        for x, row in enumerate(game.words):
+            for y, card in enumerate(row):
+                if card.card_type == AgentType.UNKNOWN:
+                    coordinates.append(Coordinate(x=x, y=y))
+                    words.append(card.word)
+
+        similarities = self._clue_similarities(game.current_turn.clue.clue, words)
+        order = np.argsort(-similarities, kind="stable")
+        return [(coordinates[i], float(similarities[i])) for i in order]
+
+    def _clue_similarities(self, clue: str, words: list[str]) -> np.ndarray:
+        matrices = self.similarity_matrices
+        if matrices is not None and all(word in matrices for word in words):
+            clue_id = matrices.clue_id(clue)
+            if clue_id is not None:
+                return matrices.card_clue_similarities(words, np.array([clue_id]))[:, 0]
+
+        return (
+            self.embeddings.vectors_for(words) @ self.embeddings.vectors_for([clue])[0]
+        )
@@ -0,0 +1,180 @@
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.bll.embeddings import WordEmbeddings
+
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_SIZE = 20_000
+ASSIGNMENT_CHUNK_SIZE = 8192
+
+
+class IVFIndex:
+    """
+    An inverted-file (IVF) approximate nearest-neighbour index over unit vectors.
+
+    The vectors are clustered with spherical k-means, and stored grouped by their
+    closest centroid. A query only scans the `nprobe` lists whose centroids are most
+    similar to it, so `nprobe` trades recall (higher) against latency (lower).
+    """
+
+    def __init__(
+        self,
+        words: list[str],
+        centroids: np.ndarray,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        list_offsets: np.ndarray,
+        nprobe: int = DEFAULT_NPROBE,
+    ):
+        self.words = list(words)
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.list_offsets = list_offsets
+        self.nprobe = nprobe
+
+    @property
+    def num_lists(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(
+        cls,
+        words: list[str],
+        vectors: np.ndarray,
+        num_lists: Optional[int] = None,
+        random_seed: Optional[int] = None,
+    ) -> "IVFIndex":
+        """Cluster the vectors and build the inverted lists.
+
+        :param words: The word of every vector, stored so the index is self-describing.
+        :param vectors: A (num_words, dim) matrix of unit-normalized vectors.
+        :param num_lists: The number of clusters, defaults to sqrt(num_words).
+        :param random_seed: Seed for the k-means initialization.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if num_lists is None:
+            num_lists = max(1, int(np.sqrt(len(vectors))))
+        num_lists = min(num_lists, len(vectors))
+
+        rng = np.random.default_rng(random_seed)
+        sample = vectors[
+            rng.choice(
+                len(vectors), min(len(vectors), KMEANS_SAMPLE_SIZE), replace=False
+            )
+        ]
+        centroids = sample[rng.choice(len(sample), num_lists, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = (sample @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid.
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        assignments = np.concatenate(
+            [
+                (vectors[i : i + ASSIGNMENT_CHUNK_SIZE] @ centroids.T).argmax(axis=1)
+                for i in range(0, len(vectors), ASSIGNMENT_CHUNK_SIZE)
+            ]
+        )
+        ids = np.argsort(assignments, kind="stable")
+        list_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(assignments, minlength=num_lists))]
+        )
+        return cls(
+            words=words,
+            centroids=centroids.astype(np.float32),
+            vectors=np.ascontiguousarray(vectors[ids]),
+            ids=ids,
+            list_offsets=list_offsets,
+        )
+
+    @classmethod
+    def from_embeddings(
+        cls, embeddings: WordEmbeddings, words: list[str], **kwargs
+    ) -> "IVFIndex":
+        words = [word for word in words if word in embeddings]
+        return cls.build(words, embeddings.vectors_for(words), **kwargs)
+
+    def search(
+        self, queries: np.ndarray, k: int, nprobe: Optional[int] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the approximate top-k most similar vectors for every query.
+
+        :param queries: A (num_queries, dim) matrix of unit-normalized queries.
+        :param k: How many neighbours to return per query.
+        :param nprobe: How many inverted lists to scan, defaults to `self.nprobe`.
+        :return: (ids, similarities), both (num_queries, k), best first. Rows are
+                 padded with -1 ids and -inf similarities when the probed lists hold
+                 fewer than k vectors.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        nprobe = min(nprobe or self.nprobe, self.num_lists)
+
+        result_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        result_similarities = np.full((len(queries), k), -np.inf, dtype=np.float32)
+
+        centroid_similarities = queries @ self.centroids.T
+        probed_lists = np.argpartition(-centroid_similarities, nprobe - 1, axis=1)[
+            :, :nprobe
+        ]
+        for row, (query, lists) in enumerate(zip(queries, probed_lists)):
+            starts = self.list_offsets[lists]
+            ends = self.list_offsets[lists + 1]
+            similarities = np.concatenate(
+                [self.vectors[start:end] @ query for start, end in zip(starts, ends)]
+            )
+            top = min(k, len(similarities))
+            if top == 0:
+                continue
+            best = np.argpartition(-similarities, top - 1)[:top]
+            best = best[np.argsort(-similarities[best])]
+            positions = np.concatenate(
+                [np.arange(start, end) for start, end in zip(starts, ends)]
+            )
+            result_ids[row, :top] = self.ids[positions[best]]
+            result_similarities[row, :top] = similarities[best]
+
+        return result_ids, result_similarities
+
+    def save(self, path: Path | str):
+        np.savez(
+            path,
+            words=np.asarray(self.words),
+            centroids=self.centroids,
+            vectors=self.vectors,
+            ids=self.ids,
+            list_offsets=self.list_offsets,
+        )
+
+    @classmethod
+    def load(cls, path: Path | str, nprobe: int = DEFAULT_NPROBE) -> "IVFIndex":
+        with np.load(path) as data:
+            return cls(
+                words=data["words"].tolist(),
+                centroids=data["centroids"],
+                vectors=data["vectors"],
+                ids=data["ids"],
+                list_offsets=data["list_offsets"],
+                nprobe=nprobe,
+            )
+
+
+if __name__ == "__main__":
+    from app.dal.local_dal import LocalDataAccess
+
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "data"
+    dal = LocalDataAccess(data_dir)
+    index = IVFIndex.from_embeddings(
+        dal.load_word_embeddings(), dal.load_clue_words(), random_seed=0
+    )
+    dal.save_clue_index(index)
+    print(
+        f"Indexed {len(index.words)} clue words into {index.num_lists} lists "
+        f"under {data_dir}."
+    )
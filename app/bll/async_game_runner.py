@@ -0,0 +1,79 @@
+import asyncio
+from typing import Iterable, Optional
+
+from app.bll.async_players import AsyncOperative, AsyncSpymaster
+from app.bll.game import Game
+from app.bll.game_runner import DEFAULT_MAX_TURNS
+from app.bll.types import GameEndStatus, TeamColor
+
+AsyncPlayers = dict[TeamColor, tuple[AsyncSpymaster, AsyncOperative]]
+
+
+async def play_guesses(game: Game, operative: AsyncOperative) -> GameEndStatus:
+    """Let the operative guess until their turn is over, see game_runner.play_guesses."""
+    await operative.prefix_turn(game.get_game_description(is_spymaster=False))
+    while True:
+        guess = await operative.guess_word(
+            game.get_game_description(is_spymaster=False)
+        )
+        if guess is None:
+            game.end_turn()
+            return GameEndStatus.ONGOING
+
+        _, game_end_status, _, is_turn_over = game.make_move(guess)
+        if game_end_status != GameEndStatus.ONGOING or is_turn_over:
+            return game_end_status
+
+
+async def play_turn(
+    game: Game, spymaster: AsyncSpymaster, operative: AsyncOperative
+) -> GameEndStatus:
+    """Play one full turn, see game_runner.play_turn."""
+    await spymaster.prefix_turn(game.get_game_description(is_spymaster=True))
+    game.set_clue(await spymaster.offer_clue())
+    return await play_guesses(game, operative)
+
+
+async def play_game(
+    game: Game, players: AsyncPlayers, max_turns: int = DEFAULT_MAX_TURNS
+) -> tuple[TeamColor | None, GameEndStatus, int]:
+    """Play a game to the end, see game_runner.play_game."""
+    game_end_status = GameEndStatus.ONGOING
+    num_turns = 0
+    while game_end_status == GameEndStatus.ONGOING and num_turns < max_turns:
+        team = game.current_turn.team
+        game_end_status = await play_turn(game, *players[team])
+        num_turns += 1
+
+    return game.winner, game_end_status, num_turns
+
+
+async def play_games(
+    games: Iterable[tuple[Game, AsyncPlayers]],
+    max_concurrency: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> list[tuple[TeamColor | None, GameEndStatus, int] | BaseException]:
+    """Play many games concurrently in the running event loop.
+
+    Every game is a task that awaits its current player, so a slow player only holds
+    up its own game.
+
+    :param games: (game, players) pairs to play.
+    :param max_concurrency: How many games may be in progress at once (unbounded by
+                            default).
+    :param max_turns: A safety limit on the number of turns of every game.
+    :return: The result of every game (as returned by `play_game`), in order. A game
+             that raised has its exception in place of a result, so one failing
+             player doesn't cancel the other games.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def run(game: Game, players: AsyncPlayers):
+        if semaphore is None:
+            return await play_game(game, players, max_turns=max_turns)
+        async with semaphore:
+            return await play_game(game, players, max_turns=max_turns)
+
+    return await asyncio.gather(
+        *(run(game, players) for game, players in games), return_exceptions=True
+    )
@@ -0,0 +1,103 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+from app.bll.game import Game
+from app.bll.player import Operative, Player, Spymaster
+from app.bll.types import Clue, Coordinate, GameState, TeamColor
+
+
+class AsyncSpymaster(Player, ABC):
+    """
+    A Spymaster whose turns are awaited, so that waiting on a human or a remote bot
+    doesn't block other games running in the same event loop.
+    """
+
+    @abstractmethod
+    async def prefix_turn(self, game: Game):
+        pass
+
+    @abstractmethod
+    async def offer_clue(self) -> Clue:
+        """Offers a clue to the Operative(s) based on the current board state.
+        :return: An instance of the Clue class.
+        """
+        pass
+
+
+class AsyncOperative(Player, ABC):
+    """
+    An Operative whose guesses are awaited, see AsyncSpymaster.
+    """
+
+    @abstractmethod
+    async def prefix_turn(self, game: GameState):
+        pass
+
+    @abstractmethod
+    async def guess_word(self, game: GameState) -> Coordinate | None:
+        """Guess a word on the board based on the given clue.
+
+        :param game: The current state of the game visible to the Operative.
+        :return: The coordinate of the guessed word or None if no guess is made.
+        """
+        pass
+
+
+async def _call(function: Callable, *args, run_in_thread: bool) -> Any:
+    if run_in_thread:
+        return await asyncio.to_thread(function, *args)
+    return function(*args)
+
+
+class SyncSpymasterAdapter(AsyncSpymaster):
+    """
+    Wraps a synchronous Spymaster. With `run_in_thread` (the default) its calls run
+    in the default executor, so blocking players (e.g. console input) don't stall the
+    event loop; fast bots can run inline to skip the thread hand-off.
+    """
+
+    def __init__(self, spymaster: Spymaster, run_in_thread: bool = True):
+        super().__init__(spymaster.team)
+
+        self.spymaster = spymaster
+        self.run_in_thread = run_in_thread
+
+    async def prefix_turn(self, game: Game):
+        await _call(self.spymaster.prefix_turn, game, run_in_thread=self.run_in_thread)
+
+    async def offer_clue(self) -> Clue:
+        return await _call(self.spymaster.offer_clue, run_in_thread=self.run_in_thread)
+
+
+class SyncOperativeAdapter(AsyncOperative):
+    """
+    Wraps a synchronous Operative, see SyncSpymasterAdapter.
+    """
+
+    def __init__(self, operative: Operative, run_in_thread: bool = True):
+        super().__init__(operative.team)
+
+        self.operative = operative
+        self.run_in_thread = run_in_thread
+
+    async def prefix_turn(self, game: GameState):
+        await _call(self.operative.prefix_turn, game, run_in_thread=self.run_in_thread)
+
+    async def guess_word(self, game: GameState) -> Coordinate | None:
+        return await _call(
+            self.operative.guess_word, game, run_in_thread=self.run_in_thread
+        )
+
+
+def to_async_players(
+    players: dict[TeamColor, tuple[Spymaster, Operative]], run_in_thread: bool = True
+) -> dict[TeamColor, tuple[AsyncSpymaster, AsyncOperative]]:
+    """Wrap the synchronous players of every team for the async game runner."""
+    return {
+        team: (
+            SyncSpymasterAdapter(spymaster, run_in_thread=run_in_thread),
+            SyncOperativeAdapter(operative, run_in_thread=run_in_thread),
+        )
+        for team, (spymaster, operative) in players.items()
+    }
@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 
 from app.bll.defaults import DEFAULT_BOARD_SIZE
 from app.bll.game_utils import get_empty_board
+from app.bll.metrics import timed_operation
 from app.bll.types import AgentType, Coordinate, GameEndStatus, Card
 
 
@@ -71,6 +72,9 @@ class Board(BaseModel):
     ):
         if len(words) == 0 or any(len(row) != len(words) for row in words):
             raise ValueError("The words array must be a square array.")
+        # Stored games come back as plain dicts.
+        if not isinstance(agent_placements, AgentPlacements):
+            agent_placements = AgentPlacements.model_validate(agent_placements)
 
         super().__init__(
             words=deepcopy(words),
@@ -126,6 +130,7 @@ class Board(BaseModel):
         self.discovered_agents.append(coordinate)
         return agent_type
 
+    @timed_operation("check_game_end")
     def check_game_end(self) -> GameEndStatus:
         """
         Check if the game has ended and return the result as a GameEndStatus.
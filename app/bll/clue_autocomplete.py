@@ -0,0 +1,69 @@
+import bisect
+from functools import lru_cache
+from typing import Iterable
+
+import numpy as np
+
+from app.bll.clue_validator import normalize_clue_word
+
+DEFAULT_NUM_COMPLETIONS = 10
+DEFAULT_CACHE_SIZE = 4096
+
+
+class ClueAutocomplete:
+    """
+    Completes prefixes of clue words, for spymasters typing their clues.
+
+    The vocabulary is kept as a sorted array, so the words starting with a prefix are
+    the contiguous range found by two binary searches. Completions are ranked by the
+    order of the vocabulary (most common words first in our word lists), and the
+    completions of recent prefixes are cached, since many players type the same
+    first letters.
+    """
+
+    def __init__(self, words: Iterable[str], cache_size: int = DEFAULT_CACHE_SIZE):
+        ranks = {}
+        for word in map(normalize_clue_word, words):
+            if word:
+                ranks.setdefault(word, len(ranks))
+
+        self.words = sorted(ranks)
+        self.ranks = np.array([ranks[word] for word in self.words], dtype=np.int64)
+        self._cached_complete = lru_cache(maxsize=cache_size)(self._complete)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """
+        :return: The [start, end) positions of the words starting with `prefix`.
+        """
+        start = bisect.bisect_left(self.words, prefix)
+        # Every word starting with the prefix sorts before the prefix followed by the
+        # highest code point.
+        end = bisect.bisect_left(self.words, prefix + chr(0x10FFFF), lo=start)
+        return start, end
+
+    def complete(
+        self, prefix: str, limit: int = DEFAULT_NUM_COMPLETIONS
+    ) -> tuple[str, ...]:
+        """The top completions of a prefix.
+
+        :param prefix: The typed prefix.
+        :param limit: The maximal number of completions.
+        :return: Up to `limit` words starting with the prefix, most common first.
+        """
+        return self._cached_complete(normalize_clue_word(prefix), limit)
+
+    def _complete(self, prefix: str, limit: int) -> tuple[str, ...]:
+        start, end = self.prefix_range(prefix)
+        if start == end or limit <= 0:
+            return ()
+
+        ranks = self.ranks[start:end]
+        if len(ranks) > limit:
+            best = np.argpartition(ranks, limit - 1)[:limit]
+        else:
+            best = np.arange(len(ranks))
+        best = best[np.argsort(ranks[best])]
+        return tuple(self.words[start + i] for i in best)
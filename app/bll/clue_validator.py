@@ -0,0 +1,166 @@
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from app.bll.types import Clue
+
+MIN_FORM_LENGTH = 3
+VALIDATOR_CACHE_SIZE = 1024
+# Inflection suffixes, longest first, each with what replaces it.
+SUFFIXES = [("ies", "y"), ("ing", ""), ("es", ""), ("ed", ""), ("s", "")]
+
+
+class InvalidClueException(Exception):
+    """Exception raised for clues that break the rules of the game."""
+
+    pass
+
+
+def normalize_clue_word(word: str) -> str:
+    return word.strip().lower()
+
+
+def stem(word: str) -> str:
+    """
+    A light suffix-stripping stemmer, enough to tell that "apples" and "apple" or
+    "cities" and "city" are forms of the same word.
+    """
+    for suffix, replacement in SUFFIXES:
+        if (
+            word.endswith(suffix)
+            and not word.endswith("ss")
+            and len(word) - len(suffix) >= MIN_FORM_LENGTH
+        ):
+            word = word[: -len(suffix)] + replacement
+            break
+    if word.endswith("e") and len(word) > MIN_FORM_LENGTH:
+        word = word[:-1]
+    return word
+
+
+class ClueVocabulary:
+    """
+    The set of words allowed as clues. Built once (from `load_clue_words()`) and
+    shared by all games; membership costs one hash of the clue.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self.words = frozenset(normalize_clue_word(word) for word in words)
+
+    def __contains__(self, word: str) -> bool:
+        return normalize_clue_word(word) in self.words
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __deepcopy__(self, memo):
+        # Immutable, so copied games can share it.
+        return self
+
+
+class _WordMatcher:
+    """
+    An Aho-Corasick automaton over a set of patterns, answering "does this text
+    contain any of the patterns" in a single pass over the text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._is_match = [False]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._is_match.append(False)
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._is_match[state] = True
+
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._is_match[next_state] |= self._is_match[self._fail[next_state]]
+                queue.append(next_state)
+
+    def contains_any(self, text: str) -> bool:
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._is_match[state]:
+                return True
+        return False
+
+
+class ClueValidator:
+    """
+    Checks clues against the rules, for one board.
+
+    A clue is illegal when it is not a single word, is not in the clue vocabulary
+    (when one is given), or is a form of a board word: the word itself, a word with
+    the same stem, a part of a board word, or a word containing a board word.
+    Everything derived from the board is indexed when the validator is built,
+    so a check costs O(len(clue)) whatever the board and vocabulary sizes.
+    """
+
+    def __init__(
+        self, board_words: Iterable[str], vocabulary: Optional[ClueVocabulary] = None
+    ):
+        board_words = {normalize_clue_word(word) for word in board_words}
+
+        self.vocabulary = vocabulary
+        self._stems = {stem(word) for word in board_words}
+        self._board_parts = {
+            word[start:end]
+            for word in board_words
+            for start in range(len(word))
+            for end in range(start + MIN_FORM_LENGTH, len(word) + 1)
+        }
+        self._board_matcher = _WordMatcher(board_words)
+
+    def check(self, word: str) -> str | None:
+        """
+        :return: Why the clue word is illegal, or None if it is legal.
+        """
+        word = normalize_clue_word(word)
+        if not word or any(char.isspace() for char in word):
+            return "A clue must be a single word."
+        if self.vocabulary is not None and word not in self.vocabulary.words:
+            return f'"{word}" is not an allowed clue word.'
+        if (
+            word in self._board_parts
+            or stem(word) in self._stems
+            or self._board_matcher.contains_any(word)
+        ):
+            return f'"{word}" is a form of a word on the board.'
+        return None
+
+    def is_legal(self, word: str) -> bool:
+        return self.check(word) is None
+
+    def validate(self, clue: Clue):
+        """
+        :raises InvalidClueException: If the clue is illegal.
+        """
+        reason = self.check(clue.clue)
+        if reason is not None:
+            raise InvalidClueException(reason)
+        if clue.num_guesses < 0:
+            raise InvalidClueException("The number of guesses can't be negative.")
+
+
+@lru_cache(maxsize=VALIDATOR_CACHE_SIZE)
+def get_clue_validator(
+    board_words: tuple[str, ...], vocabulary: Optional[ClueVocabulary] = None
+) -> ClueValidator:
+    """
+    The validator of a board. Validators are cached, so a board is indexed once
+    rather than on every clue, however many times its game is loaded or copied.
+    """
+    return ClueValidator(board_words, vocabulary)
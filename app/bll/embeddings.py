@@ -0,0 +1,79 @@
+from typing import Iterable
+
+import numpy as np
+
+
+class WordEmbeddings:
+    """
+    A read-only table of unit-normalized word vectors.
+
+    Rows are L2-normalized on construction, so the dot product of two rows is their
+    cosine similarity. Lookups are case-insensitive.
+    """
+
+    def __init__(self, words: list[str], vectors: np.ndarray):
+        if len(words) != len(vectors):
+            raise ValueError(
+                f"Got {len(words)} words but {len(vectors)} embedding vectors."
+            )
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        self.words = [self.normalize_word(word) for word in words]
+        self.vectors = np.ascontiguousarray(vectors / norms)
+        self._index = {word: i for i, word in enumerate(self.words)}
+
+    @staticmethod
+    def normalize_word(word: str) -> str:
+        return word.strip().lower()
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return self.normalize_word(word) in self._index
+
+    def index_of(self, word: str) -> int | None:
+        return self._index.get(self.normalize_word(word))
+
+    def vectors_for(self, words: Iterable[str]) -> np.ndarray:
+        """
+        Gather the vectors of the given words into a single matrix.
+
+        :param words: The words to look up.
+        :return: A (len(words), dim) float32 matrix. Unknown words get a zero vector,
+                 so they are equally (dis)similar to everything.
+        """
+        words = list(words)
+        result = np.zeros((len(words), self.dim), dtype=np.float32)
+        for row, word in enumerate(words):
+            index = self.index_of(word)
+            if index is not None:
+                result[row] = self.vectors[index]
+        return result
+
+    @classmethod
+    def from_text_lines(cls, lines: Iterable[str]) -> "WordEmbeddings":
+        """
+        Parse embeddings in the GloVe/word2vec text format: one word per line,
+        followed by its whitespace-separated vector components.
+        """
+        words = []
+        vectors = []
+        for line in lines:
+            parts = line.rstrip().split(" ")
+            if len(parts) < 2:
+                continue
+            words.append(parts[0])
+            vectors.append(np.asarray(parts[1:], dtype=np.float32))
+
+        if not vectors:
+            raise ValueError("No embedding vectors were found.")
+
+        return cls(words, np.vstack(vectors))
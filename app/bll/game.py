@@ -1,11 +1,20 @@
+import random
+import time
 import uuid
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, PrivateAttr
 
 from app.bll.board import Board
+from app.bll.clue_validator import (
+    ClueValidator,
+    ClueVocabulary,
+    InvalidClueException,
+    get_clue_validator,
+)
 from app.bll.defaults import DEFAULT_BOARD_SIZE
 from app.bll.game_utils import change_player
+from app.bll.metrics import timed_operation
 from app.bll.types import (
     GameEndStatus,
     AgentType,
@@ -13,11 +22,18 @@ from app.bll.types import (
     Clue,
     Coordinate,
     CurrentTurnState,
+    GameDelta,
+    GameEvent,
+    RevealedCard,
+    TurnTimeLimits,
 )
 
 if TYPE_CHECKING:
     from app.dal.base_data_access import BaseDataAccess
 
+# Clients further behind than this get the whole game instead of a delta.
+MAX_DELTA_EVENTS = 32
+
 
 class InvalidGuessException(Exception):
     """Exception raised for invalid guesses during the game."""
@@ -30,18 +46,125 @@ class Game(BaseModel):
     board: Board
     game_end_status: GameEndStatus
     current_turn: CurrentTurnState
+    # Bumped by every change; `history` holds the event of every version.
+    version: int = 0
+    history: list[GameEvent] = Field(default_factory=list)
+    # Without limits, turns never time out.
+    turn_time_limits: Optional[TurnTimeLimits] = None
+
+    _clue_vocabulary: Optional[ClueVocabulary] = PrivateAttr(default=None)
 
     @classmethod
-    def new_game(cls, words_provider: "BaseDataAccess"):
-        board = Board.random_with_words(
-            words_provider.load_card_words()[: DEFAULT_BOARD_SIZE**2]
+    def new_game(
+        cls,
+        words_provider: "BaseDataAccess",
+        random_seed: Optional[int] = None,
+        clue_vocabulary: Optional[ClueVocabulary] = None,
+        turn_time_limits: Optional[TurnTimeLimits] = None,
+    ):
+        """Creates a game on a random board.
+
+        :param words_provider: Where to take the card words from.
+        :param random_seed: Seed for the card words and the agent placements.
+        :param clue_vocabulary: The words allowed as clues. Build it once and share it
+                                between games; when missing, any word that is not a
+                                form of a board word is allowed.
+        :param turn_time_limits: How long spymasters and operatives get for each
+                                 turn; the first turn starts now.
+        """
+        return cls._new_game_with_words(
+            words_provider.load_card_words(),
+            random_seed,
+            clue_vocabulary,
+            turn_time_limits,
         )
-        return cls(
+
+    @classmethod
+    def new_games(
+        cls,
+        words_provider: "BaseDataAccess",
+        num_games: int,
+        random_seed: Optional[int] = None,
+        clue_vocabulary: Optional[ClueVocabulary] = None,
+        turn_time_limits: Optional[TurnTimeLimits] = None,
+    ) -> list["Game"]:
+        """Creates games on random boards, loading the card words only once.
+
+        :param words_provider: Where to take the card words from.
+        :param num_games: How many games to create.
+        :param random_seed: Seed of the first game; the next games use the following
+                            seeds, so the batch is reproducible.
+        :param clue_vocabulary: The words allowed as clues, as for `new_game`.
+        :param turn_time_limits: The time limits of the turns, as for `new_game`.
+        """
+        words = words_provider.load_card_words()
+        return [
+            cls._new_game_with_words(
+                words,
+                None if random_seed is None else random_seed + i,
+                clue_vocabulary,
+                turn_time_limits,
+            )
+            for i in range(num_games)
+        ]
+
+    @classmethod
+    @timed_operation("new_game")
+    def _new_game_with_words(
+        cls,
+        card_words: list[str],
+        random_seed: Optional[int],
+        clue_vocabulary: Optional[ClueVocabulary],
+        turn_time_limits: Optional[TurnTimeLimits],
+    ) -> "Game":
+        words = random.Random(random_seed).sample(card_words, DEFAULT_BOARD_SIZE**2)
+        board = Board.random_with_words(words, random_seed=random_seed)
+        game = cls(
             game_id=str(uuid.uuid4()),
             board=board,
             game_end_status=GameEndStatus.ONGOING,
             current_turn=CurrentTurnState(team=board.agent_placements.starting_color),
+            turn_time_limits=turn_time_limits,
         )
+        game.set_clue_vocabulary(clue_vocabulary)
+        game._start_turn_timer()
+        return game
+
+    @property
+    def clue_validator(self) -> ClueValidator:
+        return self.index_board()
+
+    def index_board(self) -> ClueValidator:
+        """Indexes the board for clue validation, unless it already was.
+
+        :return: The validator of the board.
+        """
+        return get_clue_validator(
+            tuple(card.word for row in self.board.words for card in row),
+            self._clue_vocabulary,
+        )
+
+    @property
+    def winner(self) -> Optional[AgentType]:
+        """The team that won the game, or None if it is not over."""
+        if self.game_end_status == GameEndStatus.RED_VICTORY:
+            return AgentType.RED
+        if self.game_end_status == GameEndStatus.BLUE_VICTORY:
+            return AgentType.BLUE
+        if self.game_end_status == GameEndStatus.BLACK_REVEALED:
+            # Revealing the black card passed the turn to the winners.
+            return self.current_turn.team
+        return None
+
+    def set_clue_vocabulary(self, clue_vocabulary: Optional[ClueVocabulary]):
+        """Restricts the clues of this game to a vocabulary, and indexes the board for
+        clue validation.
+
+        :param clue_vocabulary: The words allowed as clues, or None to allow any word.
+        """
+        self._clue_vocabulary = clue_vocabulary
+        # Index the board now, rather than on the first clue.
+        self.index_board()
 
     def get_game_description_for_operative(self) -> GameState:
         """Returns a filtered description of the current game state for operatives.
@@ -62,6 +185,7 @@ class Game(BaseModel):
             words=words,
             current_turn=current_turn,
             victory_state=victory_state,
+            version=self.version,
         )
 
     def get_game_description(self, is_spymaster: bool):
@@ -78,6 +202,61 @@ class Game(BaseModel):
         """
         return self if is_spymaster else self.get_game_description_for_operative()
 
+    def get_delta(self, since_version: int) -> Optional[GameDelta]:
+        """Describes what changed since a version, from the game's history.
+
+        The delta holds the cards revealed since that version, and the current turn
+        and end status. It is the same for every role, as revealed cards are public.
+
+        :param since_version: The version the client already has.
+        :return: The delta, or None when the version is unknown or too far behind for
+                 a delta to be worth it (the client should get the whole game).
+        """
+        if not 0 <= since_version <= self.version:
+            return None
+        if self.version - since_version > MAX_DELTA_EVENTS:
+            return None
+
+        events = self.history[len(self.history) - (self.version - since_version) :]
+        if len(events) != self.version - since_version:
+            # Games stored before versioning have no history to diff against.
+            return None
+        return GameDelta(
+            game_id=self.game_id,
+            from_version=since_version,
+            version=self.version,
+            revealed=[
+                RevealedCard(coordinate=event.guess, card_type=event.outcome)
+                for event in events
+                if event.kind == "guess"
+            ],
+            current_turn=self.current_turn,
+            game_end_status=self.game_end_status,
+        )
+
+    def _start_turn_timer(self):
+        """Sets the deadline of the current phase of the turn: giving a clue, or
+        guessing once it is given."""
+        if (
+            self.turn_time_limits is None
+            or self.game_end_status != GameEndStatus.ONGOING
+        ):
+            self.current_turn.deadline = None
+            return
+        limits = self.turn_time_limits
+        seconds = (
+            limits.clue_seconds
+            if self.current_turn.clue is None
+            else limits.guess_seconds
+        )
+        self.current_turn.deadline = time.time() + seconds
+
+    def _record(self, kind: str, team: AgentType, **details):
+        self.version += 1
+        self.history.append(
+            GameEvent(version=self.version, kind=kind, team=team, **details)
+        )
+
     def set_clue(self, clue: Clue):
         """Sets the clue for the current turn state.
 
@@ -86,9 +265,53 @@ class Game(BaseModel):
 
         :param clue: A `Clue` object containing the clue word and the number of guesses.
         :type clue: Clue
+        :raises InvalidClueException: If the clue breaks the rules, e.g. it is a form of
+                                      a word on the board, or a clue was already given
+                                      this turn.
         """
+        if self.game_end_status != GameEndStatus.ONGOING:
+            raise InvalidClueException("The game is already over.")
+        if self.current_turn.clue is not None:
+            raise InvalidClueException("A clue was already given this turn.")
+        self.clue_validator.validate(clue)
         self.current_turn.clue = clue
+        self._record("clue", self.current_turn.team, clue=clue)
+        self._start_turn_timer()
 
+    def end_turn(self) -> CurrentTurnState:
+        """Ends the current turn without further guesses, passing play to the other team.
+
+        :return: The new current turn state.
+        :raises InvalidGuessException: If the game is over.
+        """
+        if self.game_end_status != GameEndStatus.ONGOING:
+            raise InvalidGuessException("The game is already over.")
+        self._record("end_turn", self.current_turn.team)
+        self.current_turn = CurrentTurnState(team=change_player(self.current_turn.team))
+        self._start_turn_timer()
+        return self.current_turn
+
+    def expire_turn(self, now: Optional[float] = None) -> CurrentTurnState:
+        """Ends the current turn because it timed out: the spymaster gave no clue in
+        time, or the operatives did not finish guessing in time. Play passes to the
+        other team.
+
+        :param now: The current time, in seconds since the epoch.
+        :return: The new current turn state.
+        :raises InvalidGuessException: If the game is over, or the turn has no
+                                       deadline or it did not pass yet.
+        """
+        if self.game_end_status != GameEndStatus.ONGOING:
+            raise InvalidGuessException("The game is already over.")
+        deadline = self.current_turn.deadline
+        if deadline is None or deadline > (time.time() if now is None else now):
+            raise InvalidGuessException("The turn has not timed out.")
+        self._record("timeout", self.current_turn.team)
+        self.current_turn = CurrentTurnState(team=change_player(self.current_turn.team))
+        self._start_turn_timer()
+        return self.current_turn
+
+    @timed_operation("make_move")
     def make_move(self, guess: Coordinate) -> [AgentType, GameEndStatus, Clue, bool]:
         """Process a move and return the updated game information.
 
@@ -104,11 +327,21 @@ class Game(BaseModel):
         :return: A tuple containing the outcome of the guess, the game end status, the updated
                  current turn state, and a boolean indicating if the turn has ended.
         :rtype: tuple[AgentType, GameEndStatus, Clue, bool]
+        :raises InvalidGuessException: If the card was already revealed, the game is
+                                       over or no clue was given this turn.
         """
+        if self.game_end_status != GameEndStatus.ONGOING:
+            raise InvalidGuessException("The game is already over.")
+        if self.current_turn.clue is None:
+            raise InvalidGuessException("No clue was given this turn.")
+
         try:
             guess_outcome = self.board.reveal_card(guess)
         except ValueError as e:
             raise InvalidGuessException(str(e)) from e
+        self._record(
+            "guess", self.current_turn.team, guess=guess, outcome=guess_outcome
+        )
 
         self.current_turn.guesses_made += 1
         is_turn_over = (guess_outcome != self.current_turn.team) or (
@@ -118,11 +351,36 @@ class Game(BaseModel):
             new_turn = CurrentTurnState(team=change_player(self.current_turn.team))
             self.current_turn = new_turn
 
-        game_end_status = self.board.check_game_end()
+        self.game_end_status = self.board.check_game_end()
+        if is_turn_over or self.game_end_status != GameEndStatus.ONGOING:
+            self._start_turn_timer()
 
         return (
             guess_outcome,
-            game_end_status,
+            self.game_end_status,
             self.current_turn,
             is_turn_over,
         )
+
+    def make_moves(
+        self, guesses: list[Coordinate]
+    ) -> tuple[list[AgentType], GameEndStatus, CurrentTurnState, bool]:
+        """Make guesses in order, as `make_move` does, until one ends the turn.
+
+        The guesses after the one ending the turn (or the game) are not made.
+
+        :param guesses: The coordinates of the cards to reveal, in order.
+        :return: A tuple containing the outcomes of the guesses made, the game end
+                 status, the current turn state, and whether the turn has ended.
+        :raises InvalidGuessException: If any of the guesses made is invalid, as for
+                                       `make_move`. The game is then left after the
+                                       guesses before it.
+        """
+        guess_outcomes = []
+        is_turn_over = False
+        for guess in guesses:
+            guess_outcome, _, _, is_turn_over = self.make_move(guess)
+            guess_outcomes.append(guess_outcome)
+            if is_turn_over or self.game_end_status != GameEndStatus.ONGOING:
+                break
+        return guess_outcomes, self.game_end_status, self.current_turn, is_turn_over
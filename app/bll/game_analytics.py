@@ -0,0 +1,317 @@
+import argparse
+import os
+import tempfile
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.bll.game import Game
+from app.bll.types import AgentType, GameEndStatus
+
+DEFAULT_NUM_SHARDS = 64
+# Clues used fewer times than this are left out of the best clues.
+MIN_CLUE_USES = 3
+
+
+class ColorStats(BaseModel):
+    games: int = 0
+    wins: int = 0
+
+
+class WordStats(BaseModel):
+    appearances: int = 0
+    reveals: int = 0
+
+
+class ClueStats(BaseModel):
+    uses: int = 0
+    guesses_allowed: int = 0
+    # Guesses of the clue's team revealing one of its own cards.
+    correct_guesses: int = 0
+
+
+class GameStats(BaseModel):
+    """
+    Aggregate statistics of finished games. Stats of disjoint sets of games merge
+    into the stats of their union, so they can be computed in parts.
+    """
+
+    games: int = 0
+    black_losses: int = 0
+    # Turns are only known for games stored with their history.
+    games_with_history: int = 0
+    turns: int = 0
+    by_starting_color: dict[AgentType, ColorStats] = Field(default_factory=dict)
+    words: dict[str, WordStats] = Field(default_factory=dict)
+    clues: dict[str, ClueStats] = Field(default_factory=dict)
+
+    def add_game(self, game: Game):
+        """
+        :param game: A finished game.
+        """
+        self.games += 1
+        starting_color = game.board.agent_placements.starting_color
+        color = self.by_starting_color.setdefault(starting_color, ColorStats())
+        color.games += 1
+        color.wins += game.winner == starting_color
+        self.black_losses += game.game_end_status == GameEndStatus.BLACK_REVEALED
+
+        for row in game.board.words:
+            for card in row:
+                self.words.setdefault(card.word, WordStats()).appearances += 1
+        for coordinate in game.board.discovered_agents:
+            self.words[game.board.words[coordinate.x][coordinate.y].word].reveals += 1
+
+        if not game.history:
+            return
+        self.games_with_history += 1
+        team = clue = None
+        for event in game.history:
+            # Teams alternate, so every change of team starts a turn.
+            if event.team != team:
+                self.turns += 1
+                team, clue = event.team, None
+            if event.kind == "clue":
+                clue = self.clues.setdefault(event.clue.clue.lower(), ClueStats())
+                clue.uses += 1
+                clue.guesses_allowed += event.clue.num_guesses
+            elif event.kind == "guess" and clue is not None:
+                clue.correct_guesses += event.outcome == event.team
+
+    def merge(self, other: "GameStats"):
+        self.games += other.games
+        self.black_losses += other.black_losses
+        self.games_with_history += other.games_with_history
+        self.turns += other.turns
+        for color, stats in other.by_starting_color.items():
+            merged = self.by_starting_color.setdefault(color, ColorStats())
+            merged.games += stats.games
+            merged.wins += stats.wins
+        for word, stats in other.words.items():
+            merged = self.words.setdefault(word, WordStats())
+            merged.appearances += stats.appearances
+            merged.reveals += stats.reveals
+        for clue, stats in other.clues.items():
+            merged = self.clues.setdefault(clue, ClueStats())
+            merged.uses += stats.uses
+            merged.guesses_allowed += stats.guesses_allowed
+            merged.correct_guesses += stats.correct_guesses
+
+    def report(self, top: int = 20) -> "AnalyticsReport":
+        starting_wins = sum(stats.wins for stats in self.by_starting_color.values())
+        clue_uses = sum(stats.uses for stats in self.clues.values())
+        correct_guesses = sum(stats.correct_guesses for stats in self.clues.values())
+        guesses_allowed = sum(stats.guesses_allowed for stats in self.clues.values())
+        reveal_frequencies = {
+            word: stats.reveals / stats.appearances
+            for word, stats in self.words.items()
+        }
+        clue_scores = {
+            clue: stats.correct_guesses / stats.uses
+            for clue, stats in self.clues.items()
+            if stats.uses >= MIN_CLUE_USES
+        }
+        return AnalyticsReport(
+            games=self.games,
+            starting_team_win_rate=_rate(starting_wins, self.games),
+            win_rate_by_starting_color={
+                color: _rate(stats.wins, stats.games)
+                for color, stats in self.by_starting_color.items()
+            },
+            black_loss_rate=_rate(self.black_losses, self.games),
+            average_turns=_rate(self.turns, self.games_with_history),
+            most_revealed_words=_top(reveal_frequencies, top),
+            least_revealed_words=_top(reveal_frequencies, top, lowest=True),
+            correct_guesses_per_clue=_rate(correct_guesses, clue_uses),
+            clue_hit_rate=_rate(correct_guesses, guesses_allowed),
+            best_clues=_top(clue_scores, top),
+        )
+
+
+class AnalyticsReport(BaseModel):
+    games: int
+    # How often the team playing first (with an extra agent) wins.
+    starting_team_win_rate: Optional[float]
+    win_rate_by_starting_color: dict[AgentType, Optional[float]]
+    black_loss_rate: Optional[float]
+    average_turns: Optional[float]
+    # Words by how often they are revealed, of the games they appear in.
+    most_revealed_words: list[tuple[str, float]]
+    least_revealed_words: list[tuple[str, float]]
+    correct_guesses_per_clue: Optional[float]
+    # Correct guesses, of the guesses the clues allowed.
+    clue_hit_rate: Optional[float]
+    # Clue words by the correct guesses they led to, on average.
+    best_clues: list[tuple[str, float]]
+
+
+def _rate(count: int, total: int) -> Optional[float]:
+    return count / total if total else None
+
+
+def _top(
+    scores: dict[str, float], top: int, lowest: bool = False
+) -> list[tuple[str, float]]:
+    ranked = sorted(scores.items(), key=lambda item: (item[1], item[0]))
+    return ranked[:top] if lowest else ranked[::-1][:top]
+
+
+class ShardScan(BaseModel):
+    """What scanning games of a shard found."""
+
+    stats: GameStats = Field(default_factory=GameStats)
+    # The finished games counted in the stats; they never change again.
+    counted: set[str] = Field(default_factory=set)
+    # The ongoing games, by when they were last saved: they are only loaded again
+    # once saved again.
+    pending: dict[str, float] = Field(default_factory=dict)
+
+    def merge(self, other: "ShardScan"):
+        self.stats.merge(other.stats)
+        self.counted |= other.counted
+        self.pending.update(other.pending)
+        for game_id in other.counted:
+            self.pending.pop(game_id, None)
+
+
+class AnalyticsCache(BaseModel):
+    num_shards: int
+    shards: dict[int, ShardScan] = Field(default_factory=dict)
+
+
+@lru_cache(maxsize=None)
+def _load_data_access(data_dir: str):
+    from app.dal.local_dal import LocalDataAccess
+
+    return LocalDataAccess(data_dir)
+
+
+def _scan_games(
+    data_dir: str, game_ids: list[str], pending: dict[str, float]
+) -> ShardScan:
+    """Load games in a worker process, and count the finished ones."""
+    dal = _load_data_access(data_dir)
+    scan = ShardScan()
+    for game_id in game_ids:
+        try:
+            updated_at = dal.get_game_updated_at(game_id)
+            if pending.get(game_id) == updated_at:
+                scan.pending[game_id] = updated_at
+                continue
+            game = dal.get_game_by_id(game_id)
+        except FileNotFoundError:
+            # Deleted since the scan started.
+            continue
+        if game.game_end_status == GameEndStatus.ONGOING:
+            scan.pending[game_id] = updated_at
+        else:
+            scan.stats.add_game(game)
+            scan.counted.add(game_id)
+    return scan
+
+
+class GameAnalytics:
+    """
+    Computes the stats of all the finished games stored, map-reduce style: games are
+    split into shards by a hash of their ID, a process pool scans the shards, and
+    their stats are merged.
+
+    With a cache file, the stats and the games counted of every shard are kept
+    between runs (and saved as each shard is done), so a run only loads the games
+    stored or changed since the last one. Finished games never change, so their
+    stats stay valid; games deleted after being counted stay counted.
+
+    :param data_dir: The data directory of the stored games.
+    :param cache_path: Where to keep the stats between runs, or None to scan all the
+                       games every time.
+    :param max_workers: The number of worker processes; by default, one per CPU.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        cache_path: Optional[str] = None,
+        num_shards: int = DEFAULT_NUM_SHARDS,
+        max_workers: Optional[int] = None,
+    ):
+        self.data_dir = data_dir
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.num_shards = num_shards
+        self.max_workers = max_workers
+
+    def shard_of(self, game_id: str) -> int:
+        return zlib.crc32(game_id.encode()) % self.num_shards
+
+    def run(self) -> GameStats:
+        cache = self._load_cache()
+        new_game_ids: defaultdict[int, list[str]] = defaultdict(list)
+        for game_id in _load_data_access(self.data_dir).iter_game_ids():
+            shard = self.shard_of(game_id)
+            if game_id not in cache.shards.get(shard, ShardScan()).counted:
+                new_game_ids[shard].append(game_id)
+
+        if new_game_ids:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {}
+                for shard, game_ids in new_game_ids.items():
+                    pending = cache.shards.get(shard, ShardScan()).pending
+                    future = executor.submit(
+                        _scan_games,
+                        self.data_dir,
+                        game_ids,
+                        {
+                            game_id: pending[game_id]
+                            for game_id in game_ids
+                            if game_id in pending
+                        },
+                    )
+                    futures[future] = shard
+                for future in as_completed(futures):
+                    shard = futures[future]
+                    cache.shards.setdefault(shard, ShardScan()).merge(future.result())
+                    self._save_cache(cache)
+
+        stats = GameStats()
+        for scan in cache.shards.values():
+            stats.merge(scan.stats)
+        return stats
+
+    def _load_cache(self) -> AnalyticsCache:
+        if self.cache_path is not None and self.cache_path.exists():
+            cache = AnalyticsCache.model_validate_json(self.cache_path.read_text())
+            if cache.num_shards == self.num_shards:
+                return cache
+        return AnalyticsCache(num_shards=self.num_shards)
+
+    def _save_cache(self, cache: AnalyticsCache):
+        if self.cache_path is None:
+            return
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=self.cache_path.parent,
+            prefix=f".{self.cache_path.name}.",
+            delete=False,
+        ) as f:
+            f.write(cache.model_dump_json())
+        os.replace(f.name, self.cache_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compute the stats of the finished games stored."
+    )
+    parser.add_argument("data_dir")
+    parser.add_argument(
+        "--cache", help="Keep the stats in this file, to only scan new games."
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    stats = GameAnalytics(args.data_dir, args.cache, max_workers=args.workers).run()
+    print(stats.report(args.top).model_dump_json(indent=2))
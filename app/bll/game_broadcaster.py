@@ -0,0 +1,136 @@
+import asyncio
+from typing import Optional
+
+from app.bll.game import Game
+from app.bll.types import Role
+
+DEFAULT_MAX_QUEUED_UPDATES = 8
+
+
+def serialize_view(game: Game, role: Role) -> str:
+    """Serialize the game as seen by a role. Only spymasters see the placements."""
+    return game.get_game_description(
+        is_spymaster=role == Role.SPYMASTER
+    ).model_dump_json()
+
+
+def serialize_snapshot(game: Game, role: Role) -> str:
+    return (
+        f'{{"type":"snapshot","version":{game.version},'
+        f'"state":{serialize_view(game, role)}}}'
+    )
+
+
+def serialize_update(game: Game, role: Role, since_version: Optional[int]) -> str:
+    """
+    Serialize what a client at `since_version` needs to catch up: a delta when the
+    game's history allows it, and a snapshot of the role's view otherwise.
+    """
+    delta = None if since_version is None else game.get_delta(since_version)
+    if delta is None:
+        return serialize_snapshot(game, role)
+    return delta.model_dump_json()
+
+
+class Subscription:
+    """
+    The updates of one game waiting to be sent to one subscriber.
+
+    The queue is bounded. Updates are deltas that only make sense in order, so when a
+    slow subscriber's queue is full, it is cleared and the subscriber is sent a
+    snapshot of the game instead.
+    """
+
+    def __init__(
+        self, game_id: str, role: Role, max_queued: int = DEFAULT_MAX_QUEUED_UPDATES
+    ):
+        self.game_id = game_id
+        self.role = role
+        self.num_resyncs = 0
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queued)
+
+    def push(self, payload: str) -> bool:
+        """
+        :return: False if the queue is full and the payload was not queued.
+        """
+        if self._queue.full():
+            return False
+        self._queue.put_nowait(payload)
+        return True
+
+    def resync(self, snapshot: str):
+        """Replace everything queued with a snapshot."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(snapshot)
+        self.num_resyncs += 1
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+
+class GameBroadcaster:
+    """
+    Fans game updates out to subscribers, e.g. WebSocket connections.
+
+    Every change is published as a delta from the previous version, serialized once
+    and queued as the same payload for every subscriber, so the cost of an update
+    does not grow with the number of spectators. Subscribers that fell behind get a
+    snapshot, serialized at most once per view.
+    """
+
+    def __init__(self, max_queued: int = DEFAULT_MAX_QUEUED_UPDATES):
+        self.max_queued = max_queued
+        self._subscriptions: dict[str, dict[Role, set[Subscription]]] = {}
+
+    def subscribe(self, game_id: str, role: Role) -> Subscription:
+        subscription = Subscription(game_id, role, self.max_queued)
+        self._subscriptions.setdefault(game_id, {}).setdefault(role, set()).add(
+            subscription
+        )
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        by_role = self._subscriptions.get(subscription.game_id, {})
+        subscriptions = by_role.get(subscription.role, set())
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            by_role.pop(subscription.role, None)
+        if not by_role:
+            self._subscriptions.pop(subscription.game_id, None)
+
+    def num_subscribers(self, game_id: Optional[str] = None) -> int:
+        games = (
+            self._subscriptions.values()
+            if game_id is None
+            else [self._subscriptions.get(game_id, {})]
+        )
+        return sum(
+            len(subscriptions)
+            for by_role in games
+            for subscriptions in by_role.values()
+        )
+
+    def publish(self, game: Game, since_version: Optional[int] = None):
+        """Queue the latest changes of a game for all of its subscribers.
+
+        :param since_version: The version before the changes; by default, the game
+                              changed once.
+        """
+        by_role = self._subscriptions.get(game.game_id)
+        if not by_role:
+            return
+
+        if since_version is None:
+            since_version = game.version - 1
+        delta = game.get_delta(since_version)
+        update = None if delta is None else delta.model_dump_json()
+        snapshots: dict[bool, str] = {}
+        for role, subscriptions in by_role.items():
+            is_spymaster = role == Role.SPYMASTER
+            for subscription in subscriptions:
+                if update is not None and subscription.push(update):
+                    continue
+                if is_spymaster not in snapshots:
+                    snapshots[is_spymaster] = serialize_snapshot(game, role)
+                subscription.resync(snapshots[is_spymaster])
@@ -0,0 +1,188 @@
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from pydantic import BaseModel
+
+from app.bll.game import Game
+from app.bll.types import AgentType, GameEndStatus
+
+if TYPE_CHECKING:
+    from app.dal.base_data_access import BaseDataAccess
+
+FINISHED_STATUSES = frozenset(GameEndStatus) - {GameEndStatus.ONGOING}
+
+
+class ExportedMove(BaseModel):
+    kind: str
+    team: AgentType
+    clue: Optional[str] = None
+    num_guesses: Optional[int] = None
+    # The card guessed, as (x, y), and what it turned out to be.
+    card: Optional[tuple[int, int]] = None
+    outcome: Optional[AgentType] = None
+
+
+class ExportedGame(BaseModel):
+    """A finished game, as one compact NDJSON record."""
+
+    game_id: str
+    finished_at: datetime
+    end_status: GameEndStatus
+    winner: AgentType
+    starting_color: AgentType
+    # The words of the board row by row, and the (x, y) cards of each agent type.
+    words: list[str]
+    placements: dict[AgentType, list[tuple[int, int]]]
+    moves: list[ExportedMove]
+
+    @classmethod
+    def from_game(cls, game: Game, finished_at: datetime) -> "ExportedGame":
+        placements = game.board.agent_placements
+        return cls(
+            game_id=game.game_id,
+            finished_at=finished_at,
+            end_status=game.game_end_status,
+            winner=game.winner,
+            starting_color=placements.starting_color,
+            words=[card.word for row in game.board.words for card in row],
+            placements={
+                agent_type: [(c.x, c.y) for c in coordinates]
+                for agent_type, coordinates in placements.positions.items()
+            },
+            moves=[
+                ExportedMove(
+                    kind=event.kind,
+                    team=event.team,
+                    clue=event.clue.clue if event.clue else None,
+                    num_guesses=event.clue.num_guesses if event.clue else None,
+                    card=(event.guess.x, event.guess.y) if event.guess else None,
+                    outcome=event.outcome,
+                )
+                for event in game.history
+            ],
+        )
+
+
+class GameExportFilter(BaseModel):
+    """Which finished games to export. Games finish when they are last saved."""
+
+    end_statuses: Optional[set[GameEndStatus]] = None
+    finished_after: Optional[datetime] = None
+    finished_before: Optional[datetime] = None
+
+    def accepts_time(self, finished_at: datetime) -> bool:
+        return (
+            self.finished_after is None or finished_at >= _as_utc(self.finished_after)
+        ) and (
+            self.finished_before is None or finished_at < _as_utc(self.finished_before)
+        )
+
+    def accepts_status(self, end_status: GameEndStatus) -> bool:
+        if end_status not in FINISHED_STATUSES:
+            return False
+        return self.end_statuses is None or end_status in self.end_statuses
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """Dates without a time zone are in UTC."""
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def iter_exported_games(
+    dal: "BaseDataAccess",
+    export_filter: Optional[GameExportFilter] = None,
+    cursor: Optional[str] = None,
+) -> Iterator[str]:
+    """Export the finished games stored, one NDJSON line per game, in game ID order.
+
+    Games are loaded one at a time, after their save time passed the filter, so
+    exporting any number of games takes the memory of one.
+
+    :param cursor: The ID of the last game exported before, to resume after it.
+    :return: The lines, each ending with a newline.
+    """
+    export_filter = export_filter or GameExportFilter()
+    for game_id in dal.iter_game_ids(after=cursor):
+        try:
+            finished_at = datetime.fromtimestamp(
+                dal.get_game_updated_at(game_id), timezone.utc
+            )
+            if not export_filter.accepts_time(finished_at):
+                continue
+            game = dal.get_game_by_id(game_id)
+        except FileNotFoundError:
+            # Deleted since the scan started.
+            continue
+        if export_filter.accepts_status(game.game_end_status):
+            exported = ExportedGame.from_game(game, finished_at)
+            yield exported.model_dump_json(exclude_none=True) + "\n"
+
+
+def read_cursor(path: str) -> Optional[str]:
+    """Find the ID of the last game completely written to an export file, and cut
+    off a last line left incomplete by an interrupted export.
+
+    :return: The cursor to resume the export from, or None to start over.
+    """
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        # Read backwards until the start of the last complete line.
+        position = end
+        block = b""
+        while position > 0 and block.count(b"\n") < 2:
+            position = max(0, position - 4096)
+            f.seek(position)
+            block = f.read(end - position)
+        lines = block.split(b"\n")
+        if lines[-1]:
+            f.truncate(end - len(lines[-1]))
+        complete = [line for line in lines[:-1] if line]
+    if not complete:
+        return None
+    return ExportedGame.model_validate_json(complete[-1]).game_id
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export the finished games stored to NDJSON, one game per line."
+    )
+    parser.add_argument("data_dir")
+    parser.add_argument("--output", help="Write to this file rather than stdout.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Append to the output file, after the last game it holds.",
+    )
+    parser.add_argument("--cursor", help="Export the games after this game ID.")
+    parser.add_argument(
+        "--end-status",
+        action="append",
+        choices=sorted(status.value for status in FINISHED_STATUSES),
+        help="Only export games ending this way; can be repeated.",
+    )
+    parser.add_argument("--finished-after", type=datetime.fromisoformat)
+    parser.add_argument("--finished-before", type=datetime.fromisoformat)
+    args = parser.parse_args()
+
+    from app.dal.local_dal import LocalDataAccess
+
+    cursor = args.cursor
+    if args.resume and args.output and os.path.exists(args.output):
+        cursor = read_cursor(args.output) or cursor
+    lines = iter_exported_games(
+        LocalDataAccess(args.data_dir),
+        GameExportFilter(
+            end_statuses=args.end_status,
+            finished_after=args.finished_after,
+            finished_before=args.finished_before,
+        ),
+        cursor,
+    )
+    if args.output is None:
+        sys.stdout.writelines(lines)
+    else:
+        with open(args.output, "a" if args.resume else "w") as f:
+            f.writelines(lines)
@@ -0,0 +1,376 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+from weakref import WeakValueDictionary
+
+from pydantic import BaseModel
+
+from app.bll.clue_validator import ClueVocabulary
+from app.bll.game import Game, InvalidGuessException
+from app.bll.game_broadcaster import GameBroadcaster, Subscription, serialize_update
+from app.bll.metrics import GAMES_CREATED, MOVES, WINS
+from app.bll.timer_wheel import TimerWheel
+from app.bll.types import (
+    AgentType,
+    Clue,
+    Coordinate,
+    CurrentTurnState,
+    GameEndStatus,
+    Role,
+    TurnTimeLimits,
+)
+from app.dal.base_data_access import StaleGameException
+
+if TYPE_CHECKING:
+    from app.dal.base_data_access import BaseDataAccess
+
+DEFAULT_HOT_CACHE_SIZE = 1024
+MAX_SAVE_ATTEMPTS = 8
+SAVE_RETRY_DELAY = 0.002  # Seconds, doubled on every retry.
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class MoveResult(BaseModel):
+    game_id: str
+    version: int
+    guess_outcome: Optional[AgentType] = None
+    is_turn_over: bool
+    game_end_status: GameEndStatus
+    current_turn: CurrentTurnState
+
+
+class GuessesResult(BaseModel):
+    game_id: str
+    version: int
+    guess_outcomes: list[AgentType]
+    is_turn_over: bool
+    game_end_status: GameEndStatus
+    current_turn: CurrentTurnState
+
+
+class GameManager:
+    """
+    Serves the games stored by a data access layer to concurrent clients.
+
+    The stored games are the only source of truth, so any number of managers, in any
+    number of server processes, can serve the same games. Every change to a game is
+    a read-modify-write of the stored game, saved as a compare-and-swap on its
+    version: a change that lost a race with another process is retried on the newer
+    game. Within the process, changes to the same game are also serialized by a
+    per-game `asyncio.Lock`, so they do not race each other at all; changes to
+    different games run fully in parallel. The data access calls run in worker
+    threads, so slow storage never blocks the event loop. Every stored change is
+    published to the game's subscribers in this process.
+
+    Reads are served from a bounded hot cache of the latest games, which is kept
+    coherent by checking the stored version of a game before using it.
+
+    With turn time limits, the manager also tracks the turn deadline of every game
+    it saves or loads in a timer wheel, and ends the turns that timed out in
+    batches (see `run_turn_timer`). A deadline is stored with its game, so any
+    manager tracking the game may end its turn, and only once.
+    """
+
+    def __init__(
+        self,
+        dal: "BaseDataAccess",
+        clue_vocabulary: Optional[ClueVocabulary] = None,
+        broadcaster: Optional[GameBroadcaster] = None,
+        hot_cache_size: int = DEFAULT_HOT_CACHE_SIZE,
+        turn_time_limits: Optional[TurnTimeLimits] = None,
+    ):
+        """
+        :param hot_cache_size: How many games to keep in memory for reads; 0 disables
+            the cache, so every read loads the game.
+        :param turn_time_limits: The time limits of the turns of new games, if any.
+        """
+        self.dal = dal
+        self.clue_vocabulary = clue_vocabulary
+        self.broadcaster = broadcaster or GameBroadcaster()
+        self.hot_cache_size = hot_cache_size
+        # A lock lives as long as someone holds or waits on it.
+        self._locks: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
+        # Games in the hot cache are shared by readers and never changed.
+        self._hot_games: OrderedDict[str, Game] = OrderedDict()
+        self.turn_time_limits = turn_time_limits
+        self.turn_deadlines = TimerWheel(start=time.time())
+
+    @property
+    def num_cached_games(self) -> int:
+        return len(self._hot_games)
+
+    @property
+    def num_active_games(self) -> int:
+        """The number of ongoing games in the hot cache."""
+        return sum(
+            game.game_end_status == GameEndStatus.ONGOING
+            for game in self._hot_games.values()
+        )
+
+    def lock(self, game_id: str) -> asyncio.Lock:
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = self._locks[game_id] = asyncio.Lock()
+        return lock
+
+    async def get_version(self, game_id: str) -> int:
+        """
+        :return: The version of the stored game.
+        :raises FileNotFoundError: If there is no such game.
+        """
+        return await asyncio.to_thread(self.dal.get_game_version, game_id)
+
+    async def create_game(self, random_seed: Optional[int] = None) -> Game:
+        return (await self.create_games(1, random_seed))[0]
+
+    async def create_games(
+        self, num_games: int, random_seed: Optional[int] = None
+    ) -> list[Game]:
+        """Create games and store them in one call to the data access layer.
+
+        :param random_seed: Seed of the first game, as for `Game.new_games`.
+        """
+        games = await asyncio.to_thread(self._new_games, num_games, random_seed)
+        GAMES_CREATED.inc(len(games))
+        for game in games:
+            self._remember_game(game)
+        return games
+
+    def _new_games(self, num_games: int, random_seed: Optional[int]) -> list[Game]:
+        games = Game.new_games(
+            self.dal,
+            num_games,
+            random_seed,
+            self.clue_vocabulary,
+            self.turn_time_limits,
+        )
+        self.dal.save_games(games)
+        return games
+
+    async def get_game(self, game_id: str, version: Optional[int] = None) -> Game:
+        """Get the latest stored game, for reading only: it may be shared.
+
+        :param version: The stored version of the game, if the caller just read it.
+        :raises FileNotFoundError: If there is no such game.
+        """
+        game = self._hot_games.get(game_id)
+        if game is not None and game.version == (
+            version if version is not None else await self.get_version(game_id)
+        ):
+            self._hot_games.move_to_end(game_id)
+            return game
+        game = await self._load_game(game_id)
+        self._remember_game(game)
+        return game
+
+    async def subscribe(
+        self, game_id: str, role: Role, since_version: Optional[int] = None
+    ) -> Subscription:
+        """Subscribe to the updates of a game.
+
+        The first update queued is what the subscriber needs to catch up from
+        `since_version` (the whole game when it is None).
+
+        :raises FileNotFoundError: If there is no such game.
+        """
+        # Holding the game's lock, no change can land between reading the game and
+        # subscribing to its later changes.
+        async with self.lock(game_id):
+            game = await self.get_game(game_id)
+            subscription = self.broadcaster.subscribe(game_id, role)
+            subscription.push(serialize_update(game, role, since_version))
+        return subscription
+
+    async def _load_game(self, game_id: str) -> Game:
+        game = await asyncio.to_thread(self.dal.get_game_by_id, game_id)
+        game.set_clue_vocabulary(self.clue_vocabulary)
+        return game
+
+    def _remember_game(self, game: Game):
+        """Track the turn deadline of a game, and keep it in the hot cache."""
+        deadline = game.current_turn.deadline
+        if deadline is None or game.game_end_status != GameEndStatus.ONGOING:
+            self.turn_deadlines.cancel(game.game_id)
+        elif self.turn_deadlines.deadline(game.game_id) != deadline:
+            self.turn_deadlines.schedule(game.game_id, deadline)
+
+        if self.hot_cache_size <= 0:
+            return
+        self._hot_games[game.game_id] = game
+        self._hot_games.move_to_end(game.game_id)
+        if len(self._hot_games) > self.hot_cache_size:
+            self._hot_games.popitem(last=False)
+
+    async def _save_game(self, game: Game, expected_version: int):
+        await asyncio.to_thread(
+            self.dal.save_game, game.game_id, game, expected_version
+        )
+        self._remember_game(game)
+        self.broadcaster.publish(game, expected_version)
+
+    async def _change_game(
+        self, game_id: str, change: Callable[[Game], T]
+    ) -> tuple[Game, T]:
+        """Apply a change to the latest stored game and save it.
+
+        :return: The changed game and what `change` returned.
+        :raises StaleGameException: If other processes kept changing the game first.
+        """
+        async with self.lock(game_id):
+            for attempt in range(MAX_SAVE_ATTEMPTS):
+                if attempt:
+                    # Back off by a random delay, so racing processes spread out.
+                    await asyncio.sleep(
+                        random.uniform(0, SAVE_RETRY_DELAY * 2**attempt)
+                    )
+                game = await self._load_game(game_id)
+                expected_version = game.version
+                result = change(game)
+                try:
+                    await self._save_game(game, expected_version)
+                except StaleGameException:
+                    continue
+                self._count_changes(game, expected_version)
+                return game, result
+        raise StaleGameException(
+            f"Game with ID {game_id} kept changing; gave up after "
+            f"{MAX_SAVE_ATTEMPTS} attempts."
+        )
+
+    @staticmethod
+    def _count_changes(game: Game, since_version: int):
+        """Count the moves stored since a version, and the win if they ended the
+        game."""
+        for event in game.history[len(game.history) - (game.version - since_version) :]:
+            MOVES.labels(event.kind).inc()
+        # Changes are only made to ongoing games, so this one ended it.
+        if (winner := game.winner) is not None:
+            WINS.labels(winner.value, game.game_end_status.value).inc()
+
+    async def give_clue(self, game_id: str, clue: Clue) -> MoveResult:
+        """Set the clue of the current turn.
+
+        :raises InvalidClueException: If the clue breaks the rules.
+        """
+        game, _ = await self._change_game(game_id, lambda game: game.set_clue(clue))
+        return MoveResult(
+            game_id=game_id,
+            version=game.version,
+            is_turn_over=False,
+            game_end_status=game.game_end_status,
+            current_turn=game.current_turn,
+        )
+
+    async def guess(self, game_id: str, guess: Coordinate) -> MoveResult:
+        """Reveal a card for the current team.
+
+        :raises InvalidGuessException: If the guess is not allowed now.
+        """
+        (
+            game,
+            (guess_outcome, game_end_status, current_turn, is_turn_over),
+        ) = await self._change_game(game_id, lambda game: game.make_move(guess))
+        return MoveResult(
+            game_id=game_id,
+            version=game.version,
+            guess_outcome=guess_outcome,
+            is_turn_over=is_turn_over,
+            game_end_status=game_end_status,
+            current_turn=current_turn,
+        )
+
+    async def guesses(self, game_id: str, guesses: list[Coordinate]) -> GuessesResult:
+        """Reveal cards in order for the current team, until one ends the turn.
+
+        The guesses are atomic: they are stored together, or not at all.
+
+        :raises InvalidGuessException: If any of the guesses made is not allowed.
+        """
+        (
+            game,
+            (guess_outcomes, game_end_status, current_turn, is_turn_over),
+        ) = await self._change_game(game_id, lambda game: game.make_moves(guesses))
+        return GuessesResult(
+            game_id=game_id,
+            version=game.version,
+            guess_outcomes=guess_outcomes,
+            is_turn_over=is_turn_over,
+            game_end_status=game_end_status,
+            current_turn=current_turn,
+        )
+
+    async def end_turn(self, game_id: str) -> MoveResult:
+        """Stop guessing and pass the turn to the other team."""
+        game, _ = await self._change_game(game_id, lambda game: game.end_turn())
+        return MoveResult(
+            game_id=game_id,
+            version=game.version,
+            is_turn_over=True,
+            game_end_status=game.game_end_status,
+            current_turn=game.current_turn,
+        )
+
+    async def expire_turns(self, now: Optional[float] = None) -> list[MoveResult]:
+        """End the turns whose deadlines passed, in all the games tracked.
+
+        :param now: The current time, in seconds since the epoch.
+        :return: The results of the turns ended.
+        """
+        now = time.time() if now is None else now
+        due = self.turn_deadlines.advance(now)
+        results = await asyncio.gather(
+            *(self._expire_turn(game_id, now) for game_id in due),
+            return_exceptions=True,
+        )
+        expired = []
+        for game_id, result in zip(due, results):
+            # One broken game must not stop the turns of the others from ending.
+            if isinstance(result, Exception):
+                logger.error(
+                    "Could not end the turn of game %s", game_id, exc_info=result
+                )
+            elif result is not None:
+                expired.append(result)
+        return expired
+
+    async def _expire_turn(self, game_id: str, now: float) -> Optional[MoveResult]:
+        try:
+            game, _ = await self._change_game(
+                game_id, lambda game: game.expire_turn(now)
+            )
+        except FileNotFoundError:
+            return None
+        except InvalidGuessException:
+            # The turn ended in time, maybe through another process: track the
+            # deadline of the turn after it instead, which loading the game does.
+            try:
+                await self.get_game(game_id)
+            except FileNotFoundError:
+                pass
+            return None
+        except (StaleGameException, OSError):
+            # Try again on the next tick.
+            self.turn_deadlines.schedule(game_id, now + self.turn_deadlines.tick)
+            return None
+        return MoveResult(
+            game_id=game_id,
+            version=game.version,
+            is_turn_over=True,
+            game_end_status=game.game_end_status,
+            current_turn=game.current_turn,
+        )
+
+    async def run_turn_timer(self):
+        """End the turns that time out, every tick of the timer wheel, forever."""
+        while True:
+            await asyncio.sleep(self.turn_deadlines.tick)
+            try:
+                await self.expire_turns()
+            except Exception:
+                logger.exception("Could not end the turns that timed out")
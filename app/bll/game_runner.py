@@ -0,0 +1,57 @@
+from app.bll.game import Game
+from app.bll.player import Operative, Spymaster
+from app.bll.types import GameEndStatus, TeamColor
+
+DEFAULT_MAX_TURNS = 50
+
+
+def play_guesses(game: Game, operative: Operative) -> GameEndStatus:
+    """Let the operative guess until their turn is over.
+
+    :param game: The game, with the clue of the current turn already set.
+    :param operative: The operative of the team whose turn it is.
+    :return: The game end status after the last guess.
+    """
+    operative.prefix_turn(game.get_game_description(is_spymaster=False))
+    while True:
+        guess = operative.guess_word(game.get_game_description(is_spymaster=False))
+        if guess is None:
+            game.end_turn()
+            return GameEndStatus.ONGOING
+
+        _, game_end_status, _, is_turn_over = game.make_move(guess)
+        if game_end_status != GameEndStatus.ONGOING or is_turn_over:
+            return game_end_status
+
+
+def play_turn(game: Game, spymaster: Spymaster, operative: Operative) -> GameEndStatus:
+    """Play one full turn: the spymaster gives a clue and the operative guesses.
+
+    :return: The game end status at the end of the turn.
+    """
+    spymaster.prefix_turn(game.get_game_description(is_spymaster=True))
+    game.set_clue(spymaster.offer_clue())
+    return play_guesses(game, operative)
+
+
+def play_game(
+    game: Game,
+    players: dict[TeamColor, tuple[Spymaster, Operative]],
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> tuple[TeamColor | None, GameEndStatus, int]:
+    """Play a game to the end.
+
+    :param game: The game to play, from its current turn on.
+    :param players: The (spymaster, operative) pair of every team.
+    :param max_turns: A safety limit on the number of turns to play.
+    :return: The winner (None if `max_turns` was reached), the final game end status
+             and the number of turns played.
+    """
+    game_end_status = GameEndStatus.ONGOING
+    num_turns = 0
+    while game_end_status == GameEndStatus.ONGOING and num_turns < max_turns:
+        team = game.current_turn.team
+        game_end_status = play_turn(game, *players[team])
+        num_turns += 1
+
+    return game.winner, game_end_status, num_turns
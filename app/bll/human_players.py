@@ -1,13 +1,27 @@
+from typing import Optional
+
 from app.api.display_utils import show_words
+from app.bll.clue_autocomplete import ClueAutocomplete
 from app.bll.game import Game
 from app.bll.player import Spymaster, Operative
 from app.bll.types import Clue, Coordinate, TeamColor, GameState
 
 
+COMPLETION_REQUEST_SUFFIX = "?"
+
+
 class HumanSpymaster(Spymaster):
-    def __init__(self, team: TeamColor):
+    def __init__(
+        self, team: TeamColor, autocomplete: Optional[ClueAutocomplete] = None
+    ):
+        """
+        :param team: The team of the spymaster.
+        :param autocomplete: If given, typing a prefix followed by "?" lists the clue
+                             words starting with it.
+        """
         super().__init__(team)
 
+        self.autocomplete = autocomplete
         self.current_turn = {}
 
     def prefix_turn(self, game: Game):
@@ -33,10 +47,30 @@ class HumanSpymaster(Spymaster):
                 )
 
     def offer_clue(self) -> Clue:
-        clue = input("Enter your clue: ")
+        if self.autocomplete is None:
+            clue = input("Enter your clue: ")
+        else:
+            clue = self._input_clue_with_completions()
         num = int(input("Enter the number of cards related to the clue: "))
         return Clue(clue=clue, num_guesses=num)
 
+    def _input_clue_with_completions(self) -> str:
+        while True:
+            clue = input(
+                f'Enter your clue (or a prefix and "{COMPLETION_REQUEST_SUFFIX}" '
+                "for suggestions): "
+            ).strip()
+            if not clue.endswith(COMPLETION_REQUEST_SUFFIX):
+                return clue
+
+            completions = self.autocomplete.complete(
+                clue.removesuffix(COMPLETION_REQUEST_SUFFIX)
+            )
+            if completions:
+                print("Suggestions: " + ", ".join(completions))
+            else:
+                print("No clue words start with that.")
+
 
 class HumanOperative(Operative):
     def __init__(self, team: TeamColor):
@@ -0,0 +1,268 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from itertools import islice
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.bll.game_manager import GameManager
+from app.bll.types import AgentType, Role, TeamColor
+
+DEFAULT_RATING = 1500
+DEFAULT_RATING_BUCKET_WIDTH = 200
+# Matched tickets are kept this long (in tickets) for clients to poll them again.
+DEFAULT_MAX_MATCHED_TICKETS = 100_000
+# Waiting tickets not polled for this long (in seconds) are dropped as abandoned.
+DEFAULT_TICKET_TTL = 120.0
+TEAMS = (AgentType.RED, AgentType.BLUE)
+PLAYER_ROLES = (Role.SPYMASTER, Role.OPERATIVE)
+
+
+class LobbyException(Exception):
+    """Exception raised for invalid requests to the lobby."""
+
+    pass
+
+
+class Assignment(BaseModel):
+    game_id: str
+    team: TeamColor
+    role: Role
+
+
+class LobbyTicket:
+    """A player's place in the lobby, until they are assigned to a game."""
+
+    def __init__(self, role: Role, team: Optional[AgentType], rating_bucket: int):
+        self.ticket_id = str(uuid.uuid4())
+        self.role = role
+        self.team = team
+        self.rating_bucket = rating_bucket
+        self.assignment: Optional[Assignment] = None
+        self.last_seen = time.monotonic()
+        self._num_waiters = 0
+        self._assigned = asyncio.Event()
+
+    @property
+    def queue_key(self) -> tuple[Role, Optional[AgentType], int]:
+        return self.role, self.team, self.rating_bucket
+
+    def touch(self):
+        """Record that the player is still there."""
+        self.last_seen = time.monotonic()
+
+    def is_stale(self, ttl: float) -> bool:
+        """Whether the player has not been seen for `ttl` seconds, and is not
+        waiting for an assignment right now."""
+        return self._num_waiters == 0 and time.monotonic() - self.last_seen > ttl
+
+    def assign(self, assignment: Assignment):
+        self.assignment = assignment
+        self._assigned.set()
+
+    async def wait(self, timeout: float) -> Optional[Assignment]:
+        """Wait until the player is assigned to a game, for at most `timeout` seconds.
+
+        :return: The assignment, or None if there is none yet.
+        """
+        self._num_waiters += 1
+        try:
+            await asyncio.wait_for(self._assigned.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._num_waiters -= 1
+            self.touch()
+        return self.assignment
+
+
+class Lobby:
+    """
+    Matches waiting players into games: a spymaster and an operative for each team,
+    all with ratings in the same bucket.
+
+    Players wait in FIFO queues keyed by role, team preference (or none) and rating
+    bucket. A join only ever looks at the heads of the queues of its own bucket, and
+    queues are ordered dicts, so joining, leaving and matching take constant time
+    however many players are waiting. Players with a team preference are matched
+    first; players without one fill the remaining places.
+
+    Players keep their tickets alive by polling them. Tickets not polled for
+    `ticket_ttl` seconds are abandoned: they are dropped when they reach the head of
+    their queue, or the front of the waiting tickets (the least recently seen), so
+    the lobby never matches absent players and does not grow with them.
+    """
+
+    def __init__(
+        self,
+        game_manager: GameManager,
+        rating_bucket_width: int = DEFAULT_RATING_BUCKET_WIDTH,
+        max_matched_tickets: int = DEFAULT_MAX_MATCHED_TICKETS,
+        ticket_ttl: float = DEFAULT_TICKET_TTL,
+    ):
+        self.game_manager = game_manager
+        self.rating_bucket_width = rating_bucket_width
+        self.max_matched_tickets = max_matched_tickets
+        self.ticket_ttl = ticket_ttl
+        self.num_games_created = 0
+        self._queues: dict[
+            tuple[Role, Optional[AgentType], int], OrderedDict[str, LobbyTicket]
+        ] = {}
+        # Waiting tickets, least recently seen first.
+        self._waiting: OrderedDict[str, LobbyTicket] = OrderedDict()
+        self._matched: OrderedDict[str, LobbyTicket] = OrderedDict()
+
+    @property
+    def num_waiting(self) -> int:
+        return len(self._waiting)
+
+    def get_ticket(self, ticket_id: str) -> LobbyTicket:
+        """Find a ticket, and record that its player is still there.
+
+        :raises LobbyException: If there is no such ticket, it was abandoned while
+                                waiting, or it was matched long ago.
+        """
+        ticket = self._waiting.get(ticket_id)
+        if ticket is not None:
+            if ticket.is_stale(self.ticket_ttl):
+                self._drop(ticket)
+                ticket = None
+            else:
+                self._waiting.move_to_end(ticket_id)
+        else:
+            ticket = self._matched.get(ticket_id)
+        if ticket is None:
+            raise LobbyException(f"Ticket {ticket_id} does not exist.")
+        ticket.touch()
+        return ticket
+
+    async def join(
+        self,
+        role: Role,
+        team: Optional[AgentType] = None,
+        rating: int = DEFAULT_RATING,
+    ) -> LobbyTicket:
+        """Queue a player, and start a game if they complete a group.
+
+        :param role: The role the player wants to play.
+        :param team: The team the player wants to play for, or None for either.
+        :param rating: The player's rating; players are matched with similar ones.
+        :return: The player's ticket, already assigned if they completed a group.
+        :raises LobbyException: If the role is not a player's role.
+        """
+        if role not in PLAYER_ROLES:
+            raise LobbyException(f"Players cannot join as {role.value}.")
+        if team is not None and team not in TEAMS:
+            raise LobbyException(f"Players cannot join team {team.value}.")
+
+        self._drop_abandoned()
+        ticket = LobbyTicket(role, team, rating // self.rating_bucket_width)
+        self._waiting[ticket.ticket_id] = ticket
+        queue = self._queues.setdefault(ticket.queue_key, OrderedDict())
+        queue[ticket.ticket_id] = ticket
+
+        group = self._match(ticket.rating_bucket)
+        if group is not None:
+            await self._start_game(group, ticket)
+        return ticket
+
+    def leave(self, ticket_id: str):
+        """
+        :raises LobbyException: If the player is not waiting, e.g. already matched.
+        """
+        ticket = self._waiting.get(ticket_id)
+        if ticket is None:
+            raise LobbyException(f"Ticket {ticket_id} is not waiting in the lobby.")
+        self._drop(ticket)
+
+    def _drop(self, ticket: LobbyTicket):
+        del self._waiting[ticket.ticket_id]
+        self._dequeue(ticket)
+
+    def _drop_abandoned(self):
+        """Drop the least recently seen waiting tickets, while they are stale."""
+        while self._waiting:
+            ticket = next(iter(self._waiting.values()))
+            if not ticket.is_stale(self.ticket_ttl):
+                break
+            self._drop(ticket)
+
+    def _heads(
+        self, role: Role, team: Optional[AgentType], rating_bucket: int
+    ) -> list[LobbyTicket]:
+        """The first two tickets of a queue, after dropping its stale heads."""
+        queue = self._queues.get((role, team, rating_bucket), {})
+        heads = []
+        while len(heads) < 2:
+            ticket = next(islice(queue.values(), len(heads), None), None)
+            if ticket is None:
+                break
+            if ticket.is_stale(self.ticket_ttl):
+                self._drop(ticket)
+            else:
+                heads.append(ticket)
+        return heads
+
+    def _match(
+        self, rating_bucket: int
+    ) -> Optional[dict[tuple[AgentType, Role], LobbyTicket]]:
+        """Dequeue a full group from a rating bucket, if there is one. Its tickets
+        move to the matched ones, so players can still find them while their game
+        is created.
+
+        :return: The players of the group by team and role.
+        """
+        group = {}
+        for role in PLAYER_ROLES:
+            flexible = iter(self._heads(role, None, rating_bucket))
+            for team in TEAMS:
+                chosen = self._heads(role, team, rating_bucket)[:1]
+                ticket = chosen[0] if chosen else next(flexible, None)
+                if ticket is None:
+                    return None
+                group[team, role] = ticket
+
+        for ticket in group.values():
+            self._drop(ticket)
+            self._matched[ticket.ticket_id] = ticket
+        return group
+
+    def _dequeue(self, ticket: LobbyTicket):
+        queue = self._queues[ticket.queue_key]
+        del queue[ticket.ticket_id]
+        if not queue:
+            del self._queues[ticket.queue_key]
+
+    def _requeue(self, ticket: LobbyTicket):
+        """Put a ticket back at the head of its queue."""
+        self._waiting[ticket.ticket_id] = ticket
+        queue = self._queues.setdefault(ticket.queue_key, OrderedDict())
+        queue[ticket.ticket_id] = ticket
+        queue.move_to_end(ticket.ticket_id, last=False)
+
+    async def _start_game(
+        self,
+        group: dict[tuple[AgentType, Role], LobbyTicket],
+        joining: LobbyTicket,
+    ):
+        """
+        :param joining: The ticket of the player whose join completed the group. If
+                        the game cannot be created, it is dropped rather than
+                        requeued: the player never learns its ID, and joins again.
+        """
+        try:
+            game = await self.game_manager.create_game()
+        except Exception:
+            for ticket in reversed(group.values()):
+                del self._matched[ticket.ticket_id]
+                if ticket is not joining:
+                    self._requeue(ticket)
+            raise
+
+        self.num_games_created += 1
+        for (team, role), ticket in group.items():
+            ticket.assign(Assignment(game_id=game.game_id, team=team, role=role))
+        while len(self._matched) > self.max_matched_tickets:
+            self._matched.popitem(last=False)
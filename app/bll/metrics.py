@@ -0,0 +1,330 @@
+import functools
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+# Seconds, from a few microseconds (board checks) to seconds (slow requests).
+DEFAULT_LATENCY_BUCKETS = (
+    0.000005,
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+
+class CounterValue:
+    """The value of a counter for one set of label values."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class GaugeValue:
+    """The value of a gauge for one set of label values."""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class HistogramValue:
+    """The observations of a histogram for one set of label values."""
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # The last count is of the observations above every bound.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        bucket = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class Metric(ABC):
+    """
+    A family of values sharing a name, one per set of label values.
+
+    Look the value of a set of labels up once with `labels`, and keep it to record
+    to it: recording is then a lock and an addition.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_value(self):
+        pass
+
+    def labels(self, *label_values: str):
+        """
+        :raises ValueError: If the number of values does not match the label names.
+        """
+        value = self._values.get(label_values)
+        if value is None:
+            if len(label_values) != len(self.label_names):
+                raise ValueError(
+                    f"{self.name} has labels {self.label_names}, got {label_values}."
+                )
+            with self._lock:
+                value = self._values.setdefault(label_values, self._new_value())
+        return value
+
+    def _labelled_values(self) -> Iterator[tuple[dict[str, str], object]]:
+        for label_values, value in list(self._values.items()):
+            yield dict(zip(self.label_names, label_values)), value
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """The samples of the metric, as (name, labels, value)."""
+        for labels, value in self._labelled_values():
+            yield self.name, labels, value.value
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def _new_value(self) -> CounterValue:
+        return CounterValue()
+
+    def inc(self, amount: float = 1):
+        """Add to the counter without labels."""
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def _new_value(self) -> GaugeValue:
+        return GaugeValue()
+
+    def set(self, value: float):
+        """Set the gauge without labels."""
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self) -> HistogramValue:
+        return HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        """Observe a value for the histogram without labels."""
+        self.labels().observe(value)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        for labels, value in self._labelled_values():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), value.counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": bound}, cumulative
+            yield f"{self.name}_sum", labels, value.sum
+            yield f"{self.name}_count", labels, cumulative
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(labels: dict[str, object]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        if not isinstance(value, str):
+            value = _format_value(value)
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsRegistry:
+    """
+    The metrics of a process, rendered in the Prometheus text format.
+
+    Every process keeps its own metrics: with several workers, each scrape sees the
+    worker that served it, which Prometheus sums up by instance.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, label_names: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(
+        self, name: str, documentation: str, label_names: tuple[str, ...] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# The time spent in each phase by the request being profiled, if any.
+_phase_seconds: ContextVar[Optional[dict[str, float]]] = ContextVar(
+    "phase_seconds", default=None
+)
+
+
+@contextmanager
+def record_phases() -> Iterator[dict[str, float]]:
+    """Add up the time spent in each phase while the block runs, in this context
+    and the threads it hands work to with `asyncio.to_thread`. Phases can nest, e.g.
+    `check_game_end` within `make_move`.
+
+    :return: The seconds spent by phase, filled in as the block runs.
+    """
+    phase_seconds = {}
+    token = _phase_seconds.set(phase_seconds)
+    try:
+        yield phase_seconds
+    finally:
+        _phase_seconds.reset(token)
+
+
+def timed(histogram: HistogramValue, phase: Optional[str] = None) -> Callable[[F], F]:
+    """Decorate a function to observe how long each call takes, in seconds.
+
+    :param phase: The phase to add the time to when phases are being recorded.
+    """
+
+    def decorator(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                histogram.observe(elapsed)
+                if phase is not None and (phases := _phase_seconds.get()) is not None:
+                    phases[phase] = phases.get(phase, 0.0) + elapsed
+
+        return wrapper
+
+    return decorator
+
+
+def timed_operation(name: str) -> Callable[[F], F]:
+    """Decorate a game or storage operation to observe its latency, and tag its
+    phase in profiled requests."""
+    return timed(OPERATION_SECONDS.labels(name), phase=name)
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "codenames_request_seconds",
+    "Time to serve HTTP requests, by method, route and status code.",
+    ("method", "route", "status"),
+)
+OPERATION_SECONDS = REGISTRY.histogram(
+    "codenames_operation_seconds",
+    "Time spent in game and storage operations.",
+    ("operation",),
+)
+GAMES_CREATED = REGISTRY.counter(
+    "codenames_games_created_total", "Games created and stored."
+)
+MOVES = REGISTRY.counter(
+    "codenames_moves_total",
+    "Moves stored, by kind: clue, guess, end_turn or timeout.",
+    ("kind",),
+)
+WINS = REGISTRY.counter(
+    "codenames_wins_total",
+    "Games won, by winning team and how the game ended.",
+    ("team", "end_status"),
+)
+ACTIVE_GAMES = REGISTRY.gauge(
+    "codenames_active_games", "Ongoing games in the hot cache of this worker."
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    "codenames_cache_entries", "Entries in the caches of this worker.", ("cache",)
+)
@@ -0,0 +1,297 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterator, NamedTuple, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.bll.ai_players import AIOperative, AISpymaster
+from app.bll.embeddings import WordEmbeddings
+from app.bll.game import Game
+from app.bll.game_runner import play_guesses, play_turn
+from app.bll.game_utils import change_player
+from app.bll.player import Spymaster
+from app.bll.types import AgentType, Clue, GameEndStatus, TeamColor
+
+DEFAULT_NUM_CANDIDATES = 8
+DEFAULT_ROLLOUTS_PER_CANDIDATE = 32
+DEFAULT_ROLLOUT_BATCH_SIZE = 4
+DEFAULT_TIME_BUDGET = 2.0
+DEFAULT_ROLLOUT_POOL_SIZE = 64
+DEFAULT_MAX_ROLLOUT_TURNS = 12
+DEFAULT_EMBEDDING_NOISE = 0.3
+
+
+class ClueEvaluation(BaseModel):
+    clue: Clue
+    greedy_score: float
+    win_probability: float | None
+    win_probability_delta: float | None
+    num_rollouts: int
+
+
+class _RolloutTask(NamedTuple):
+    game: Game
+    team: TeamColor
+    clue: Clue | None
+    words: list[str]
+    vectors: np.ndarray
+    num_clue_words: int
+    num_rollouts: int
+    random_seed: int
+    noise: float
+    max_turns: int
+
+
+class MonteCarloSpymaster(Spymaster):
+    """
+    A spymaster that looks ahead by simulating the rest of the game.
+
+    The greedy `AISpymaster` proposes the top candidate clues. Each candidate is
+    evaluated by rollouts: the game is forked, the operative plays the clue, and both
+    teams keep playing with greedy bots until the game ends (or `max_rollout_turns`
+    pass, in which case the position is scored by the agents left). Every rollout
+    perturbs the word vectors with noise, standing in for how differently players
+    associate words. A baseline of rollouts where the team passes its turn is used to
+    report each clue's win-probability delta.
+
+    Rollouts run in a process pool in batches, submitted round-robin across
+    candidates as workers free up, so when the `time_budget` (in seconds) runs out
+    every candidate has a comparable number of finished rollouts. Only one batch per
+    worker is in flight at a time: the batches still running at the deadline are
+    discarded, and the others were never submitted.
+
+    :param executor: The pool to run rollouts in, e.g. shared between spymasters, or
+                     None to start a process pool on the first clue.
+    :param max_workers: The size of the process pool started, and how many batches
+                        are in flight at a time; by default, one per CPU.
+    """
+
+    def __init__(
+        self,
+        team: TeamColor,
+        embeddings: WordEmbeddings,
+        clue_words: list[str],
+        num_candidates: int = DEFAULT_NUM_CANDIDATES,
+        rollouts_per_candidate: int = DEFAULT_ROLLOUTS_PER_CANDIDATE,
+        rollout_batch_size: int = DEFAULT_ROLLOUT_BATCH_SIZE,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        rollout_pool_size: int = DEFAULT_ROLLOUT_POOL_SIZE,
+        max_rollout_turns: int = DEFAULT_MAX_ROLLOUT_TURNS,
+        embedding_noise: float = DEFAULT_EMBEDDING_NOISE,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        random_seed: Optional[int] = None,
+        **spymaster_kwargs,
+    ):
+        super().__init__(team)
+
+        self.greedy = AISpymaster(team, embeddings, clue_words, **spymaster_kwargs)
+        self.num_candidates = num_candidates
+        self.rollouts_per_candidate = rollouts_per_candidate
+        self.rollout_batch_size = rollout_batch_size
+        self.time_budget = time_budget
+        self.rollout_pool_size = rollout_pool_size
+        self.max_rollout_turns = max_rollout_turns
+        self.embedding_noise = embedding_noise
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_workers = max_workers
+        self._rng = np.random.default_rng(random_seed)
+
+        self.current_turn = {}
+        self.last_evaluations: list[ClueEvaluation] = []
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def close(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def prefix_turn(self, game: Game):
+        self.current_turn["game"] = game
+
+    def offer_clue(self) -> Clue:
+        self.last_evaluations = self.evaluate_clues(self.current_turn["game"])
+        return self.last_evaluations[0].clue
+
+    def evaluate_clues(self, game: Game) -> list[ClueEvaluation]:
+        """Evaluate the greedy spymaster's top clues by parallel rollouts.
+
+        :param game: The full game, with the spymaster's team on turn.
+        :return: The evaluated candidates, best first. Candidates are ordered by
+                 estimated win probability, and by greedy score when no rollout
+                 finished in time.
+        """
+        deadline = time.monotonic() + self.time_budget
+        candidates = self.greedy.rank_clues(game, top_k=self.num_candidates)
+        words, vectors, num_clue_words = self._rollout_vocabulary(game, candidates)
+
+        # The last "candidate" is the baseline of passing the turn.
+        clues = [clue for clue, _ in candidates] + [None]
+        values = [[] for _ in clues]
+        tasks = self._rollout_tasks(game, clues, words, vectors, num_clue_words)
+        max_in_flight = self._max_workers or os.cpu_count() or 1
+        pending = {}
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for i, task in islice(tasks, max_in_flight - len(pending)):
+                pending[self.executor.submit(run_rollouts, task)] = i
+            if not pending:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                values[pending.pop(future)].extend(future.result())
+        for future in pending:
+            future.cancel()
+
+        baseline = np.mean(values[-1]) if values[-1] else None
+        evaluations = []
+        for (clue, greedy_score), clue_values in zip(candidates, values):
+            win_probability = float(np.mean(clue_values)) if clue_values else None
+            evaluations.append(
+                ClueEvaluation(
+                    clue=clue,
+                    greedy_score=greedy_score,
+                    win_probability=win_probability,
+                    win_probability_delta=None
+                    if win_probability is None or baseline is None
+                    else win_probability - float(baseline),
+                    num_rollouts=len(clue_values),
+                )
+            )
+
+        evaluations.sort(
+            key=lambda evaluation: (
+                evaluation.win_probability is not None,
+                evaluation.win_probability or 0.0,
+                evaluation.greedy_score,
+            ),
+            reverse=True,
+        )
+        return evaluations
+
+    def _rollout_tasks(
+        self,
+        game: Game,
+        clues: list[Clue | None],
+        words: list[str],
+        vectors: np.ndarray,
+        num_clue_words: int,
+    ) -> Iterator[tuple[int, _RolloutTask]]:
+        """The batches of rollouts of the clues, round-robin.
+
+        :return: The index of the clue of each batch, and the batch.
+        """
+        for batch_start in range(
+            0, self.rollouts_per_candidate, self.rollout_batch_size
+        ):
+            num_rollouts = min(
+                self.rollout_batch_size, self.rollouts_per_candidate - batch_start
+            )
+            for i, clue in enumerate(clues):
+                yield (
+                    i,
+                    _RolloutTask(
+                        game=game,
+                        team=self.team,
+                        clue=clue,
+                        words=words,
+                        vectors=vectors,
+                        num_clue_words=num_clue_words,
+                        num_rollouts=num_rollouts,
+                        random_seed=int(self._rng.integers(2**32)),
+                        noise=self.embedding_noise,
+                        max_turns=self.max_rollout_turns,
+                    ),
+                )
+
+    def _rollout_vocabulary(
+        self, game: Game, candidates: list[tuple[Clue, float]]
+    ) -> tuple[list[str], np.ndarray, int]:
+        """
+        Pick the small vocabulary the rollouts play with: the candidates, the best
+        clues for either team on the current board, and the board words themselves.
+
+        :return: The words, their vectors and how many of the words (from the start)
+                 may be used as clues.
+        """
+        clue_words = [clue.clue for clue, _ in candidates]
+        for team in (self.team, change_player(self.team)):
+            if _agents_left(game, team) > 0:
+                clue_words.extend(
+                    clue.clue
+                    for clue, score in self.greedy.rank_clues(
+                        game, top_k=self.rollout_pool_size, team=team
+                    )
+                    if score > -np.inf
+                )
+        clue_words = list(dict.fromkeys(clue_words))
+        board_words = [card.word for row in game.board.words for card in row]
+
+        words = clue_words + board_words
+        return words, self.greedy.embeddings.vectors_for(words), len(clue_words)
+
+
+def run_rollouts(task: _RolloutTask) -> list[float]:
+    """Play `task.num_rollouts` noisy rollouts of a clue.
+
+    :return: For every rollout, 1.0 if `task.team` won, 0.0 if it lost, and a value
+             in between based on the agents left when the rollout was cut short.
+    """
+    rng = np.random.default_rng(task.random_seed)
+    return [_run_rollout(task, rng) for _ in range(task.num_rollouts)]
+
+
+def _run_rollout(task: _RolloutTask, rng: np.random.Generator) -> float:
+    noisy_vectors = task.vectors + rng.normal(
+        scale=task.noise / np.sqrt(task.vectors.shape[1]), size=task.vectors.shape
+    )
+    embeddings = WordEmbeddings(task.words, noisy_vectors)
+    clue_words = task.words[: task.num_clue_words]
+    players = {
+        team: (
+            AISpymaster(team, embeddings, clue_words),
+            AIOperative(team, embeddings),
+        )
+        for team in (AgentType.RED, AgentType.BLUE)
+    }
+
+    game = task.game.model_copy(deep=True)
+    team = game.current_turn.team
+    if task.clue is None:
+        game.end_turn()
+        game_end_status = GameEndStatus.ONGOING
+    else:
+        game.set_clue(task.clue)
+        game_end_status = play_guesses(game, players[team][1])
+
+    for _ in range(task.max_turns):
+        if game_end_status != GameEndStatus.ONGOING:
+            break
+        team = game.current_turn.team
+        game_end_status = play_turn(game, *players[team])
+
+    if game_end_status == GameEndStatus.ONGOING:
+        lead = _agents_left(game, change_player(task.team)) - _agents_left(
+            game, task.team
+        )
+        return float(np.clip(0.5 + lead / 18, 0.0, 1.0))
+    return 1.0 if game.winner == task.team else 0.0
+
+
+def _agents_left(game: Game, team: TeamColor) -> int:
+    return sum(
+        coordinate not in game.board.discovered_agents
+        for coordinate in game.board.agent_placements.positions[team]
+    )
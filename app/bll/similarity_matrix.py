@@ -0,0 +1,185 @@
+import argparse
+import json
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+
+from app.bll.embeddings import WordEmbeddings
+
+SimilarityDType = Literal["float32", "float16", "int8"]
+
+CARD_CARD_FILE = "card_card_similarity.npy"
+CARD_CLUE_FILE = "card_clue_similarity.npy"
+METADATA_FILE = "similarity_metadata.json"
+INT8_SCALE = 127.0
+BUILD_CHUNK_SIZE = 16384
+
+
+class SimilarityMatrices:
+    """
+    Precomputed card x card and card x clue cosine similarities.
+
+    The matrices are memory-mapped, so loading them is instant and every process
+    serving AI turns shares the same pages. Per-turn work becomes indexing the rows
+    (and columns) of the 25 board words. Values may be stored as float16, or as int8
+    scaled by `INT8_SCALE`; they are always returned as float32.
+    """
+
+    def __init__(
+        self,
+        card_words: list[str],
+        clue_words: list[str],
+        card_card: np.ndarray,
+        card_clue: np.ndarray,
+    ):
+        self.card_words = card_words
+        self.clue_words = clue_words
+        self.card_card = card_card
+        self.card_clue = card_clue
+        self._card_index = {
+            WordEmbeddings.normalize_word(word): i for i, word in enumerate(card_words)
+        }
+        self._clue_index = {
+            WordEmbeddings.normalize_word(word): i for i, word in enumerate(clue_words)
+        }
+
+    def __contains__(self, card_word: str) -> bool:
+        return WordEmbeddings.normalize_word(card_word) in self._card_index
+
+    def clue_id(self, clue_word: str) -> int | None:
+        return self._clue_index.get(WordEmbeddings.normalize_word(clue_word))
+
+    def card_ids(self, card_words: list[str]) -> np.ndarray:
+        try:
+            return np.array(
+                [
+                    self._card_index[WordEmbeddings.normalize_word(word)]
+                    for word in card_words
+                ],
+                dtype=np.int64,
+            )
+        except KeyError as e:
+            raise ValueError(f"Card word {e.args[0]} has no precomputed row.") from e
+
+    def card_card_similarities(self, card_words: list[str]) -> np.ndarray:
+        """
+        :return: A (len(card_words), len(card_words)) similarity matrix.
+        """
+        ids = self.card_ids(card_words)
+        return self._dequantize(self.card_card[np.ix_(ids, ids)])
+
+    def card_clue_similarities(
+        self, card_words: list[str], clue_ids: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        :param card_words: The words of the rows to fetch.
+        :param clue_ids: Optionally, only the clue columns to fetch.
+        :return: A (len(card_words), num_clues) similarity matrix.
+        """
+        rows = self.card_clue[self.card_ids(card_words)]
+        if clue_ids is not None:
+            rows = rows[:, clue_ids]
+        return self._dequantize(rows)
+
+    @staticmethod
+    def _dequantize(values: np.ndarray) -> np.ndarray:
+        if values.dtype == np.int8:
+            return values.astype(np.float32) / INT8_SCALE
+        return values.astype(np.float32, copy=False)
+
+    @staticmethod
+    def _quantize(values: np.ndarray, dtype: SimilarityDType) -> np.ndarray:
+        if dtype == "int8":
+            return np.clip(np.rint(values * INT8_SCALE), -INT8_SCALE, INT8_SCALE)
+        return values
+
+    @classmethod
+    def build(
+        cls,
+        embeddings: WordEmbeddings,
+        card_words: list[str],
+        clue_words: list[str],
+        directory: Path | str,
+        dtype: SimilarityDType = "float16",
+    ) -> "SimilarityMatrices":
+        """Compute both matrices and write them under `directory`.
+
+        The card x clue matrix is filled in column chunks, so building it never needs
+        more memory than one chunk on top of the embeddings.
+
+        :param embeddings: The embeddings to take the similarities from.
+        :param card_words: The card words (rows of both matrices).
+        :param clue_words: The clue words (columns of the card x clue matrix). Words
+                           without an embedding are dropped, like the AI players do.
+        :param directory: Where to write the matrices.
+        :param dtype: The storage type of the similarities.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        clue_words = [word for word in clue_words if word in embeddings]
+
+        card_vectors = embeddings.vectors_for(card_words)
+        np.save(
+            directory / CARD_CARD_FILE,
+            cls._quantize(card_vectors @ card_vectors.T, dtype).astype(dtype),
+        )
+
+        card_clue = np.lib.format.open_memmap(
+            directory / CARD_CLUE_FILE,
+            mode="w+",
+            dtype=dtype,
+            shape=(len(card_words), len(clue_words)),
+        )
+        for start in range(0, len(clue_words), BUILD_CHUNK_SIZE):
+            chunk = embeddings.vectors_for(clue_words[start : start + BUILD_CHUNK_SIZE])
+            card_clue[:, start : start + len(chunk)] = cls._quantize(
+                card_vectors @ chunk.T, dtype
+            )
+        card_clue.flush()
+        del card_clue
+
+        with (directory / METADATA_FILE).open("w") as f:
+            json.dump({"card_words": card_words, "clue_words": clue_words}, f)
+
+        return cls.load(directory)
+
+    @classmethod
+    def load(cls, directory: Path | str) -> "SimilarityMatrices":
+        directory = Path(directory)
+        with (directory / METADATA_FILE).open("r") as f:
+            metadata = json.load(f)
+
+        return cls(
+            card_words=metadata["card_words"],
+            clue_words=metadata["clue_words"],
+            card_card=np.load(directory / CARD_CARD_FILE, mmap_mode="r"),
+            card_clue=np.load(directory / CARD_CLUE_FILE, mmap_mode="r"),
+        )
+
+
+if __name__ == "__main__":
+    from app.dal.local_dal import LocalDataAccess
+
+    parser = argparse.ArgumentParser(
+        description="Precompute the card similarity matrices of a data directory."
+    )
+    parser.add_argument("data_dir", nargs="?", default="data")
+    parser.add_argument(
+        "--dtype", choices=["float32", "float16", "int8"], default="float16"
+    )
+    args = parser.parse_args()
+
+    dal = LocalDataAccess(args.data_dir)
+    matrices = SimilarityMatrices.build(
+        dal.load_word_embeddings(),
+        dal.load_card_words(),
+        dal.load_clue_words(),
+        dal.similarity_matrices_dir,
+        dtype=args.dtype,
+    )
+    print(
+        f"Wrote {len(matrices.card_words)}x{len(matrices.card_words)} card and "
+        f"{len(matrices.card_words)}x{len(matrices.clue_words)} clue similarities "
+        f"({args.dtype}) to {dal.similarity_matrices_dir}."
+    )
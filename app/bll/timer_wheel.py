@@ -0,0 +1,147 @@
+import math
+from typing import Hashable, Optional
+
+DEFAULT_TICK_SECONDS = 1.0
+DEFAULT_SLOTS_PER_LEVEL = 64
+DEFAULT_NUM_LEVELS = 4
+
+
+class TimerWheel:
+    """
+    A hierarchical timer wheel: schedules a deadline per key, and reports the keys
+    whose deadlines passed in batches.
+
+    Level 0 has a slot per tick; every slot of level L spans `slots_per_level` slots
+    of level L - 1. A timer sits in the slot of the coarsest level that still tells
+    it apart from now, and moves down a level each time the wheel reaches that slot,
+    until it expires from level 0. Scheduling and cancelling are O(1), and advancing
+    the wheel only touches the timers due (plus the ones moving down), however many
+    timers are pending and however long since it was last advanced. With the defaults, deadlines up
+    to 64^4 seconds (~194 days) away are placed exactly; later ones wait at the top
+    level and are placed again as time passes.
+
+    Deadlines are rounded up to whole ticks, so a key never expires early.
+    """
+
+    def __init__(
+        self,
+        tick: float = DEFAULT_TICK_SECONDS,
+        slots_per_level: int = DEFAULT_SLOTS_PER_LEVEL,
+        num_levels: int = DEFAULT_NUM_LEVELS,
+        start: float = 0.0,
+    ):
+        """
+        :param tick: The length of a tick, in the units of the deadlines.
+        :param start: The time the wheel starts at.
+        """
+        self.tick = tick
+        self.slots_per_level = slots_per_level
+        self.num_levels = num_levels
+        self.start = start
+        self._now_tick = 0
+        self._levels: list[list[set[Hashable]]] = [
+            [set() for _ in range(slots_per_level)] for _ in range(num_levels)
+        ]
+        self._level_sizes = [0] * num_levels
+        # Key -> (deadline, expiry tick, level, slot).
+        self._timers: dict[Hashable, tuple[float, int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    @property
+    def now(self) -> float:
+        """The time the wheel was last advanced to, rounded down to a tick."""
+        return self.start + self._now_tick * self.tick
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        timer = self._timers.get(key)
+        return None if timer is None else timer[0]
+
+    def schedule(self, key: Hashable, deadline: float):
+        """Set the deadline of a key, replacing the one it had."""
+        self.cancel(key)
+        expiry_tick = max(
+            self._now_tick + 1, math.ceil((deadline - self.start) / self.tick)
+        )
+        self._place(key, deadline, expiry_tick)
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        :return: Whether the key had a deadline.
+        """
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        _, _, level, slot = timer
+        self._levels[level][slot].discard(key)
+        self._level_sizes[level] -= 1
+        return True
+
+    def advance(self, now: float) -> list[Hashable]:
+        """Move the wheel forward to a time.
+
+        Only the ticks at which timers expire or move down a level are visited, so
+        the cost does not grow with the time elapsed.
+
+        :return: The keys whose deadlines passed, tick by tick. They no longer
+                 have deadlines.
+        """
+        expired = []
+        target_tick = math.floor((now - self.start) / self.tick)
+        while (next_tick := self._next_busy_tick()) <= target_tick:
+            self._now_tick = next_tick
+            # Coarser levels first, so timers due now can move all the way down.
+            for level in range(self.num_levels - 1, 0, -1):
+                span = self.slots_per_level**level
+                if next_tick % span == 0:
+                    self._cascade(level, (next_tick // span) % self.slots_per_level)
+
+            slot = self._levels[0][next_tick % self.slots_per_level]
+            for key in slot:
+                del self._timers[key]
+            self._level_sizes[0] -= len(slot)
+            expired.extend(slot)
+            slot.clear()
+        self._now_tick = max(self._now_tick, target_tick)
+        return expired
+
+    def _next_busy_tick(self) -> float:
+        """The first tick after now with timers to expire or move down a level."""
+        busy_tick = math.inf
+        for level in range(self.num_levels):
+            if not self._level_sizes[level]:
+                continue
+            span = self.slots_per_level**level
+            # A level's timers are all in its next `slots_per_level` blocks.
+            now_block = self._now_tick // span
+            for block in range(now_block + 1, now_block + self.slots_per_level + 1):
+                if self._levels[level][block % self.slots_per_level]:
+                    busy_tick = min(busy_tick, block * span)
+                    break
+        return busy_tick
+
+    def _place(self, key: Hashable, deadline: float, expiry_tick: int):
+        for level in range(self.num_levels):
+            span = self.slots_per_level**level
+            block = expiry_tick // span
+            if block - self._now_tick // span < self.slots_per_level:
+                break
+        else:
+            # Too far away: wait in the last slot of the top level for now.
+            block = self._now_tick // span + self.slots_per_level - 1
+        slot = block % self.slots_per_level
+        self._levels[level][slot].add(key)
+        self._level_sizes[level] += 1
+        self._timers[key] = (deadline, expiry_tick, level, slot)
+
+    def _cascade(self, level: int, slot: int):
+        keys = self._levels[level][slot]
+        self._levels[level][slot] = set()
+        self._level_sizes[level] -= len(keys)
+        for key in keys:
+            deadline, expiry_tick, _, _ = self._timers[key]
+            self._place(key, deadline, expiry_tick)
@@ -0,0 +1,408 @@
+import argparse
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.bll.ai_players import AIOperative, AISpymaster
+from app.bll.board import AgentPlacements
+from app.bll.game import Game
+from app.bll.game_runner import play_game
+from app.bll.planning_spymaster import MonteCarloSpymaster
+from app.bll.player import Operative, Spymaster
+from app.bll.types import AgentType, TeamColor
+
+DEFAULT_K_FACTOR = 24.0
+DEFAULT_INITIAL_RATING = 1500.0
+
+RESULTS_FILE = "results.ndjson"
+SCHEDULE_FILE = "schedule.json"
+RATINGS_FILE = "ratings.json"
+
+
+class BotConfig(BaseModel):
+    """A registered bot: a spymaster and an operative that play as one team."""
+
+    name: str
+    spymaster: str = "ai"
+    operative: str = "ai"
+    spymaster_params: dict[str, Any] = Field(default_factory=dict)
+    operative_params: dict[str, Any] = Field(default_factory=dict)
+
+
+class TournamentConfig(BaseModel):
+    bots: list[BotConfig]
+    data_dir: str = "data"
+    pairing: Literal["round_robin", "swiss"] = "round_robin"
+    # For round robin, every round plays every pair of bots once per color.
+    num_rounds: int = 1
+    workers: Optional[int] = None
+    # Worker processes for the rollouts of the planning spymasters of each game; by
+    # default, the CPUs left over by the game workers.
+    rollout_workers: Optional[int] = None
+    k_factor: float = DEFAULT_K_FACTOR
+    random_seed: int = 0
+
+
+class Match(BaseModel):
+    match_id: str
+    round: int
+    red: str
+    blue: str
+    random_seed: int
+
+
+class MatchResult(BaseModel):
+    """The compact record kept for every played game."""
+
+    match_id: str
+    round: int
+    red: str
+    blue: str
+    winner: Optional[str]
+    end_status: str
+    num_turns: int
+
+
+class EloRatings:
+    def __init__(
+        self,
+        names: list[str],
+        k_factor: float = DEFAULT_K_FACTOR,
+        initial_rating: float = DEFAULT_INITIAL_RATING,
+    ):
+        self.k_factor = k_factor
+        self.ratings = dict.fromkeys(names, initial_rating)
+        self.games_played = dict.fromkeys(names, 0)
+
+    def expected_score(self, player: str, opponent: str) -> float:
+        return 1 / (1 + 10 ** ((self.ratings[opponent] - self.ratings[player]) / 400))
+
+    def update(self, result: MatchResult):
+        """Apply one game to the ratings. A game without a winner counts as a draw."""
+        red_score = 0.5 if result.winner is None else float(result.winner == result.red)
+        red_delta = self.k_factor * (
+            red_score - self.expected_score(result.red, result.blue)
+        )
+        self.ratings[result.red] += red_delta
+        self.ratings[result.blue] -= red_delta
+        self.games_played[result.red] += 1
+        self.games_played[result.blue] += 1
+
+    def standings(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": name,
+                "rating": round(rating, 1),
+                "games": self.games_played[name],
+            }
+            for name, rating in sorted(
+                self.ratings.items(), key=lambda item: item[1], reverse=True
+            )
+        ]
+
+
+def round_robin_pairings(names: list[str]) -> list[tuple[str, str]]:
+    """Every pair of bots plays twice, once with each color."""
+    return [
+        pairing
+        for first, second in itertools.combinations(names, 2)
+        for pairing in ((first, second), (second, first))
+    ]
+
+
+def swiss_pairings(
+    ratings: EloRatings, played: set[frozenset[str]]
+) -> list[tuple[str, str]]:
+    """
+    Pair bots of similar rating: walk the standings from the top, pairing every
+    unpaired bot with the next one it has not met yet (or the next one at all, when
+    it has met everyone). An odd bot out sits the round out.
+
+    :return: The pairs, the lower-rated bot first.
+    """
+    unpaired = [standing["name"] for standing in ratings.standings()]
+    pairings = []
+    while len(unpaired) > 1:
+        first = unpaired.pop(0)
+        opponent = next(
+            (name for name in unpaired if frozenset((first, name)) not in played),
+            unpaired[0],
+        )
+        unpaired.remove(opponent)
+        pairings.append((opponent, first))
+    return pairings
+
+
+SPYMASTER_FACTORIES: dict[str, Callable[..., Spymaster]] = {
+    "ai": AISpymaster,
+    "monte_carlo": MonteCarloSpymaster,
+}
+OPERATIVE_FACTORIES: dict[str, Callable[..., Operative]] = {
+    "ai": AIOperative,
+}
+# Spymasters running rollouts in a pool of worker processes.
+POOLED_SPYMASTERS = {"monte_carlo"}
+
+
+@lru_cache(maxsize=None)
+def _load_data_access(data_dir: str):
+    from app.dal.local_dal import LocalDataAccess
+
+    return LocalDataAccess(data_dir)
+
+
+@lru_cache(maxsize=None)
+def _load_word_resources(data_dir: str):
+    dal = _load_data_access(data_dir)
+    return dal.load_word_embeddings(), dal.load_clue_words()
+
+
+def _create_players(
+    bot: BotConfig,
+    team: TeamColor,
+    data_dir: str,
+    rollout_executor: Optional[ProcessPoolExecutor],
+    rollout_workers: int,
+) -> tuple[Spymaster, Operative]:
+    embeddings, clue_words = _load_word_resources(data_dir)
+    spymaster_params = bot.spymaster_params
+    if bot.spymaster in POOLED_SPYMASTERS:
+        spymaster_params = {
+            "executor": rollout_executor,
+            "max_workers": rollout_workers,
+            **spymaster_params,
+        }
+    spymaster = SPYMASTER_FACTORIES[bot.spymaster](
+        team, embeddings, clue_words, **spymaster_params
+    )
+    operative = OPERATIVE_FACTORIES[bot.operative](
+        team, embeddings, **bot.operative_params
+    )
+    return spymaster, operative
+
+
+def play_match(
+    match: Match, bots: dict[str, BotConfig], data_dir: str, rollout_workers: int = 1
+) -> MatchResult:
+    """Play one game of a tournament. Runs inside the worker processes.
+
+    The word resources are loaded once per worker process and reused across games.
+    The planning spymasters of a game share one pool of rollout workers, rather than
+    each starting a pool sized for the whole machine.
+
+    :param rollout_workers: The size of the rollout pool.
+    """
+    game = Game.new_game(_load_data_access(data_dir), random_seed=match.random_seed)
+    names = {AgentType.RED: match.red, AgentType.BLUE: match.blue}
+    rollout_executor = None
+    if any(bots[name].spymaster in POOLED_SPYMASTERS for name in names.values()):
+        rollout_executor = ProcessPoolExecutor(max_workers=rollout_workers)
+    try:
+        players = {
+            team: _create_players(
+                bots[name], team, data_dir, rollout_executor, rollout_workers
+            )
+            for team, name in names.items()
+        }
+        try:
+            winner, game_end_status, num_turns = play_game(game, players)
+        finally:
+            for spymaster, _ in players.values():
+                if hasattr(spymaster, "close"):
+                    spymaster.close()
+    finally:
+        if rollout_executor is not None:
+            rollout_executor.shutdown(cancel_futures=True)
+
+    return MatchResult(
+        match_id=match.match_id,
+        round=match.round,
+        red=match.red,
+        blue=match.blue,
+        winner=None if winner is None else names[winner],
+        end_status=game_end_status.value,
+        num_turns=num_turns,
+    )
+
+
+class Tournament:
+    """
+    Runs a tournament between bot configurations and keeps Elo ratings.
+
+    Progress is checkpointed under `output_dir`: the schedule of every round is
+    written before the round starts, and every finished game is appended to an NDJSON
+    results file as soon as it completes. Running the same tournament again resumes
+    it: finished games are replayed into the ratings and only the missing ones are
+    played.
+    """
+
+    def __init__(self, config: TournamentConfig, output_dir: Path | str):
+        if len({bot.name for bot in config.bots}) != len(config.bots):
+            raise ValueError("Bot names must be unique.")
+
+        self.config = config
+        self.bots = {bot.name: bot for bot in config.bots}
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.ratings = EloRatings(list(self.bots), k_factor=config.k_factor)
+        self.schedule: list[list[Match]] = self._load_schedule()
+        self.results: dict[str, MatchResult] = {}
+        for result in self._load_results():
+            self._record(result)
+
+    @property
+    def results_file(self) -> Path:
+        return self.output_dir / RESULTS_FILE
+
+    def run(self) -> list[dict[str, Any]]:
+        """Play all the rounds that are not finished yet.
+
+        :return: The final standings.
+        """
+        num_cpus = os.cpu_count() or 1
+        rollout_workers = self.config.rollout_workers or max(
+            1, num_cpus // (self.config.workers or num_cpus)
+        )
+        with ProcessPoolExecutor(max_workers=self.config.workers) as executor:
+            for round_number in range(self.config.num_rounds):
+                if round_number >= len(self.schedule):
+                    self.schedule.append(self._schedule_round(round_number))
+                    self._save_schedule()
+
+                pending = [
+                    match
+                    for match in self.schedule[round_number]
+                    if match.match_id not in self.results
+                ]
+                futures = [
+                    executor.submit(
+                        play_match,
+                        match,
+                        self.bots,
+                        self.config.data_dir,
+                        rollout_workers,
+                    )
+                    for match in pending
+                ]
+                with self.results_file.open("a") as results_file:
+                    for future in as_completed(futures):
+                        result = future.result()
+                        results_file.write(result.model_dump_json() + "\n")
+                        results_file.flush()
+                        self._record(result)
+
+                self._save_ratings()
+
+        return self.ratings.standings()
+
+    def _record(self, result: MatchResult):
+        if result.match_id in self.results:
+            return
+        self.results[result.match_id] = result
+        self.ratings.update(result)
+
+    def _schedule_round(self, round_number: int) -> list[Match]:
+        if self.config.pairing == "round_robin":
+            pairings = round_robin_pairings(list(self.bots))
+        else:
+            played = {
+                frozenset((result.red, result.blue)) for result in self.results.values()
+            }
+            pairings = swiss_pairings(self.ratings, played)
+
+        # Both games of a pair of bots are played on the same board, so the colors
+        # are the only difference between them.
+        rng = random.Random(f"{self.config.random_seed}-{round_number}")
+        board_seeds = {}
+        matches = []
+        for i, (red, blue) in enumerate(pairings):
+            random_seed = board_seeds.setdefault(
+                frozenset((red, blue)), rng.randrange(2**32)
+            )
+            # A Swiss pair plays one game: give the lower-rated bot the color that
+            # moves first on its board.
+            if self.config.pairing == "swiss" and (
+                AgentPlacements.random(random_seed).starting_color == AgentType.BLUE
+            ):
+                red, blue = blue, red
+            matches.append(
+                Match(
+                    match_id=f"{round_number}-{i}",
+                    round=round_number,
+                    red=red,
+                    blue=blue,
+                    random_seed=random_seed,
+                )
+            )
+        return matches
+
+    def _load_schedule(self) -> list[list[Match]]:
+        schedule_file = self.output_dir / SCHEDULE_FILE
+        if not schedule_file.exists():
+            return []
+
+        with schedule_file.open("r") as f:
+            return [
+                [Match.model_validate(match) for match in matches]
+                for matches in json.load(f)
+            ]
+
+    def _save_schedule(self):
+        self._write_atomically(
+            self.output_dir / SCHEDULE_FILE,
+            json.dumps(
+                [[match.model_dump() for match in matches] for matches in self.schedule]
+            ),
+        )
+
+    def _load_results(self) -> list[MatchResult]:
+        if not self.results_file.exists():
+            return []
+
+        with self.results_file.open("rb+") as f:
+            content = f.read()
+            # Drop a line cut short by a crash, its game will be played again.
+            complete_length = content.rfind(b"\n") + 1
+            if complete_length < len(content):
+                f.truncate(complete_length)
+
+        return [
+            MatchResult.model_validate_json(line)
+            for line in content[:complete_length].splitlines()
+            if line.strip()
+        ]
+
+    def _save_ratings(self):
+        self._write_atomically(
+            self.output_dir / RATINGS_FILE, json.dumps(self.ratings.standings())
+        )
+
+    @staticmethod
+    def _write_atomically(path: Path, content: str):
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        with temp_path.open("w") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run (or resume) a tournament between bot configurations."
+    )
+    parser.add_argument("config", help="A JSON file holding a TournamentConfig.")
+    parser.add_argument("output_dir", help="Where to checkpoint the tournament.")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        tournament_config = TournamentConfig.model_validate_json(f.read())
+
+    for standing in Tournament(tournament_config, args.output_dir).run():
+        print(f"{standing['name']:<30} {standing['rating']:>7} {standing['games']:>5}")
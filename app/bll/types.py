@@ -1,8 +1,8 @@
 from enum import Enum
 
-from typing import Literal, Optional
+from typing import Annotated, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, BeforeValidator, Field
 
 
 class Coordinate(BaseModel):
@@ -28,6 +28,12 @@ class AgentType(Enum):
     UNKNOWN = "?"
 
 
+class Role(str, Enum):
+    OPERATIVE = "operative"
+    SPYMASTER = "spymaster"
+    SPECTATOR = "spectator"
+
+
 class GameEndStatus(Enum):
     RED_VICTORY = "RED_VICTORY"
     BLUE_VICTORY = "BLUE_VICTORY"
@@ -40,13 +46,25 @@ class Card(BaseModel):
     card_type: AgentType
 
 
-TeamColor = Literal[AgentType.RED] | Literal[AgentType.BLUE]
+# Stored and received games hold the team as its value, e.g. "RED".
+TeamColor = Annotated[
+    Literal[AgentType.RED] | Literal[AgentType.BLUE], BeforeValidator(AgentType)
+]
 
 
 class CurrentTurnState(BaseModel):
     team: TeamColor
     clue: Optional[Clue] = None
     guesses_made: int = 0
+    # When the current phase of the turn times out, in seconds since the epoch.
+    deadline: Optional[float] = None
+
+
+class TurnTimeLimits(BaseModel):
+    """How long each phase of a turn may last, in seconds."""
+
+    clue_seconds: float = Field(gt=0)
+    guess_seconds: float = Field(gt=0)
 
 
 class GameState(BaseModel):
@@ -54,3 +72,35 @@ class GameState(BaseModel):
     words: list[list[Card]]
     current_turn: CurrentTurnState
     victory_state: GameEndStatus
+    version: int = 0
+
+
+class GameEvent(BaseModel):
+    """
+    One change to a game: a clue, a guess (with its outcome), an end of turn, or a
+    turn that timed out.
+    """
+
+    version: int
+    kind: Literal["clue", "guess", "end_turn", "timeout"]
+    team: TeamColor
+    clue: Optional[Clue] = None
+    guess: Optional[Coordinate] = None
+    outcome: Optional[AgentType] = None
+
+
+class RevealedCard(BaseModel):
+    coordinate: Coordinate
+    card_type: AgentType
+
+
+class GameDelta(BaseModel):
+    """What changed in a game between two versions."""
+
+    type: Literal["delta"] = "delta"
+    game_id: str
+    from_version: int
+    version: int
+    revealed: list[RevealedCard]
+    current_turn: CurrentTurnState
+    game_end_status: GameEndStatus
@@ -1,6 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import Iterator, Optional
 
+from app.bll.ann_index import IVFIndex
+from app.bll.embeddings import WordEmbeddings
 from app.bll.game import Game
+from app.bll.similarity_matrix import SimilarityMatrices
+
+
+class StaleGameException(Exception):
+    """Raised when saving a game that was changed since it was read."""
+
+    pass
 
 
 class BaseDataAccess(ABC):
@@ -12,7 +22,7 @@ class BaseDataAccess(ABC):
     """
 
     @abstractmethod
-    def get_game_by_id(self, game_id: int) -> Game:
+    def get_game_by_id(self, game_id: str) -> Game:
         """
         Retrieve a game by its unique ID.
 
@@ -22,17 +32,66 @@ class BaseDataAccess(ABC):
         pass
 
     @abstractmethod
-    def save_game(self, game_id: int, game_state: Game):
+    def get_game_version(self, game_id: str) -> int:
+        """
+        Retrieve the version of a stored game, without loading the whole game.
+
+        :param game_id: The unique identifier of the game.
+        :return: The version of the stored game.
+        """
+        pass
+
+    @abstractmethod
+    def iter_game_ids(self, after: Optional[str] = None) -> Iterator[str]:
+        """
+        Iterate over the IDs of the stored games, in sorted order, so that an
+        interrupted scan can resume where it stopped.
+
+        :param after: Only iterate over the IDs sorting after this one.
+        :return: The game IDs.
+        """
+        pass
+
+    @abstractmethod
+    def get_game_updated_at(self, game_id: str) -> float:
+        """
+        Retrieve when a game was last saved, without loading it.
+
+        :param game_id: The unique identifier of the game.
+        :return: The time of the last save, in seconds since the epoch.
+        """
+        pass
+
+    @abstractmethod
+    def save_game(
+        self, game_id: str, game_state: Game, expected_version: Optional[int] = None
+    ):
         """
         Save a game and its current state to the storage.
 
+        Saving with an expected version is a compare-and-swap: it is atomic with
+        respect to other saves of the game, from any process, and fails if one of
+        them stored another version first.
+
         :param game_id: The unique identifier of the game.
         :param game_state: The current state of the game.
+        :param expected_version: The version the stored game must still be at.
+        :raises StaleGameException: If the stored game is not at the expected version.
         """
         pass
 
+    def save_games(self, games: list[Game]):
+        """
+        Save new games to the storage at once. Storages that can write many games in
+        one operation should override this; by default the games are saved one by one.
+
+        :param games: The games to store, with IDs not used by stored games.
+        """
+        for game in games:
+            self.save_game(game.game_id, game)
+
     @abstractmethod
-    def delete_game(self, game_id: int):
+    def delete_game(self, game_id: str):
         """
         Delete a game by its unique ID.
 
@@ -57,3 +116,39 @@ class BaseDataAccess(ABC):
         :return: A list of clue words.
         """
         pass
+
+    @abstractmethod
+    def load_word_embeddings(self) -> WordEmbeddings:
+        """
+        Load the word embeddings used by the AI players to relate clues to cards.
+
+        :return: A WordEmbeddings table covering the card and clue words.
+        """
+        pass
+
+    @abstractmethod
+    def load_clue_index(self) -> IVFIndex:
+        """
+        Load the prebuilt nearest-neighbour index over the clue word embeddings.
+
+        :return: The clue index.
+        """
+        pass
+
+    @abstractmethod
+    def save_clue_index(self, index: IVFIndex):
+        """
+        Persist a nearest-neighbour index over the clue word embeddings.
+
+        :param index: The clue index to store.
+        """
+        pass
+
+    @abstractmethod
+    def load_similarity_matrices(self) -> SimilarityMatrices:
+        """
+        Load the precomputed card x card and card x clue similarity matrices.
+
+        :return: The (memory-mapped) similarity matrices.
+        """
+        pass
@@ -1,7 +1,27 @@
+import fcntl
+import os
+import tempfile
+from bisect import bisect_right
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
+from typing import Iterator, Optional
 
+from app.bll.ann_index import IVFIndex
+from app.bll.embeddings import WordEmbeddings
 from app.bll.game import Game
-from app.dal.base_data_access import BaseDataAccess
+from app.bll.metrics import timed_operation
+from app.bll.similarity_matrix import METADATA_FILE, SimilarityMatrices
+from app.dal.base_data_access import BaseDataAccess, StaleGameException
+
+
+def _write_atomically(path: Path, text: str):
+    """Write a file so that readers see either its old or its new content."""
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as f:
+        f.write(text)
+    os.replace(f.name, path)
 
 
 class LocalDataAccess(BaseDataAccess):
@@ -14,27 +34,117 @@ class LocalDataAccess(BaseDataAccess):
 
         self.root_dir = root_dir
 
-    def get_game_by_id(self, game_id: int) -> Game:
-        game_file = self.root_dir / "games" / f"{game_id}.json"
+    @property
+    def games_dir(self) -> Path:
+        return self.root_dir / "games"
+
+    def _game_file(self, game_id: str) -> Path:
+        return self.games_dir / f"{game_id}.json"
+
+    def _version_file(self, game_id: str) -> Path:
+        return self.games_dir / f"{game_id}.version"
+
+    def _lock_file(self, game_id: str) -> Path:
+        return self.games_dir / f"{game_id}.lock"
+
+    @contextmanager
+    def _locked(self, game_id: str):
+        """Hold an exclusive lock on a game, shared by all processes on this host.
+
+        Deleting a game removes its lock file, under the lock: whoever was waiting
+        for it then holds a lock on a removed file, so it locks the new one instead.
+        """
+        lock_path = self._lock_file(game_id)
+        while True:
+            with lock_path.open("a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    current = (
+                        os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino
+                    )
+                except FileNotFoundError:
+                    current = False
+                if current:
+                    yield
+                    return
+
+    @timed_operation("dal_get_game")
+    def get_game_by_id(self, game_id: str) -> Game:
+        game_file = self._game_file(game_id)
         if not game_file.exists():
             raise FileNotFoundError(f"Game with ID {game_id} does not exist.")
 
         with game_file.open("r") as f:
             return Game.model_validate_json(f.read())
 
-    def save_game(self, game_id: int, game_state: Game):
-        games_dir = self.root_dir / "games"
-        games_dir.mkdir(parents=True, exist_ok=True)
+    @timed_operation("dal_get_version")
+    def get_game_version(self, game_id: str) -> int:
+        try:
+            return int(self._version_file(game_id).read_text())
+        except FileNotFoundError:
+            # Stored without a version file, or being stored for the first time.
+            return self.get_game_by_id(game_id).version
+
+    def iter_game_ids(self, after: Optional[str] = None) -> Iterator[str]:
+        if not self.games_dir.exists():
+            return
+        # Only the IDs are held, never the games. Temporary files start with a dot.
+        game_ids = sorted(
+            entry.name.removesuffix(".json")
+            for entry in os.scandir(self.games_dir)
+            if entry.name.endswith(".json") and not entry.name.startswith(".")
+        )
+        start = 0 if after is None else bisect_right(game_ids, after)
+        yield from islice(game_ids, start, None)
+
+    def get_game_updated_at(self, game_id: str) -> float:
+        try:
+            return self._game_file(game_id).stat().st_mtime
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Game with ID {game_id} does not exist.") from e
+
+    @timed_operation("dal_save_game")
+    def save_game(
+        self, game_id: str, game_state: Game, expected_version: Optional[int] = None
+    ):
+        self.games_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._locked(game_id):
+            if expected_version is not None:
+                try:
+                    stored_version = self.get_game_version(game_id)
+                except FileNotFoundError:
+                    stored_version = None
+                if stored_version != expected_version:
+                    raise StaleGameException(
+                        f"Game with ID {game_id} is at version {stored_version}, "
+                        f"not {expected_version}."
+                    )
+            _write_atomically(self._game_file(game_id), game_state.model_dump_json())
+            _write_atomically(self._version_file(game_id), str(game_state.version))
 
-        game_file = games_dir / f"{game_id}.json"
-        with game_file.open("w") as f:
-            f.write(game_state.model_dump_json())
+    @timed_operation("dal_save_games")
+    def save_games(self, games: list[Game]):
+        self.games_dir.mkdir(parents=True, exist_ok=True)
 
-    def delete_game(self, game_id: int):
-        game_file = self.root_dir / "games" / f"{game_id}.json"
-        if game_file.exists():
-            game_file.unlink()
-        else:
+        # New games have fresh IDs, so no other process can be saving them.
+        for game in games:
+            _write_atomically(self._game_file(game.game_id), game.model_dump_json())
+            _write_atomically(self._version_file(game.game_id), str(game.version))
+
+    def delete_game(self, game_id: str):
+        game_file = self._game_file(game_id)
+        if not self.games_dir.exists():
+            raise FileNotFoundError(f"Game with ID {game_id} does not exist.")
+
+        # Under the lock, so that a concurrent save either lands before the delete,
+        # or finds the game gone.
+        with self._locked(game_id):
+            existed = game_file.exists()
+            game_file.unlink(missing_ok=True)
+            self._version_file(game_id).unlink(missing_ok=True)
+            self._lock_file(game_id).unlink()
+        if not existed:
             raise FileNotFoundError(f"Game with ID {game_id} does not exist.")
 
     def load_card_words(self) -> list[str]:
@@ -52,3 +162,31 @@ class LocalDataAccess(BaseDataAccess):
 
         with clue_words_file.open("r") as f:
             return [line.strip() for line in f.readlines()]
+
+    def load_word_embeddings(self) -> WordEmbeddings:
+        embeddings_file = self.root_dir / "word_embeddings.txt"
+        if not embeddings_file.exists():
+            raise FileNotFoundError("Word embeddings file does not exist.")
+
+        with embeddings_file.open("r") as f:
+            return WordEmbeddings.from_text_lines(f)
+
+    def load_clue_index(self) -> IVFIndex:
+        clue_index_file = self.root_dir / "clue_index.npz"
+        if not clue_index_file.exists():
+            raise FileNotFoundError("Clue index file does not exist.")
+
+        return IVFIndex.load(clue_index_file)
+
+    def save_clue_index(self, index: IVFIndex):
+        index.save(self.root_dir / "clue_index.npz")
+
+    @property
+    def similarity_matrices_dir(self) -> Path:
+        return self.root_dir / "similarity"
+
+    def load_similarity_matrices(self) -> SimilarityMatrices:
+        if not (self.similarity_matrices_dir / METADATA_FILE).exists():
+            raise FileNotFoundError("Similarity matrices do not exist.")
+
+        return SimilarityMatrices.load(self.similarity_matrices_dir)
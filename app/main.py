@@ -1,9 +1,41 @@
 # File: app/main.py
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 
+from app.api.admin_routes import admin_router
+from app.api.clue_routes import clue_router
+from app.api.dependencies import (
+    get_game_manager,
+    get_request_profiler,
+    get_turn_time_limits,
+)
+from app.api.export_routes import export_router
+from app.api.lobby_routes import lobby_router
+from app.api.metrics_routes import metrics_router
+from app.api.profiling import ProfilingMiddleware
+from app.api.request_metrics import RequestMetricsMiddleware
 from app.api.routes import game_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Games only have turn deadlines when turns have time limits.
+    if get_turn_time_limits() is None:
+        yield
+        return
+
+    turn_timer = asyncio.create_task(get_game_manager().run_turn_timer())
+    yield
+    turn_timer.cancel()
+    with suppress(asyncio.CancelledError):
+        await turn_timer
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ProfilingMiddleware, get_profiler=get_request_profiler)
+app.add_middleware(RequestMetricsMiddleware)
 
 
 @app.get("/")
@@ -13,3 +45,8 @@ def read_root():
 
 # Mount the router to the FastAPI app
 app.include_router(game_router)
+app.include_router(clue_router)
+app.include_router(lobby_router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
+app.include_router(export_router)
@@ -0,0 +1,96 @@
+"""
+Compares the IVF clue index against brute-force search.
+
+Reports recall@k and queries/sec for a range of `nprobe` values. Uses the embeddings
+and clue words of a data directory when given one, otherwise a synthetic clustered
+vocabulary of the same scale.
+
+Usage: python -m benchmarks.ann_index [--data-dir data] [--k 256]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.bll.ann_index import IVFIndex
+from app.bll.embeddings import WordEmbeddings
+
+NPROBE_VALUES = [1, 2, 4, 8, 16, 32, 64]
+
+
+def synthetic_vectors(
+    num_words: int, dim: int, num_topics: int, random_seed: int = 0
+) -> np.ndarray:
+    rng = np.random.default_rng(random_seed)
+    topics = rng.standard_normal((num_topics, dim)).astype(np.float32)
+    vectors = topics[rng.integers(num_topics, size=num_words)]
+    vectors += rng.standard_normal((num_words, dim)).astype(np.float32) * 0.7
+    return WordEmbeddings([str(i) for i in range(num_words)], vectors).vectors
+
+
+def brute_force_search(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    similarities = queries @ vectors.T
+    return np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+
+
+def time_per_query(search, queries: np.ndarray) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        search(query[None, :])
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", default=None)
+    parser.add_argument("--num-words", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=300)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=64)
+    args = parser.parse_args()
+
+    if args.data_dir is not None:
+        from app.dal.local_dal import LocalDataAccess
+
+        dal = LocalDataAccess(args.data_dir)
+        embeddings = dal.load_word_embeddings()
+        words = [word for word in dal.load_clue_words() if word in embeddings]
+        vectors = embeddings.vectors_for(words)
+    else:
+        vectors = synthetic_vectors(args.num_words, args.dim, num_topics=2000)
+        words = [str(i) for i in range(len(vectors))]
+
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), args.num_queries, replace=False)]
+
+    start = time.perf_counter()
+    index = IVFIndex.build(words, vectors, random_seed=0)
+    print(
+        f"Built {index.num_lists} lists over {len(words)} vectors "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+    exact = brute_force_search(vectors, queries, args.k)
+    brute_force_seconds = time_per_query(
+        lambda q: brute_force_search(vectors, q, args.k), queries[:20]
+    )
+    print(f"brute force: recall@{args.k}=1.000 qps={1 / brute_force_seconds:8.1f}")
+
+    for nprobe in NPROBE_VALUES:
+        if nprobe > index.num_lists:
+            break
+        ids, _ = index.search(queries, args.k, nprobe=nprobe)
+        recall = np.mean(
+            [len(set(found) & set(true)) / args.k for found, true in zip(ids, exact)]
+        )
+        seconds = time_per_query(
+            lambda q: index.search(q, args.k, nprobe=nprobe), queries
+        )
+        print(
+            f"nprobe={nprobe:<3}: recall@{args.k}={recall:.3f} qps={1 / seconds:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Load-tests the game API with many games played concurrently.
+
+Every simulated game is played to the end by one client: it starts a game, reads the
+spymaster view, and alternates clues and correct guesses for both teams. Reports
+requests/sec overall and per concurrency level. Runs the app in-process on a
+temporary data directory, or against a running server with --url.
+
+Usage: python -m benchmarks.api_load [--games 200] [--concurrency 1 8 64]
+                                     [--url http://localhost:8000]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+CLUE_WORD = "hint"
+NUM_CARD_WORDS = 400
+
+
+def write_data_dir(data_dir: Path) -> Path:
+    (data_dir / "card_words.txt").write_text(
+        "\n".join(f"card{i}" for i in range(NUM_CARD_WORDS))
+    )
+    (data_dir / "clue_words.txt").write_text(CLUE_WORD)
+    return data_dir
+
+
+async def play_game(client: httpx.AsyncClient, random_seed: int) -> int:
+    """Play one game through the API.
+
+    :return: The number of requests made.
+    """
+    response = await client.post("/game/start", json={"random_seed": random_seed})
+    game_id = response.raise_for_status().json()["game_id"]
+    response = await client.get(f"/game/{game_id}/board", params={"role": "spymaster"})
+    game = response.raise_for_status().json()
+    positions = game["board"]["agent_placements"]["positions"]
+    team = game["current_turn"]["team"]
+    num_requests = 2
+
+    while True:
+        response = await client.post(
+            f"/game/{game_id}/play",
+            json={"type": "clue", "clue": {"clue": CLUE_WORD, "num_guesses": 2}},
+        )
+        response.raise_for_status()
+        num_requests += 1
+        for _ in range(2):
+            response = await client.post(
+                f"/game/{game_id}/play",
+                json={"type": "guess", "guess": positions[team].pop()},
+            )
+            result = response.raise_for_status().json()
+            num_requests += 1
+            if result["game_end_status"] != "ONGOING":
+                return num_requests
+        response = await client.post(f"/game/{game_id}/play", json={"type": "end_turn"})
+        result = response.raise_for_status().json()
+        num_requests += 1
+        team = result["current_turn"]["team"]
+
+
+async def run_load(client: httpx.AsyncClient, num_games: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def play_limited(random_seed: int) -> int:
+        async with semaphore:
+            return await play_game(client, random_seed)
+
+    start = time.perf_counter()
+    num_requests = sum(
+        await asyncio.gather(*(play_limited(seed) for seed in range(num_games)))
+    )
+    return num_requests, time.perf_counter() - start
+
+
+def make_client(url: str | None) -> httpx.AsyncClient:
+    if url is not None:
+        return httpx.AsyncClient(base_url=url, timeout=None)
+
+    from app.main import app
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=None
+    )
+
+
+async def main_async(args):
+    async with make_client(args.url) as client:
+        for concurrency in args.concurrency:
+            num_requests, seconds = await run_load(client, args.games, concurrency)
+            print(
+                f"concurrency={concurrency:<4} games={args.games:<5} "
+                f"requests={num_requests:<6} rps={num_requests / seconds:8.1f} "
+                f"games/s={args.games / seconds:7.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--url", default=None)
+    args = parser.parse_args()
+
+    if args.url is None:
+        from app.api.dependencies import CLIENT_RATE_ENV_VAR, DATA_DIR_ENV_VAR
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            os.environ[DATA_DIR_ENV_VAR] = str(write_data_dir(Path(data_dir)))
+            # Every simulated client shares one address; do not rate limit it.
+            os.environ[CLIENT_RATE_ENV_VAR] = "0"
+            asyncio.run(main_async(args))
+    else:
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
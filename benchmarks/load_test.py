@@ -0,0 +1,474 @@
+"""
+Load-tests the game API with simulated players, and reports throughput, latency
+percentiles and error rates per endpoint.
+
+`simulate` runs --players players for --duration seconds. Each one plays games
+like a person would: it starts a game, and for each turn the spymaster thinks, gives
+a clue, and the operatives think before each guess, refresh the game, and guess,
+mostly right. Think times follow --think-time (lognormal by default) around typical
+times of --clue-seconds and --guess-seconds, multiplied by --time-scale to fit more
+games in a run. With --record, every request is written to a JSONL trace.
+
+`replay` sends the requests of a trace again, at the times they were sent (sped up
+by --speed), and each player's requests in order. Games are started with the same
+random seeds, so their boards and guesses match the trace; the IDs of the games
+started are mapped to the new ones.
+
+Runs the app in-process on a temporary data directory, or against a running server
+with --url (for it, the clue word must be in its clue words, and the client rate
+limit should be off or high).
+
+Usage: python -m benchmarks.load_test simulate [--players 1000] [--duration 60]
+                                               [--time-scale 0.05] [--record trace.jsonl]
+       python -m benchmarks.load_test replay trace.jsonl [--speed 2]
+       Both take [--url http://localhost:8000] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from pathlib import Path
+from typing import IO, Optional
+
+import httpx
+
+from benchmarks.api_load import CLUE_WORD, write_data_dir
+
+THINK_TIME_DISTRIBUTIONS = ["lognormal", "exponential", "fixed", "none"]
+LOGNORMAL_SIGMA = 0.75
+DEFAULT_CLUE_SECONDS = 30.0
+DEFAULT_GUESS_SECONDS = 8.0
+# How often operatives pick a card of their own team.
+DEFAULT_GUESS_ACCURACY = 0.75
+PERCENTILES = [50, 95, 99]
+
+
+class ThinkTime:
+    """
+    Draws how long a player thinks before acting.
+
+    :param distribution: One of THINK_TIME_DISTRIBUTIONS. Lognormal think times are
+                         mostly close to the typical time, with a long tail of slow
+                         decisions; exponential ones are memoryless.
+    :param time_scale: What every think time is multiplied by.
+    """
+
+    def __init__(self, distribution: str, time_scale: float, rng: random.Random):
+        self.distribution = distribution
+        self.time_scale = time_scale
+        self.rng = rng
+
+    def sample(self, typical_seconds: float) -> float:
+        """
+        :param typical_seconds: The median of the lognormal distribution, the mean of
+                                the exponential one, or the fixed time.
+        """
+        if self.distribution == "none":
+            return 0.0
+        if self.distribution == "fixed":
+            seconds = typical_seconds
+        elif self.distribution == "exponential":
+            seconds = self.rng.expovariate(1 / typical_seconds)
+        else:
+            seconds = self.rng.lognormvariate(
+                math.log(typical_seconds), LOGNORMAL_SIGMA
+            )
+        return seconds * self.time_scale
+
+
+class LoadRecorder:
+    """
+    Sends the requests of the load test, and records their latencies and statuses
+    by endpoint, and optionally a trace of them.
+
+    Endpoints are named by method and route template, e.g.
+    `POST /game/{game_id}/play`, so that all games share their statistics.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, trace: Optional[IO[str]] = None):
+        self.client = client
+        self.trace = trace
+        self.latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self.statuses: defaultdict[str, Counter] = defaultdict(Counter)
+        self.started_at = time.monotonic()
+
+    async def request(
+        self,
+        player: int,
+        method: str,
+        route: str,
+        game_id: Optional[str] = None,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> Optional[httpx.Response]:
+        """Send a request to a route, filled in with a game ID.
+
+        :return: The response, or None if the request failed without one.
+        """
+        endpoint = f"{method} {route}"
+        start = time.monotonic()
+        try:
+            response = await self.client.request(
+                method, route.format(game_id=game_id), params=params, json=body
+            )
+        except httpx.HTTPError as e:
+            self.statuses[endpoint][type(e).__name__] += 1
+            return None
+        finally:
+            self.latencies[endpoint].append(time.monotonic() - start)
+
+        self.statuses[endpoint][response.status_code] += 1
+        if self.trace is not None:
+            entry = {
+                "t": start - self.started_at,
+                "player": player,
+                "method": method,
+                "route": route,
+                "game_id": game_id,
+                "params": params,
+                "body": body,
+                "status": response.status_code,
+            }
+            if route == "/game/start" and response.is_success:
+                entry["created_game_id"] = response.json()["game_id"]
+            self.trace.write(json.dumps(entry) + "\n")
+        return response
+
+    def report(self) -> dict:
+        """Throughput, latency percentiles and error rates, by endpoint and in all."""
+        seconds = time.monotonic() - self.started_at
+        endpoints = {
+            endpoint: summarize(self.latencies[endpoint], statuses, seconds)
+            for endpoint, statuses in sorted(self.statuses.items())
+        }
+        all_statuses = sum(self.statuses.values(), Counter())
+        all_latencies = [
+            latency for latencies in self.latencies.values() for latency in latencies
+        ]
+        return {
+            "seconds": seconds,
+            "total": summarize(all_latencies, all_statuses, seconds),
+            "endpoints": endpoints,
+        }
+
+
+def is_error(status: int | str) -> bool:
+    # Statuses that are not numbers are the names of transport errors.
+    return not isinstance(status, int) or status >= 400
+
+
+def summarize(latencies: list[float], statuses: Counter, seconds: float) -> dict:
+    latencies = sorted(latencies)
+    num_errors = sum(count for status, count in statuses.items() if is_error(status))
+    return {
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / seconds,
+        "errors": num_errors,
+        "error_rate": num_errors / len(latencies) if latencies else 0.0,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        **{
+            f"p{p}_seconds": percentile(latencies, p) if latencies else None
+            for p in PERCENTILES
+        },
+    }
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """The nearest-rank percentile."""
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class SimulatedPlayer:
+    """
+    Plays games through the API until a deadline, acting for both spymasters and
+    operatives of its games.
+    """
+
+    def __init__(
+        self,
+        player_id: int,
+        recorder: LoadRecorder,
+        think_time: ThinkTime,
+        rng: random.Random,
+        args,
+    ):
+        self.player_id = player_id
+        self.recorder = recorder
+        self.think_time = think_time
+        self.rng = rng
+        self.args = args
+
+    async def request(self, method: str, route: str, **kwargs) -> Optional[dict]:
+        """:return: The JSON body of a successful response, or None."""
+        response = await self.recorder.request(self.player_id, method, route, **kwargs)
+        if response is None or not response.is_success:
+            return None
+        return response.json()
+
+    async def think(self, typical_seconds: float):
+        await asyncio.sleep(self.think_time.sample(typical_seconds))
+
+    async def run(self, deadline: float):
+        # Players arrive over the ramp-up rather than all at once.
+        await asyncio.sleep(self.rng.uniform(0, self.args.ramp_up))
+        while time.monotonic() < deadline:
+            if not await self.play_game(deadline):
+                # Back off after an error, as a person retrying would.
+                await self.think(self.args.guess_seconds)
+
+    async def play_game(self, deadline: float) -> bool:
+        """Play a game until it ends or the deadline passes.
+
+        :return: Whether every request succeeded.
+        """
+        started = await self.request(
+            "POST",
+            "/game/start",
+            body={"random_seed": self.rng.randrange(2**31)},
+        )
+        if started is None:
+            return False
+        game_id = started["game_id"]
+        board = await self.request(
+            "GET",
+            "/game/{game_id}/board",
+            game_id=game_id,
+            params={"role": "spymaster"},
+        )
+        if board is None:
+            return False
+
+        hidden = {
+            team: {(c["x"], c["y"]) for c in coordinates}
+            for team, coordinates in board["board"]["agent_placements"][
+                "positions"
+            ].items()
+        }
+        team = board["current_turn"]["team"]
+        version = board["version"]
+        while time.monotonic() < deadline:
+            await self.think(self.args.clue_seconds)
+            num_guesses = self.rng.randint(1, 3)
+            result = await self.request(
+                "POST",
+                "/game/{game_id}/play",
+                game_id=game_id,
+                body={
+                    "type": "clue",
+                    "clue": {"clue": self.args.clue_word, "num_guesses": num_guesses},
+                },
+            )
+            if result is None:
+                return False
+
+            is_turn_over = False
+            for _ in range(num_guesses):
+                await self.think(self.args.guess_seconds)
+                update = await self.request(
+                    "GET",
+                    "/game/{game_id}/updates",
+                    game_id=game_id,
+                    params={"since": version},
+                )
+                if update is None:
+                    return False
+                version = update["version"]
+
+                x, y = self.choose_card(hidden, team)
+                result = await self.request(
+                    "POST",
+                    "/game/{game_id}/play",
+                    game_id=game_id,
+                    body={"type": "guess", "guess": {"x": x, "y": y}},
+                )
+                if result is None:
+                    return False
+                version = result["version"]
+                if result["game_end_status"] != "ONGOING":
+                    return True
+                if is_turn_over := result["is_turn_over"]:
+                    break
+
+            if not is_turn_over:
+                result = await self.request(
+                    "POST",
+                    "/game/{game_id}/play",
+                    game_id=game_id,
+                    body={"type": "end_turn"},
+                )
+                if result is None:
+                    return False
+                version = result["version"]
+            team = result["current_turn"]["team"]
+        return True
+
+    def choose_card(
+        self, hidden: dict[str, set[tuple[int, int]]], team: str
+    ) -> tuple[int, int]:
+        """Pick a hidden card, of the team's own most of the time, and forget it."""
+        others = [card for t, cards in hidden.items() if t != team for card in cards]
+        if hidden[team] and (
+            not others or self.rng.random() < self.args.guess_accuracy
+        ):
+            card = self.rng.choice(sorted(hidden[team]))
+        else:
+            card = self.rng.choice(sorted(others))
+        for cards in hidden.values():
+            cards.discard(card)
+        return card
+
+
+async def simulate(recorder: LoadRecorder, args):
+    rng = random.Random(args.random_seed)
+    think_time = ThinkTime(args.think_time, args.time_scale, rng)
+    deadline = time.monotonic() + args.duration
+    players = [
+        SimulatedPlayer(i, recorder, think_time, random.Random(rng.random()), args)
+        for i in range(args.players)
+    ]
+    await asyncio.gather(*(player.run(deadline) for player in players))
+
+
+async def replay(recorder: LoadRecorder, entries: list[dict], speed: float):
+    """Send the requests of a trace again, each player's in order."""
+    game_ids: dict[str, Optional[str]] = {}
+    by_player = defaultdict(list)
+    for entry in sorted(entries, key=lambda entry: entry["t"]):
+        by_player[entry["player"]].append(entry)
+
+    async def replay_player(player: int, player_entries: list[dict]):
+        for entry in player_entries:
+            # Never before the player's previous request is done.
+            delay = entry["t"] / speed - (time.monotonic() - recorder.started_at)
+            await asyncio.sleep(max(0.0, delay))
+            game_id = entry["game_id"]
+            if game_id is not None:
+                # A game the trace started, or one that existed before it.
+                game_id = game_ids.get(game_id, game_id)
+            response = await recorder.request(
+                player,
+                entry["method"],
+                entry["route"],
+                game_id=game_id,
+                params=entry["params"],
+                body=entry["body"],
+            )
+            if "created_game_id" in entry and response and response.is_success:
+                game_ids[entry["created_game_id"]] = response.json()["game_id"]
+
+    await asyncio.gather(
+        *(replay_player(player, entries) for player, entries in by_player.items())
+    )
+
+
+def make_client(url: Optional[str], max_connections: int) -> httpx.AsyncClient:
+    if url is not None:
+        return httpx.AsyncClient(
+            base_url=url,
+            timeout=None,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    from app.main import app
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=None
+    )
+
+
+def print_report(report: dict):
+    print(
+        f"{'endpoint':<32} {'requests':>9} {'req/s':>9} {'errors':>8} "
+        + " ".join(f"{f'p{p} ms':>9}" for p in PERCENTILES)
+    )
+    rows = list(report["endpoints"].items()) + [("total", report["total"])]
+    for endpoint, stats in rows:
+        percentiles = " ".join(
+            f"{stats[f'p{p}_seconds'] * 1000:9.1f}"
+            if stats[f"p{p}_seconds"] is not None
+            else f"{'-':>9}"
+            for p in PERCENTILES
+        )
+        print(
+            f"{endpoint:<32} {stats['requests']:>9} "
+            f"{stats['requests_per_second']:>9.1f} {stats['error_rate']:>8.2%} "
+            f"{percentiles}"
+        )
+
+
+async def main_async(args) -> dict:
+    async with make_client(args.url, args.max_connections) as client:
+        if args.command == "simulate":
+            with open(args.record, "w") if args.record else nullcontext() as trace:
+                recorder = LoadRecorder(client, trace)
+                await simulate(recorder, args)
+        else:
+            entries = [
+                json.loads(line)
+                for line in Path(args.trace).read_text().splitlines()
+                if line
+            ]
+            recorder = LoadRecorder(client)
+            await replay(recorder, entries, args.speed)
+        return recorder.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="Save the report as JSON.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    simulate_parser = commands.add_parser("simulate", help="Simulate players.")
+    simulate_parser.add_argument("--players", type=int, default=1000)
+    simulate_parser.add_argument("--duration", type=float, default=60.0)
+    simulate_parser.add_argument("--ramp-up", type=float, default=5.0)
+    simulate_parser.add_argument(
+        "--think-time", choices=THINK_TIME_DISTRIBUTIONS, default="lognormal"
+    )
+    simulate_parser.add_argument(
+        "--clue-seconds", type=float, default=DEFAULT_CLUE_SECONDS
+    )
+    simulate_parser.add_argument(
+        "--guess-seconds", type=float, default=DEFAULT_GUESS_SECONDS
+    )
+    simulate_parser.add_argument("--time-scale", type=float, default=0.05)
+    simulate_parser.add_argument(
+        "--guess-accuracy", type=float, default=DEFAULT_GUESS_ACCURACY
+    )
+    simulate_parser.add_argument("--clue-word", default=CLUE_WORD)
+    simulate_parser.add_argument("--random-seed", type=int, default=0)
+    simulate_parser.add_argument("--record", default=None, help="Write a trace.")
+
+    replay_parser = commands.add_parser("replay", help="Replay a trace.")
+    replay_parser.add_argument("trace")
+    replay_parser.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args()
+
+    if args.url is None:
+        from app.api.dependencies import CLIENT_RATE_ENV_VAR, DATA_DIR_ENV_VAR
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            os.environ[DATA_DIR_ENV_VAR] = str(write_data_dir(Path(data_dir)))
+            # Every simulated player shares one address; do not rate limit it.
+            os.environ[CLIENT_RATE_ENV_VAR] = "0"
+            report = asyncio.run(main_async(args))
+    else:
+        report = asyncio.run(main_async(args))
+
+    print_report(report)
+    if args.output is not None:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+Benchmarks the hot paths of the engine, the data access layer and the API.
+
+`run` times every benchmark and saves the results as JSON; `compare` checks the
+results of a change against a baseline, and fails if any benchmark got slower by
+more than the threshold. The DAL benchmarks run against directories holding each
+of the --stored-games counts; the API benchmarks run the app in-process, with
+--concurrency clients at once.
+
+Usage: python -m benchmarks.suite run [--output results.json] [--filter board]
+                                      [--stored-games 1000 100000]
+       python -m benchmarks.suite compare baseline.json results.json
+                                          [--threshold 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator, Optional
+
+from benchmarks.api_load import CLUE_WORD, play_game, write_data_dir
+
+DEFAULT_STORED_GAMES = [1_000, 100_000]
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_MIN_TIME = 0.2  # Seconds per repeat.
+DEFAULT_REPEATS = 5
+DEFAULT_CONCURRENCY = 16
+API_REQUESTS_PER_REPEAT = 400
+API_GAMES_PER_REPEAT = 40
+DAL_OPERATIONS = ["get_game_by_id", "get_game_version", "save_game"]
+API_BENCHMARKS = ["api.start_game", "api.get_board", "api.get_status", "api.play_game"]
+
+
+def time_operation(
+    operation: Callable[[], object], min_time: float, repeats: int
+) -> dict:
+    """Time an operation like `timeit`: call it often enough for a repeat to take
+    `min_time`, and keep the median of the repeats."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+
+    seconds_per_op = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        seconds_per_op.append((time.perf_counter() - start) / number)
+    return summarize(seconds_per_op, number * repeats)
+
+
+def summarize(seconds_per_op: list[float], ops: int, **extra) -> dict:
+    median = statistics.median(seconds_per_op)
+    return {
+        "seconds_per_op": median,
+        "min_seconds_per_op": min(seconds_per_op),
+        "stdev_seconds_per_op": statistics.pstdev(seconds_per_op),
+        "ops_per_second": 1 / median,
+        "ops": ops,
+        **extra,
+    }
+
+
+def engine_benchmarks(data_dir: Path) -> Iterator[tuple[str, Callable[[], object]]]:
+    from app.bll.board import AgentPlacements, Board
+    from app.bll.clue_validator import ClueVocabulary
+    from app.bll.game import Game
+    from app.bll.types import AgentType, Clue, Coordinate, GameEndStatus
+    from app.dal.local_dal import LocalDataAccess
+
+    dal = LocalDataAccess(data_dir)
+    card_words = dal.load_card_words()
+    words = card_words[:25]
+
+    yield "agent_placements.random", lambda: AgentPlacements.random()
+    yield "board.random_with_words", lambda: Board.random_with_words(list(words))
+
+    board = Board.random_with_words(list(words), random_seed=0)
+    coordinates = [Coordinate(x=x, y=y) for x in range(5) for y in range(5)]
+    next_card = iter(())
+
+    def reveal_card():
+        nonlocal next_card
+        coordinate = next(next_card, None)
+        if coordinate is None:
+            # Every card is revealed: hide them all again.
+            for row in board.words:
+                for card in row:
+                    card.card_type = AgentType.UNKNOWN
+            board.discovered_agents.clear()
+            next_card = iter(coordinates)
+            coordinate = next(next_card)
+        board.reveal_card(coordinate)
+
+    yield "board.reveal_card", reveal_card
+
+    half_revealed = Board.random_with_words(list(words), random_seed=0)
+    for coordinate in coordinates[::2]:
+        if half_revealed.agent_placements[coordinate] != AgentType.BLACK:
+            half_revealed.reveal_card(coordinate)
+    yield "board.check_game_end", half_revealed.check_game_end
+
+    clue_vocabulary = ClueVocabulary([CLUE_WORD])
+    seeds = iter(range(sys.maxsize))
+
+    def play_through():
+        """Play a game from its creation to its end, as `api_load` does."""
+        game = Game.new_game(dal, next(seeds), clue_vocabulary)
+        positions = {
+            team: list(coordinates)
+            for team, coordinates in game.board.agent_placements.positions.items()
+        }
+        while True:
+            game.set_clue(Clue(clue=CLUE_WORD, num_guesses=2))
+            for _ in range(2):
+                team = game.current_turn.team
+                _, game_end_status, _, _ = game.make_move(positions[team].pop())
+                if game_end_status != GameEndStatus.ONGOING:
+                    return
+            game.end_turn()
+
+    yield "game.playthrough", play_through
+
+
+def fill_games_dir(data_dir: Path, num_games: int) -> list[str]:
+    """Store copies of a game under `num_games` IDs, quickly.
+
+    :return: The IDs of the games stored.
+    """
+    from app.bll.game import Game
+    from app.dal.local_dal import LocalDataAccess
+
+    dal = LocalDataAccess(data_dir)
+    game_json = Game.new_game(dal, random_seed=0).model_dump_json()
+    dal.games_dir.mkdir(parents=True, exist_ok=True)
+    game_ids = [str(uuid.uuid4()) for _ in range(num_games)]
+    for game_id in game_ids:
+        (dal.games_dir / f"{game_id}.json").write_text(game_json)
+        (dal.games_dir / f"{game_id}.version").write_text("0")
+    return game_ids
+
+
+def dal_benchmarks(
+    data_dir: Path, num_stored: int
+) -> Iterator[tuple[str, Callable[[], object]]]:
+    from app.bll.game import Game
+    from app.dal.local_dal import LocalDataAccess
+
+    dal = LocalDataAccess(data_dir)
+    game_ids = fill_games_dir(data_dir, num_stored)
+    rng = random.Random(0)
+
+    yield (
+        f"dal.get_game_by_id[{num_stored}]",
+        lambda: dal.get_game_by_id(rng.choice(game_ids)),
+    )
+    yield (
+        f"dal.get_game_version[{num_stored}]",
+        lambda: dal.get_game_version(rng.choice(game_ids)),
+    )
+
+    game = Game.new_game(dal, random_seed=1)
+    dal.save_game(game.game_id, game)
+
+    def save_game():
+        expected_version = game.version
+        game.version += 1
+        dal.save_game(game.game_id, game, expected_version)
+
+    yield f"dal.save_game[{num_stored}]", save_game
+
+
+async def time_requests(
+    request: Callable[[int], Awaitable[object]],
+    num_requests: int,
+    concurrency: int,
+    repeats: int,
+) -> dict:
+    """Send requests from `concurrency` clients at once.
+
+    The time per operation is the wall time per request, so it goes down as the
+    server overlaps requests; the latencies of single requests are kept as well.
+    """
+    latencies = []
+    seconds_per_op = []
+    for _ in range(repeats):
+        requests = iter(range(num_requests))
+
+        async def client():
+            for i in requests:
+                start = time.perf_counter()
+                await request(i)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        seconds_per_op.append((time.perf_counter() - start) / num_requests)
+
+    latencies.sort()
+    return summarize(
+        seconds_per_op,
+        len(latencies),
+        concurrency=concurrency,
+        p50_latency_seconds=latencies[len(latencies) // 2],
+        p99_latency_seconds=latencies[int(len(latencies) * 0.99)],
+    )
+
+
+async def api_benchmarks(
+    concurrency: int, repeats: int, selected: Callable[[str], bool]
+) -> dict[str, dict]:
+    import httpx
+
+    from app.main import app
+
+    results = {}
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=None
+    ) as client:
+        response = await client.post("/game/start", json={"random_seed": 0})
+        game_id = response.raise_for_status().json()["game_id"]
+
+        async def start_game(i: int):
+            (await client.post("/game/start")).raise_for_status()
+
+        async def get_board(i: int):
+            response = await client.get(
+                f"/game/{game_id}/board", params={"role": "spymaster"}
+            )
+            response.raise_for_status()
+
+        async def get_status(i: int):
+            (await client.get(f"/game/{game_id}")).raise_for_status()
+
+        async def play(i: int):
+            await play_game(client, i)
+
+        for name, request, num_requests in [
+            ("api.start_game", start_game, API_REQUESTS_PER_REPEAT),
+            ("api.get_board", get_board, API_REQUESTS_PER_REPEAT),
+            ("api.get_status", get_status, API_REQUESTS_PER_REPEAT),
+            # A whole game per operation.
+            ("api.play_game", play, API_GAMES_PER_REPEAT),
+        ]:
+            if selected(name):
+                print(f"{name}...", file=sys.stderr)
+                results[name] = await time_requests(
+                    request, num_requests, concurrency, repeats
+                )
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args) -> dict:
+    def selected(name: str) -> bool:
+        return args.filter is None or args.filter in name
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine_dir = Path(tmp_dir) / "engine"
+        engine_dir.mkdir()
+        for name, operation in engine_benchmarks(write_data_dir(engine_dir)):
+            if selected(name):
+                print(f"{name}...", file=sys.stderr)
+                results[name] = time_operation(operation, args.min_time, args.repeats)
+
+        for num_stored in args.stored_games:
+            if not any(selected(f"dal.{op}[{num_stored}]") for op in DAL_OPERATIONS):
+                continue
+            dal_dir = Path(tmp_dir) / f"dal-{num_stored}"
+            dal_dir.mkdir()
+            print(f"Storing {num_stored} games...", file=sys.stderr)
+            for name, operation in dal_benchmarks(write_data_dir(dal_dir), num_stored):
+                if selected(name):
+                    print(f"{name}...", file=sys.stderr)
+                    results[name] = time_operation(
+                        operation, args.min_time, args.repeats
+                    )
+
+        if any(selected(name) for name in API_BENCHMARKS):
+            from app.api.dependencies import CLIENT_RATE_ENV_VAR, DATA_DIR_ENV_VAR
+
+            api_dir = Path(tmp_dir) / "api"
+            api_dir.mkdir()
+            os.environ[DATA_DIR_ENV_VAR] = str(write_data_dir(api_dir))
+            # Every simulated client shares one address; do not rate limit it.
+            os.environ[CLIENT_RATE_ENV_VAR] = "0"
+            results.update(
+                asyncio.run(api_benchmarks(args.concurrency, args.repeats, selected))
+            )
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Print how every benchmark changed from the baseline.
+
+    :return: The names of the benchmarks that got slower by more than `threshold`,
+             a fraction of their baseline time.
+    """
+    regressions = []
+    baseline_results = baseline["results"]
+    current_results = current["results"]
+    print(f"{'benchmark':<36} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name in sorted(baseline_results.keys() | current_results.keys()):
+        if name not in current_results:
+            print(f"{name:<36} {'':>12} {'missing':>12}")
+            continue
+        now = current_results[name]["seconds_per_op"]
+        if name not in baseline_results:
+            print(f"{name:<36} {'new':>12} {format_seconds(now):>12}")
+            continue
+        before = baseline_results[name]["seconds_per_op"]
+        change = now / before - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  improved"
+        print(
+            f"{name:<36} {format_seconds(before):>12} {format_seconds(now):>12} "
+            f"{change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument("--output", default=None, help="Default: stdout.")
+    run_parser.add_argument("--filter", default=None, help="Run names containing it.")
+    run_parser.add_argument(
+        "--stored-games", type=int, nargs="+", default=DEFAULT_STORED_GAMES
+    )
+    run_parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME)
+    run_parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    run_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare results with a baseline."
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = json.dumps(run(args), indent=2)
+        if args.output is None:
+            print(results)
+        else:
+            Path(args.output).write_text(results + "\n")
+        return
+
+    regressions = compare(
+        json.loads(Path(args.baseline).read_text()),
+        json.loads(Path(args.current).read_text()),
+        args.threshold,
+    )
+    if regressions:
+        print(
+            f"{len(regressions)} benchmark(s) slower by more than "
+            f"{args.threshold:.0%}: {', '.join(regressions)}"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import marshal
+from collections import OrderedDict
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.admission import AdmissionController, RateLimiter
+from app.api.dependencies import (
+    get_admission_controller,
+    get_game_manager,
+    get_request_profiler,
+)
+from app.bll.game_manager import GameManager
+from app.dal.local_dal import LocalDataAccess
+from app.main import app
+from test.utils import get_concept_game, write_concept_data_dir
+
+
+@pytest.fixture
+def client(tmp_path):
+    game_manager = GameManager(
+        LocalDataAccess(write_concept_data_dir(tmp_path, get_concept_game()))
+    )
+    admission_controller = AdmissionController(RateLimiter(rate=0.001, burst=2))
+    app.dependency_overrides[get_game_manager] = lambda: game_manager
+    app.dependency_overrides[get_admission_controller] = lambda: admission_controller
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_rate_limited_client_is_turned_away(client):
+    responses = [client.post("/game/start") for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert int(responses[-1].headers["Retry-After"]) >= 1
+
+
+def test_get_admission_metrics(client):
+    client.post("/game/start")
+
+    response = client.get("/admin/admission")
+
+    assert response.status_code == 200
+    assert response.json()["admitted"] == 1
+    assert response.json()["active"] == 0
+    assert response.json()["rate_limited"] == 0
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    profiler = get_request_profiler()
+    monkeypatch.setattr(profiler, "sample_rate", 1.0)
+    monkeypatch.setattr(profiler, "_profiles", OrderedDict())
+    return profiler
+
+
+def test_download_profile(client, profiler):
+    game_id = client.post("/game/start").json()["game_id"]
+    client.get(f"/game/{game_id}/board")
+
+    profiles = client.get("/admin/profiles").json()
+    board_profile = profiles[0]
+    assert board_profile["path"] == f"/game/{game_id}/board"
+    assert board_profile["sampled"]
+    assert "dal_get_version" in board_profile["phase_seconds"]
+
+    response = client.get(f"/admin/profiles/{board_profile['profile_id']}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert marshal.loads(response.content)
+
+    response = client.get(
+        f"/admin/profiles/{board_profile['profile_id']}",
+        params={"format": "text", "limit": 5},
+    )
+    assert "cumulative" in response.text
+
+
+def test_download_missing_profile(client, profiler):
+    assert client.get("/admin/profiles/missing").status_code == 404
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from app.api.admission import (
+    AdmissionController,
+    ConcurrencyLimiter,
+    OverloadedException,
+    RateLimitedException,
+    RateLimiter,
+    retry_after_header,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_limiter_allows_burst_then_rate():
+    clock = FakeClock()
+    rate_limiter = RateLimiter(rate=2, burst=3, clock=clock)
+
+    for _ in range(3):
+        rate_limiter.acquire("alice")
+    with pytest.raises(RateLimitedException) as e:
+        rate_limiter.acquire("alice")
+    rate_limiter.acquire("bob")
+    clock.now = 0.5
+    rate_limiter.acquire("alice")
+
+    assert e.value.retry_after == pytest.approx(0.5)
+    assert rate_limiter.num_limited == 1
+
+
+def test_rate_limiter_refill_is_capped_at_burst():
+    clock = FakeClock()
+    rate_limiter = RateLimiter(rate=2, burst=2, clock=clock)
+    rate_limiter.acquire("alice")
+    clock.now = 100
+
+    rate_limiter.acquire("alice")
+    rate_limiter.acquire("alice")
+    with pytest.raises(RateLimitedException):
+        rate_limiter.acquire("alice")
+
+
+def test_rate_limiter_forgets_least_recent_clients():
+    rate_limiter = RateLimiter(rate=1, burst=1, max_clients=2, clock=FakeClock())
+    for client in ["alice", "bob", "carol"]:
+        rate_limiter.acquire(client)
+
+    rate_limiter.acquire("alice")
+
+    assert rate_limiter.num_clients == 2
+
+
+def test_concurrency_limiter_queues_then_sheds():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queued=1)
+    release = asyncio.Event()
+
+    async def work():
+        async with limiter.slot():
+            await release.wait()
+
+    async def burst():
+        first = asyncio.create_task(work())
+        second = asyncio.create_task(work())
+        await asyncio.sleep(0)
+        state = (limiter.num_active, limiter.num_queued)
+        with pytest.raises(OverloadedException):
+            async with limiter.slot():
+                pass
+        release.set()
+        await asyncio.gather(first, second)
+        return state
+
+    assert asyncio.run(burst()) == (1, 1)
+    assert limiter.num_admitted == 2
+    assert limiter.num_shed == 1
+    assert (limiter.num_active, limiter.num_queued) == (0, 0)
+
+
+def test_admission_controller_metrics():
+    clock = FakeClock()
+    controller = AdmissionController(RateLimiter(rate=1, burst=1, clock=clock))
+
+    async def admit_twice():
+        async with controller.admit("alice"):
+            metrics = controller.metrics()
+        with pytest.raises(RateLimitedException):
+            async with controller.admit("alice"):
+                pass
+        return metrics
+
+    during = asyncio.run(admit_twice())
+    after = controller.metrics()
+
+    assert (during.active, during.admitted) == (1, 1)
+    assert (after.active, after.admitted, after.rate_limited) == (0, 1, 1)
+    assert after.tracked_clients == 1
+
+
+@pytest.mark.parametrize("retry_after, header", [(0.01, "1"), (1.0, "1"), (2.5, "3")])
+def test_retry_after_header(retry_after, header):
+    assert retry_after_header(retry_after) == {"Retry-After": header}
@@ -0,0 +1,30 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_clue_autocomplete
+from app.bll.clue_autocomplete import ClueAutocomplete
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_clue_autocomplete] = lambda: ClueAutocomplete(
+        ["river", "rivet", "road", "rival"]
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_autocomplete_clue(client):
+    response = client.get("/clues/autocomplete", params={"prefix": "Riv", "limit": 2})
+
+    assert response.status_code == 200
+    assert response.json() == {"prefix": "Riv", "completions": ["river", "rivet"]}
+    assert response.headers["Cache-Control"].startswith("public")
+
+
+@pytest.mark.parametrize("params", [{}, {"prefix": ""}, {"prefix": "r", "limit": 0}])
+def test_autocomplete_clue_invalid_query(client, params):
+    response = client.get("/clues/autocomplete", params=params)
+
+    assert response.status_code == 422
@@ -0,0 +1,19 @@
+import pytest
+
+from app.api.etags import etag_matches, make_etag
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (None, False),
+        ("", False),
+        ('"3"', True),
+        ('W/"3"', True),
+        ('"1", "3"', True),
+        ('"33"', False),
+        ("*", True),
+    ],
+)
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, make_etag(3)) == expected
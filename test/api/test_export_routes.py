@@ -0,0 +1,46 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_data_access
+from app.bll.types import AgentType, Clue
+from app.dal.local_dal import LocalDataAccess
+from app.main import app
+from test.utils import get_concept_game
+
+
+@pytest.fixture
+def client(tmp_path):
+    dal = LocalDataAccess(tmp_path)
+    for game_id in ["a", "b"]:
+        game = get_concept_game()
+        game.game_id = game_id
+        game.set_clue(Clue(clue="fruit", num_guesses=1))
+        game.make_move(game.board.agent_placements.positions[AgentType.BLACK][0])
+        dal.save_game(game_id, game)
+    ongoing = get_concept_game()
+    dal.save_game(ongoing.game_id, ongoing)
+    app.dependency_overrides[get_data_access] = lambda: dal
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_export_games(client):
+    response = client.get("/export/games")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["game_id"] for record in records] == ["a", "b"]
+    assert all(record["end_status"] == "BLACK_REVEALED" for record in records)
+
+
+def test_export_games_with_filters_and_cursor(client):
+    assert client.get("/export/games", params={"cursor": "a"}).text.count("\n") == 1
+    response = client.get("/export/games", params={"end_status": "RED_VICTORY"})
+    assert response.text == ""
+    response = client.get(
+        "/export/games", params={"finished_after": "2999-01-01T00:00:00"}
+    )
+    assert response.text == ""
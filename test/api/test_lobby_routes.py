@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.admission import AdmissionController
+from app.api.dependencies import (
+    get_admission_controller,
+    get_game_manager,
+    get_lobby,
+)
+from app.bll.game_manager import GameManager
+from app.bll.lobby import Lobby
+from app.dal.local_dal import LocalDataAccess
+from app.main import app
+from test.utils import get_concept_game, write_concept_data_dir
+
+
+@pytest.fixture
+def client(tmp_path):
+    dal = LocalDataAccess(write_concept_data_dir(tmp_path, get_concept_game()))
+    lobby = Lobby(GameManager(dal))
+    admission_controller = AdmissionController()
+    app.dependency_overrides[get_lobby] = lambda: lobby
+    app.dependency_overrides[get_game_manager] = lambda: lobby.game_manager
+    app.dependency_overrides[get_admission_controller] = lambda: admission_controller
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_join_lobby(client):
+    roles = ["spymaster", "spymaster", "operative", "operative"]
+
+    tickets = [client.post("/lobby/join", json={"role": role}).json() for role in roles]
+    polled = client.get(f"/lobby/tickets/{tickets[0]['ticket_id']}").json()
+
+    assert [ticket["status"] for ticket in tickets] == [
+        "waiting",
+        "waiting",
+        "waiting",
+        "assigned",
+    ]
+    assert polled["status"] == "assigned"
+    assert polled["assignment"]["role"] == "spymaster"
+    assert polled["assignment"]["game_id"] == tickets[3]["assignment"]["game_id"]
+    game = client.get(f"/game/{polled['assignment']['game_id']}")
+    assert game.status_code == 200
+
+
+def test_long_poll_times_out(client):
+    ticket = client.post("/lobby/join", json={"role": "operative", "team": "RED"})
+
+    polled = client.get(
+        f"/lobby/tickets/{ticket.json()['ticket_id']}", params={"wait": 0.01}
+    )
+
+    assert polled.status_code == 200
+    assert polled.json()["status"] == "waiting"
+
+
+def test_leave_lobby(client):
+    ticket_id = client.post("/lobby/join", json={"role": "operative"}).json()[
+        "ticket_id"
+    ]
+
+    left = client.delete(f"/lobby/tickets/{ticket_id}")
+    missing = client.get(f"/lobby/tickets/{ticket_id}")
+
+    assert left.status_code == 200
+    assert missing.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "body",
+    [{"role": "spectator"}, {"role": "operative", "team": "BLACK"}, {"rating": 1}],
+)
+def test_join_lobby_invalid_request(client, body):
+    assert client.post("/lobby/join", json=body).status_code == 422
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.admission import AdmissionController
+from app.api.dependencies import (
+    get_admission_controller,
+    get_game_manager,
+    get_response_cache,
+)
+from app.api.response_cache import ResponseCache
+from app.bll.game_manager import GameManager
+from app.bll.metrics import REQUEST_SECONDS
+from app.dal.local_dal import LocalDataAccess
+from app.main import app
+from test.utils import get_concept_game, write_concept_data_dir
+
+
+@pytest.fixture
+def client(tmp_path):
+    game_manager = GameManager(
+        LocalDataAccess(write_concept_data_dir(tmp_path, get_concept_game()))
+    )
+    response_cache = ResponseCache()
+    admission_controller = AdmissionController()
+    app.dependency_overrides[get_game_manager] = lambda: game_manager
+    app.dependency_overrides[get_response_cache] = lambda: response_cache
+    app.dependency_overrides[get_admission_controller] = lambda: admission_controller
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_get_metrics(client):
+    game_id = client.post("/game/start").json()["game_id"]
+    client.get(f"/game/{game_id}/board")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "# TYPE codenames_request_seconds histogram" in lines
+    assert "codenames_active_games 1" in lines
+    assert 'codenames_cache_entries{cache="hot_games"} 1' in lines
+    assert 'codenames_cache_entries{cache="responses"} 1' in lines
+    assert any(
+        line.startswith('codenames_operation_seconds_count{operation="new_game"}')
+        for line in lines
+    )
+
+
+def test_requests_are_labelled_by_route_template(client):
+    game_id = client.post("/game/start").json()["game_id"]
+    board = REQUEST_SECONDS.labels("GET", "/game/{game_id}/board", "200")
+    missing = REQUEST_SECONDS.labels("GET", "/game/{game_id}/board", "404")
+    unmatched = REQUEST_SECONDS.labels("GET", "unmatched", "404")
+    counts = board.count, missing.count, unmatched.count
+
+    client.get(f"/game/{game_id}/board")
+    client.get("/game/missing/board")
+    client.get("/no/such/route")
+
+    assert (board.count, missing.count, unmatched.count) == tuple(
+        count + 1 for count in counts
+    )
@@ -0,0 +1,98 @@
+import asyncio
+import marshal
+
+from starlette.responses import PlainTextResponse
+
+from app.api.profiling import ProfilingMiddleware, RequestProfiler
+from app.bll.metrics import OPERATION_SECONDS, timed
+
+
+@timed(OPERATION_SECONDS.labels("test_phase"), phase="test_phase")
+def work():
+    return sum(range(1000))
+
+
+async def app(scope, receive, send):
+    # cProfile only sees the event loop's thread; phases see both.
+    work()
+    await asyncio.to_thread(work)
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+def call(profiler: RequestProfiler, path: str = "/game/1") -> list[dict]:
+    middleware = ProfilingMiddleware(app, lambda: profiler)
+    scope = {"type": "http", "method": "GET", "path": path, "headers": []}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return messages
+
+
+def test_disabled_profiler_keeps_nothing():
+    profiler = RequestProfiler()
+
+    assert call(profiler)[0]["status"] == 200
+    assert profiler.list_profiles() == []
+
+
+def test_sampled_requests_are_profiled():
+    profiler = RequestProfiler(sample_rate=0.5, random_fraction=lambda: 0.2)
+
+    call(profiler)
+
+    (profile,) = profiler.list_profiles()
+    assert (profile.method, profile.path, profile.status) == ("GET", "/game/1", 200)
+    assert profile.sampled and not profile.slow
+    assert profile.phase_seconds["test_phase"] > 0
+    stats = marshal.loads(profile.stats_bytes())
+    assert any(function == "work" for _, _, function in stats)
+    assert "cumulative" in profile.stats_text(limit=5)
+
+
+def test_unsampled_requests_are_not_profiled():
+    profiler = RequestProfiler(sample_rate=0.5, random_fraction=lambda: 0.7)
+
+    call(profiler)
+
+    assert profiler.list_profiles() == []
+
+
+def test_slow_requests_keep_their_phases():
+    profiler = RequestProfiler(slow_seconds=0)
+
+    call(profiler)
+
+    (profile,) = profiler.list_profiles()
+    assert profile.slow and not profile.sampled
+    assert profile.phase_seconds["test_phase"] > 0
+    assert profile.stats_bytes() is None
+
+
+def test_profiles_are_bounded():
+    profiler = RequestProfiler(slow_seconds=0, max_profiles=2)
+
+    for i in range(3):
+        call(profiler, f"/game/{i}")
+
+    assert [profile.path for profile in profiler.list_profiles()] == [
+        "/game/2",
+        "/game/1",
+    ]
+
+
+def test_only_one_request_is_under_cprofile():
+    profiler = RequestProfiler(sample_rate=1.0)
+    first = profiler.start()
+
+    assert first is not None
+    assert profiler.start() is None
+    profiler.finish(first, {"method": "GET", "path": "/"}, 200, 0.0, 0.1, {})
+    second = profiler.start()
+    assert second is not None
+    second.disable()
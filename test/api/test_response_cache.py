@@ -0,0 +1,49 @@
+import json
+
+from app.api.response_cache import ResponseCache
+from app.bll.types import Role
+from test.utils import get_concept_game
+
+
+def test_get_or_serialize_caches_by_view():
+    cache = ResponseCache()
+    game = get_concept_game()
+
+    operative = cache.get_or_serialize(game, Role.OPERATIVE)
+    spectator = cache.get_or_serialize(game, Role.SPECTATOR)
+    spymaster = cache.get_or_serialize(game, Role.SPYMASTER)
+
+    assert spectator is operative
+    assert json.loads(operative) == json.loads(
+        game.get_game_description(is_spymaster=False).model_dump_json()
+    )
+    assert json.loads(spymaster) == json.loads(game.model_dump_json())
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_get_by_version():
+    cache = ResponseCache()
+    game = get_concept_game()
+    body = cache.get_or_serialize(game, Role.OPERATIVE)
+
+    game.end_turn()
+
+    assert cache.get(game.game_id, 0, Role.OPERATIVE) is body
+    assert cache.get(game.game_id, game.version, Role.OPERATIVE) is None
+    assert cache.get_or_serialize(game, Role.OPERATIVE) != body
+
+
+def test_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    game = get_concept_game()
+    cache.get_or_serialize(game, Role.OPERATIVE)
+    cache.get_or_serialize(game, Role.SPYMASTER)
+
+    cache.get(game.game_id, game.version, Role.OPERATIVE)
+    game.end_turn()
+    cache.get_or_serialize(game, Role.OPERATIVE)
+
+    assert len(cache) == 2
+    assert cache.get(game.game_id, 0, Role.SPYMASTER) is None
+    assert cache.get(game.game_id, 0, Role.OPERATIVE) is not None
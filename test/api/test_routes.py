@@ -0,0 +1,326 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from app.api.admission import AdmissionController
+from app.api.dependencies import (
+    get_admission_controller,
+    get_game_manager,
+    get_response_cache,
+)
+from app.api.response_cache import ResponseCache
+from app.bll.clue_validator import ClueVocabulary
+from app.bll.game_manager import GameManager
+from app.bll.types import AgentType
+from app.dal.local_dal import LocalDataAccess
+from app.main import app
+from test.utils import CONCEPTS, get_concept_game, write_concept_data_dir
+
+
+@pytest.fixture
+def dal(tmp_path):
+    return LocalDataAccess(write_concept_data_dir(tmp_path, get_concept_game()))
+
+
+@pytest.fixture
+def client(dal):
+    game_manager = GameManager(dal, ClueVocabulary(CONCEPTS))
+    response_cache = ResponseCache()
+    app.dependency_overrides[get_game_manager] = lambda: game_manager
+    app.dependency_overrides[get_response_cache] = lambda: response_cache
+    admission_controller = AdmissionController()
+    app.dependency_overrides[get_admission_controller] = lambda: admission_controller
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def game_id(client):
+    response = client.post("/game/start", json={"random_seed": 3})
+    assert response.status_code == 200
+    return response.json()["game_id"]
+
+
+def find_card(client, game_id, agent_type):
+    board = client.get(f"/game/{game_id}/board", params={"role": "spymaster"}).json()
+    return board["board"]["agent_placements"]["positions"][agent_type.value][0]
+
+
+def test_start_new_game(client, dal, game_id):
+    assert dal.get_game_by_id(game_id).game_id == game_id
+    assert client.post("/game/start").status_code == 200
+
+
+def test_get_board_by_role(client, game_id):
+    operative_view = client.get(f"/game/{game_id}/board").json()
+    spymaster_view = client.get(
+        f"/game/{game_id}/board", params={"role": "spymaster"}
+    ).json()
+
+    assert "board" not in operative_view
+    assert len(operative_view["words"]) == 5
+    assert all(
+        card["card_type"] == "?" for row in operative_view["words"] for card in row
+    )
+    assert "agent_placements" in spymaster_view["board"]
+
+
+def test_get_board_is_served_from_cache(client, dal, game_id):
+    first = client.get(f"/game/{game_id}/board")
+    with patch.object(dal, "get_game_by_id", wraps=dal.get_game_by_id) as load:
+        second = client.get(f"/game/{game_id}/board")
+        spectator = client.get(f"/game/{game_id}/board", params={"role": "spectator"})
+    client.post(f"/game/{game_id}/play", json={"type": "end_turn"})
+    changed = client.get(f"/game/{game_id}/board")
+
+    load.assert_not_called()
+    assert second.content == spectator.content == first.content
+    assert second.headers["content-type"] == "application/json"
+    assert second.headers["ETag"] == '"0"'
+    assert changed.json()["version"] == 1
+    assert changed.json()["current_turn"] != first.json()["current_turn"]
+
+
+def test_get_game_status(client, game_id):
+    response = client.get(f"/game/{game_id}")
+
+    assert response.status_code == 200
+    assert response.json()["game_end_status"] == "ONGOING"
+    assert response.json()["current_turn"]["clue"] is None
+
+
+def test_play_turn(client, dal, game_id):
+    team = dal.get_game_by_id(game_id).current_turn.team
+
+    clue = client.post(
+        f"/game/{game_id}/play",
+        json={"type": "clue", "clue": {"clue": "vehicle", "num_guesses": 1}},
+    )
+    guess = client.post(
+        f"/game/{game_id}/play",
+        json={"type": "guess", "guess": find_card(client, game_id, team)},
+    )
+
+    assert clue.status_code == 200
+    assert clue.json()["current_turn"]["clue"]["clue"] == "vehicle"
+    assert guess.status_code == 200
+    assert guess.json()["guess_outcome"] == team.value
+    assert guess.json()["is_turn_over"] is False
+    assert len(dal.get_game_by_id(game_id).board.discovered_agents) == 1
+
+    end_turn = client.post(f"/game/{game_id}/play", json={"type": "end_turn"})
+
+    assert end_turn.json()["current_turn"]["team"] != team.value
+
+
+def test_start_new_games(client, dal):
+    response = client.post("/game/batch/start", json={"num_games": 3, "random_seed": 1})
+
+    assert response.status_code == 200
+    game_ids = response.json()["game_ids"]
+    assert len(set(game_ids)) == 3
+    assert all(dal.get_game_by_id(game_id) for game_id in game_ids)
+
+
+@pytest.mark.parametrize("body", [{}, {"num_games": 0}, {"num_games": 101}])
+def test_start_new_games_invalid_request(client, body):
+    assert client.post("/game/batch/start", json=body).status_code == 422
+
+
+def test_play_guesses(client, dal, game_id):
+    game = dal.get_game_by_id(game_id)
+    team = game.current_turn.team
+    positions = game.board.agent_placements.positions
+    client.post(
+        f"/game/{game_id}/play",
+        json={"type": "clue", "clue": {"clue": "vehicle", "num_guesses": 1}},
+    )
+
+    response = client.post(
+        f"/game/{game_id}/moves",
+        json={
+            "guesses": [coordinate.model_dump() for coordinate in positions[team][:3]]
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["guess_outcomes"] == [team.value, team.value]
+    assert response.json()["is_turn_over"] is True
+    assert response.json()["current_turn"]["team"] != team.value
+    assert len(dal.get_game_by_id(game_id).board.discovered_agents) == 2
+
+
+def test_play_invalid_guesses(client, dal, game_id):
+    coordinate = find_card(
+        client, game_id, dal.get_game_by_id(game_id).current_turn.team
+    )
+    client.post(
+        f"/game/{game_id}/play",
+        json={"type": "clue", "clue": {"clue": "vehicle", "num_guesses": 2}},
+    )
+
+    response = client.post(
+        f"/game/{game_id}/moves", json={"guesses": [coordinate, coordinate]}
+    )
+    missing = client.post("/game/missing/moves", json={"guesses": [coordinate]})
+    empty = client.post(f"/game/{game_id}/moves", json={"guesses": []})
+
+    assert response.status_code == 409
+    assert dal.get_game_by_id(game_id).board.discovered_agents == []
+    assert missing.status_code == 404
+    assert empty.status_code == 422
+
+
+def test_play_black_card_ends_game(client, game_id):
+    client.post(
+        f"/game/{game_id}/play",
+        json={"type": "clue", "clue": {"clue": "vehicle", "num_guesses": 1}},
+    )
+    response = client.post(
+        f"/game/{game_id}/play",
+        json={"type": "guess", "guess": find_card(client, game_id, AgentType.BLACK)},
+    )
+
+    assert response.json()["game_end_status"] == "BLACK_REVEALED"
+    assert client.get(f"/game/{game_id}").json()["game_end_status"] == "BLACK_REVEALED"
+
+
+@pytest.mark.parametrize(
+    "move, detail",
+    [
+        ({"type": "guess", "guess": {"x": 0, "y": 0}}, "No clue was given"),
+        ({"type": "clue", "clue": {"clue": "sword", "num_guesses": 1}}, "not an"),
+    ],
+)
+def test_play_invalid_move(client, game_id, move, detail):
+    response = client.post(f"/game/{game_id}/play", json=move)
+
+    assert response.status_code == 409
+    assert detail in response.json()["detail"]
+
+
+def test_play_malformed_move(client, game_id):
+    response = client.post(f"/game/{game_id}/play", json={"type": "shout"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "method, path, body",
+    [
+        ("get", "/game/missing", None),
+        ("get", "/game/missing/board", None),
+        ("post", "/game/missing/play", {"type": "end_turn"}),
+    ],
+)
+def test_game_not_found(client, method, path, body):
+    response = client.request(method.upper(), path, json=body)
+
+    assert response.status_code == 404
+
+
+def test_get_updates(client, game_id):
+    snapshot = client.get(f"/game/{game_id}/updates").json()
+    client.post(
+        f"/game/{game_id}/play",
+        json={"type": "clue", "clue": {"clue": "vehicle", "num_guesses": 1}},
+    )
+    client.post(f"/game/{game_id}/play", json={"type": "end_turn"})
+
+    delta = client.get(f"/game/{game_id}/updates", params={"since": 0}).json()
+    up_to_date = client.get(f"/game/{game_id}/updates", params={"since": 2}).json()
+
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["version"] == 0
+    assert len(snapshot["state"]["words"]) == 5
+    assert delta["type"] == "delta"
+    assert (delta["from_version"], delta["version"]) == (0, 2)
+    assert delta["revealed"] == []
+    assert delta["current_turn"]["clue"] is None
+    assert up_to_date["revealed"] == []
+    assert up_to_date["from_version"] == up_to_date["version"] == 2
+
+
+def test_watch_game(client, dal, game_id):
+    team = dal.get_game_by_id(game_id).current_turn.team
+    with (
+        client.websocket_connect(f"/game/{game_id}/ws") as spectator,
+        (
+            client.websocket_connect(f"/game/{game_id}/ws?role=spymaster&since=0")
+        ) as spymaster,
+    ):
+        assert spectator.receive_json()["type"] == "snapshot"
+        assert spymaster.receive_json()["version"] == 0
+
+        client.post(
+            f"/game/{game_id}/play",
+            json={"type": "clue", "clue": {"clue": "vehicle", "num_guesses": 1}},
+        )
+        card = find_card(client, game_id, team)
+        client.post(f"/game/{game_id}/play", json={"type": "guess", "guess": card})
+
+        for websocket in (spectator, spymaster):
+            clue = websocket.receive_json()
+            guess = websocket.receive_json()
+            assert clue["current_turn"]["clue"]["clue"] == "vehicle"
+            assert clue["version"] == 1
+            assert guess["revealed"] == [{"coordinate": card, "card_type": team.value}]
+
+
+def test_watch_game_unsubscribes_on_disconnect(client, game_id):
+    game_manager = app.dependency_overrides[get_game_manager]()
+    with client.websocket_connect(f"/game/{game_id}/ws") as websocket:
+        websocket.receive_json()
+        assert game_manager.broadcaster.num_subscribers(game_id) == 1
+
+    client.post(f"/game/{game_id}/play", json={"type": "end_turn"})
+
+    assert game_manager.broadcaster.num_subscribers(game_id) == 0
+
+
+def test_watch_missing_game(client):
+    with pytest.raises(WebSocketDisconnect) as e:
+        with client.websocket_connect("/game/missing/ws") as websocket:
+            websocket.receive_json()
+
+    assert e.value.code == 1008
+
+
+@pytest.mark.parametrize(
+    "path", ["/game/{game_id}", "/game/{game_id}/board", "/game/{game_id}/updates"]
+)
+def test_conditional_get(client, dal, game_id, path):
+    path = path.format(game_id=game_id)
+    etag = client.get(path).headers["ETag"]
+
+    with patch.object(dal, "get_game_by_id", wraps=dal.get_game_by_id) as load:
+        unchanged = client.get(path, headers={"If-None-Match": etag})
+    client.post(f"/game/{game_id}/play", json={"type": "end_turn"})
+    changed = client.get(path, headers={"If-None-Match": etag})
+
+    assert etag == '"0"'
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+    load.assert_not_called()
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] == '"1"'
+
+
+@pytest.mark.parametrize(
+    "path", ["/game/{game_id}", "/game/{game_id}/board", "/game/{game_id}/updates"]
+)
+def test_reads_see_changes_from_other_workers(client, dal, game_id, path):
+    path = path.format(game_id=game_id)
+    etag = client.get(path).headers["ETag"]
+    other_worker = GameManager(dal, ClueVocabulary(CONCEPTS))
+    asyncio.run(other_worker.end_turn(game_id))
+
+    response = client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1"'
+    assert response.json()["version"] == 1
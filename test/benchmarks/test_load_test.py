@@ -0,0 +1,66 @@
+import asyncio
+import io
+import json
+from argparse import Namespace
+
+import pytest
+
+from app.api.admission import AdmissionController
+from app.api.dependencies import get_admission_controller, get_game_manager
+from app.bll.clue_validator import ClueVocabulary
+from app.bll.game_manager import GameManager
+from app.dal.local_dal import LocalDataAccess
+from app.main import app
+from benchmarks.api_load import CLUE_WORD, write_data_dir
+from benchmarks.load_test import LoadRecorder, make_client, replay, simulate
+
+
+@pytest.fixture(autouse=True)
+def game_manager(tmp_path):
+    dal = LocalDataAccess(write_data_dir(tmp_path))
+    game_manager = GameManager(dal, ClueVocabulary(dal.load_clue_words()))
+    admission_controller = AdmissionController()
+    app.dependency_overrides[get_game_manager] = lambda: game_manager
+    app.dependency_overrides[get_admission_controller] = lambda: admission_controller
+    yield game_manager
+    app.dependency_overrides.clear()
+
+
+def test_simulate_then_replay():
+    args = Namespace(
+        players=3,
+        duration=0.5,
+        ramp_up=0.0,
+        think_time="none",
+        clue_seconds=30.0,
+        guess_seconds=8.0,
+        time_scale=1.0,
+        guess_accuracy=0.75,
+        clue_word=CLUE_WORD,
+        random_seed=0,
+    )
+
+    async def simulate_then_replay():
+        async with make_client(None, max_connections=10) as client:
+            trace = io.StringIO()
+            recorder = LoadRecorder(client, trace)
+            await simulate(recorder, args)
+            entries = [json.loads(line) for line in trace.getvalue().splitlines()]
+            replayer = LoadRecorder(client)
+            await replay(replayer, entries, speed=100.0)
+            return recorder.report(), entries, replayer.report()
+
+    simulated, entries, replayed = asyncio.run(simulate_then_replay())
+
+    assert simulated["total"]["errors"] == 0
+    assert simulated["total"]["requests"] == len(entries) > 0
+    assert "POST /game/{game_id}/play" in simulated["endpoints"]
+    # Games start with the same seeds, and their IDs are mapped to the new games,
+    # so every request gets the same status again.
+    assert {
+        endpoint: stats["statuses"] for endpoint, stats in replayed["endpoints"].items()
+    } == {
+        endpoint: stats["statuses"]
+        for endpoint, stats in simulated["endpoints"].items()
+    }
+    assert replayed["total"]["p99_seconds"] is not None
@@ -0,0 +1,66 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parents[2]
+
+
+def write_results(path: Path, seconds_per_op: dict[str, float]) -> Path:
+    path.write_text(
+        json.dumps(
+            {
+                "results": {
+                    name: {"seconds_per_op": seconds}
+                    for name, seconds in seconds_per_op.items()
+                }
+            }
+        )
+    )
+    return path
+
+
+@pytest.fixture
+def baseline(tmp_path) -> Path:
+    return write_results(
+        tmp_path / "baseline.json",
+        {"board.reveal_card": 1e-6, "game.playthrough": 1e-3},
+    )
+
+
+def compare(baseline: Path, current: Path) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "compare", baseline, current]
+        + ["--threshold", "0.1"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_compare_fails_on_regressions(tmp_path, baseline):
+    current = write_results(
+        tmp_path / "current.json",
+        {"board.reveal_card": 1.2e-6, "game.playthrough": 1e-3},
+    )
+
+    result = compare(baseline, current)
+
+    assert result.returncode == 1
+    assert "board.reveal_card" in result.stdout.splitlines()[-1]
+    assert "REGRESSION" in result.stdout
+
+
+def test_compare_passes_within_the_threshold(tmp_path, baseline):
+    current = write_results(
+        tmp_path / "current.json",
+        {"board.reveal_card": 1.05e-6, "game.playthrough": 0.5e-3},
+    )
+
+    result = compare(baseline, current)
+
+    assert result.returncode == 0
+    assert "REGRESSION" not in result.stdout
+    assert "improved" in result.stdout
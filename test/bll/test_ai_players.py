@@ -0,0 +1,276 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.bll.ai_players import AIOperative, AISpymaster
+from app.bll.ann_index import IVFIndex
+from app.bll.clue_validator import ClueVocabulary
+from app.bll.similarity_matrix import SimilarityMatrices
+from app.bll.types import AgentType, Clue, CurrentTurnState
+from test.utils import CONCEPTS, get_concept_embeddings, get_concept_game
+
+
+@pytest.fixture
+def concept_game():
+    return get_concept_game()
+
+
+@pytest.fixture
+def concept_embeddings(concept_game):
+    return get_concept_embeddings(concept_game)
+
+
+def remaining_agents(game, team):
+    return [
+        coord
+        for coord in game.board.agent_placements.positions[team]
+        if coord not in game.board.discovered_agents
+    ]
+
+
+### AISpymaster Tests ###
+
+
+@pytest.mark.parametrize(
+    "team, expected_clue", [(AgentType.RED, "fruit"), (AgentType.BLUE, "animal")]
+)
+def test_ai_spymaster_offer_clue(concept_game, concept_embeddings, team, expected_clue):
+    spymaster = AISpymaster(team, concept_embeddings, CONCEPTS)
+
+    spymaster.prefix_turn(concept_game)
+    clue = spymaster.offer_clue()
+
+    assert clue.clue == expected_clue
+    assert clue.num_guesses == spymaster.max_num_guesses
+
+
+def test_ai_spymaster_num_guesses_limited_by_remaining_words(
+    concept_game, concept_embeddings
+):
+    for coord in remaining_agents(concept_game, AgentType.RED)[:-2]:
+        concept_game.board.reveal_card(coord)
+    spymaster = AISpymaster(AgentType.RED, concept_embeddings, CONCEPTS)
+
+    spymaster.prefix_turn(concept_game)
+    clue = spymaster.offer_clue()
+
+    assert clue.clue == "fruit"
+    assert clue.num_guesses == 2
+
+
+def test_ai_spymaster_never_offers_board_words(concept_game, concept_embeddings):
+    card_words = [card.word for row in concept_game.board.words for card in row]
+    spymaster = AISpymaster(AgentType.RED, concept_embeddings, card_words + ["vehicle"])
+
+    ranked = spymaster.rank_clues(concept_game, top_k=3)
+
+    assert [clue.clue for clue, _ in ranked] == ["vehicle"]
+    assert ranked[0][0].num_guesses == 1
+
+
+def test_ai_spymaster_skips_illegal_clues(concept_game, concept_embeddings):
+    spymaster = AISpymaster(AgentType.RED, concept_embeddings, CONCEPTS)
+    concept_game.set_clue_vocabulary(ClueVocabulary(["animal", "vehicle", "weapon"]))
+
+    ranked = spymaster.rank_clues(concept_game, top_k=len(CONCEPTS))
+
+    assert "fruit" not in [clue.clue for clue, _ in ranked]
+    assert len(ranked) == 3
+
+
+def test_ai_spymaster_without_legal_clues(concept_game, concept_embeddings):
+    spymaster = AISpymaster(AgentType.RED, concept_embeddings, CONCEPTS)
+    concept_game.set_clue_vocabulary(ClueVocabulary(["unrelated"]))
+    spymaster.prefix_turn(concept_game)
+
+    assert spymaster.rank_clues(concept_game) == []
+    with pytest.raises(ValueError, match="no legal clue"):
+        spymaster.offer_clue()
+
+
+def test_ai_spymaster_without_clue_words(concept_game, concept_embeddings):
+    spymaster = AISpymaster(AgentType.RED, concept_embeddings, [])
+
+    assert spymaster.rank_clues(concept_game) == []
+
+
+def test_ai_spymaster_rank_clues_sorted(concept_game, concept_embeddings):
+    spymaster = AISpymaster(AgentType.RED, concept_embeddings, CONCEPTS)
+
+    ranked = spymaster.rank_clues(concept_game, top_k=len(CONCEPTS))
+
+    scores = [score for _, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert ranked[-1][0].clue == "weapon"
+
+
+def test_ai_spymaster_no_words_left(concept_game, concept_embeddings):
+    for coord in remaining_agents(concept_game, AgentType.RED):
+        concept_game.board.reveal_card(coord)
+    spymaster = AISpymaster(AgentType.RED, concept_embeddings, CONCEPTS)
+
+    with pytest.raises(ValueError, match="has no unrevealed words left"):
+        spymaster.rank_clues(concept_game)
+
+
+def test_ai_spymaster_skips_clues_without_embeddings(concept_embeddings):
+    spymaster = AISpymaster(
+        AgentType.RED, concept_embeddings, ["fruit", "not-a-known-word"]
+    )
+
+    assert spymaster.clue_words == ["fruit"]
+    assert spymaster.clue_vectors.shape == (1, concept_embeddings.dim)
+
+
+def test_ai_spymaster_with_clue_index(concept_game, concept_embeddings):
+    clue_index = IVFIndex.from_embeddings(
+        concept_embeddings, CONCEPTS, num_lists=2, random_seed=0
+    )
+    spymaster = AISpymaster(
+        AgentType.RED,
+        concept_embeddings,
+        CONCEPTS,
+        clue_index=clue_index,
+        candidates_per_word=1,
+    )
+
+    ranked = spymaster.rank_clues(concept_game, top_k=len(CONCEPTS))
+
+    assert ranked[0][0].clue == "fruit"
+    assert len(ranked) == 1
+
+
+def test_ai_spymaster_with_similarity_matrices(
+    tmp_path, concept_game, concept_embeddings
+):
+    card_words = [card.word for row in concept_game.board.words for card in row]
+    matrices = SimilarityMatrices.build(
+        concept_embeddings, card_words, CONCEPTS, tmp_path, dtype="int8"
+    )
+    spymaster = AISpymaster(
+        AgentType.BLUE, concept_embeddings, CONCEPTS, similarity_matrices=matrices
+    )
+
+    with patch.object(
+        matrices, "card_clue_similarities", wraps=matrices.card_clue_similarities
+    ) as card_clue_similarities:
+        ranked = spymaster.rank_clues(concept_game, top_k=1)
+
+    card_clue_similarities.assert_called_once()
+    assert ranked[0][0].clue == "animal"
+
+
+def test_ai_spymaster_similarity_matrices_vocabulary_mismatch(
+    tmp_path, concept_game, concept_embeddings
+):
+    matrices = SimilarityMatrices.build(
+        concept_embeddings, ["fruit"], ["fruit", "animal"], tmp_path
+    )
+
+    with pytest.raises(ValueError, match="different clue vocabulary"):
+        AISpymaster(
+            AgentType.RED, concept_embeddings, CONCEPTS, similarity_matrices=matrices
+        )
+
+
+### AIOperative Tests ###
+
+
+def start_turn(game, team, clue, num_guesses):
+    game.current_turn = CurrentTurnState(
+        team=team, clue=Clue(clue=clue, num_guesses=num_guesses)
+    )
+
+
+def play_operative_turn(game, operative):
+    guesses = []
+    while guess := operative.guess_word(game.get_game_description_for_operative()):
+        guesses.append(guess)
+        _, _, _, is_turn_over = game.make_move(guess)
+        if is_turn_over:
+            break
+    return guesses
+
+
+def test_ai_operative_guesses_clued_cards(concept_game, concept_embeddings):
+    start_turn(concept_game, AgentType.RED, "fruit", 3)
+    operative = AIOperative(AgentType.RED, concept_embeddings)
+
+    guesses = play_operative_turn(concept_game, operative)
+
+    assert len(guesses) == 3
+    assert all(
+        concept_game.board.agent_placements[guess] == AgentType.RED for guess in guesses
+    )
+
+
+def test_ai_operative_ranks_once_per_clue(concept_game, concept_embeddings):
+    start_turn(concept_game, AgentType.RED, "fruit", 3)
+    operative = AIOperative(AgentType.RED, concept_embeddings)
+
+    with patch.object(operative, "rank_cards", wraps=operative.rank_cards) as rank:
+        play_operative_turn(concept_game, operative)
+        start_turn(concept_game, AgentType.RED, "fruit", 2)
+        play_operative_turn(concept_game, operative)
+
+    assert rank.call_count == 2
+
+
+def test_ai_operative_stops_below_confidence_threshold(
+    concept_game, concept_embeddings
+):
+    start_turn(concept_game, AgentType.BLUE, "weapon", 3)
+    operative = AIOperative(AgentType.BLUE, concept_embeddings)
+
+    first_guess = operative.guess_word(
+        concept_game.get_game_description_for_operative()
+    )
+    concept_game.current_turn.guesses_made = 1
+
+    assert concept_game.board.agent_placements[first_guess] == AgentType.BLACK
+    assert (
+        operative.guess_word(concept_game.get_game_description_for_operative()) is None
+    )
+
+
+def test_ai_operative_skips_revealed_cards(concept_game, concept_embeddings):
+    start_turn(concept_game, AgentType.RED, "fruit", 2)
+    operative = AIOperative(AgentType.RED, concept_embeddings)
+    ranking = operative.rank_cards(concept_game.get_game_description_for_operative())
+
+    operative.guess_word(concept_game.get_game_description_for_operative())
+    concept_game.board.reveal_card(ranking[1][0])
+    concept_game.current_turn.guesses_made = 1
+    second_guess = operative.guess_word(
+        concept_game.get_game_description_for_operative()
+    )
+
+    assert second_guess == ranking[2][0]
+
+
+def test_ai_operative_without_clue(concept_game, concept_embeddings):
+    operative = AIOperative(AgentType.RED, concept_embeddings)
+
+    assert (
+        operative.guess_word(concept_game.get_game_description_for_operative()) is None
+    )
+
+
+def test_ai_operative_with_similarity_matrices(
+    tmp_path, concept_game, concept_embeddings
+):
+    card_words = [card.word for row in concept_game.board.words for card in row]
+    matrices = SimilarityMatrices.build(
+        concept_embeddings, card_words, CONCEPTS, tmp_path
+    )
+    start_turn(concept_game, AgentType.BLUE, "animal", 2)
+    operative = AIOperative(
+        AgentType.BLUE, concept_embeddings, similarity_matrices=matrices
+    )
+
+    guesses = play_operative_turn(concept_game, operative)
+
+    assert [concept_game.board.agent_placements[guess] for guess in guesses] == [
+        AgentType.BLUE,
+        AgentType.BLUE,
+    ]
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from app.bll.ann_index import IVFIndex
+from app.bll.embeddings import WordEmbeddings
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return WordEmbeddings(
+        [str(i) for i in range(500)], rng.standard_normal((500, 16))
+    ).vectors
+
+
+def exact_top_k(vectors, queries, k):
+    return np.argsort(-(queries @ vectors.T), axis=1)[:, :k]
+
+
+def test_ivf_index_build_partitions_all_vectors(vectors):
+    index = IVFIndex.build([str(i) for i in range(len(vectors))], vectors, num_lists=10)
+
+    assert index.num_lists == 10
+    assert index.list_offsets[-1] == len(vectors)
+    assert sorted(index.ids.tolist()) == list(range(len(vectors)))
+    np.testing.assert_allclose(index.vectors, vectors[index.ids])
+
+
+def test_ivf_index_search_all_lists_is_exact(vectors):
+    index = IVFIndex.build(
+        [str(i) for i in range(len(vectors))], vectors, num_lists=10, random_seed=0
+    )
+    queries = vectors[:5]
+
+    ids, similarities = index.search(queries, k=7, nprobe=index.num_lists)
+
+    np.testing.assert_array_equal(ids, exact_top_k(vectors, queries, 7))
+    assert np.all(np.diff(similarities, axis=1) <= 0)
+
+
+def test_ivf_index_search_finds_query_itself(vectors):
+    index = IVFIndex.build(
+        [str(i) for i in range(len(vectors))], vectors, num_lists=10, random_seed=0
+    )
+
+    ids, _ = index.search(vectors[:20], k=1, nprobe=1)
+
+    assert ids[:, 0].tolist() == list(range(20))
+
+
+def test_ivf_index_search_pads_short_results(vectors):
+    index = IVFIndex.build(
+        [str(i) for i in range(len(vectors))], vectors, num_lists=250, random_seed=0
+    )
+
+    ids, similarities = index.search(vectors[:1], k=len(vectors), nprobe=1)
+
+    assert ids[0, -1] == -1
+    assert similarities[0, -1] == -np.inf
+
+
+def test_ivf_index_save_and_load(tmp_path, vectors):
+    words = [str(i) for i in range(len(vectors))]
+    index = IVFIndex.build(words, vectors, num_lists=10, random_seed=0)
+
+    index.save(tmp_path / "index.npz")
+    loaded = IVFIndex.load(tmp_path / "index.npz", nprobe=3)
+
+    assert loaded.words == words
+    assert loaded.nprobe == 3
+    np.testing.assert_array_equal(
+        loaded.search(vectors[:3], k=5)[0], index.search(vectors[:3], k=5, nprobe=3)[0]
+    )
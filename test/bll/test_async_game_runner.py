@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+from app.bll.ai_players import AIOperative, AISpymaster
+from app.bll.async_game_runner import play_game, play_games
+from app.bll.async_players import (
+    AsyncSpymaster,
+    SyncSpymasterAdapter,
+    to_async_players,
+)
+from app.bll.types import AgentType, Clue, GameEndStatus
+from test.utils import CONCEPTS, get_concept_embeddings, get_concept_game
+
+
+def make_ai_players(game):
+    embeddings = get_concept_embeddings(game)
+    return {
+        team: (
+            AISpymaster(team, embeddings, CONCEPTS),
+            AIOperative(team, embeddings),
+        )
+        for team in (AgentType.RED, AgentType.BLUE)
+    }
+
+
+class SlowSpymaster(AsyncSpymaster):
+    """Wraps an async spymaster and makes it think for a while before every clue."""
+
+    def __init__(self, spymaster: AsyncSpymaster, delay: float):
+        super().__init__(spymaster.team)
+        self.spymaster = spymaster
+        self.delay = delay
+
+    async def prefix_turn(self, game):
+        await self.spymaster.prefix_turn(game)
+
+    async def offer_clue(self) -> Clue:
+        await asyncio.sleep(self.delay)
+        return await self.spymaster.offer_clue()
+
+
+class BrokenSpymaster(SlowSpymaster):
+    async def offer_clue(self) -> Clue:
+        raise RuntimeError("Connection lost")
+
+
+def test_play_game_with_adapted_players():
+    game = get_concept_game()
+    players = to_async_players(make_ai_players(game), run_in_thread=False)
+
+    winner, game_end_status, num_turns = asyncio.run(play_game(game, players))
+
+    assert winner == AgentType.RED
+    assert game_end_status == GameEndStatus.RED_VICTORY
+    assert num_turns == 4
+
+
+def test_play_games_runs_games_concurrently():
+    num_games = 100
+    delay = 0.05
+    games = []
+    for _ in range(num_games):
+        game = get_concept_game()
+        players = to_async_players(make_ai_players(game), run_in_thread=False)
+        players = {
+            team: (SlowSpymaster(spymaster, delay), operative)
+            for team, (spymaster, operative) in players.items()
+        }
+        games.append((game, players))
+
+    start = time.perf_counter()
+    results = asyncio.run(play_games(games))
+    elapsed = time.perf_counter() - start
+
+    assert all(result[0] == AgentType.RED for result in results)
+    # Played one after the other, the games would wait num_games * 4 * delay = 20s.
+    assert elapsed < 10 * delay * 4
+
+
+def test_play_games_isolates_failing_games():
+    games = []
+    for broken in (False, True):
+        game = get_concept_game()
+        players = to_async_players(make_ai_players(game), run_in_thread=False)
+        if broken:
+            spymaster, operative = players[AgentType.BLUE]
+            players[AgentType.BLUE] = (BrokenSpymaster(spymaster, 0), operative)
+        games.append((game, players))
+
+    results = asyncio.run(play_games(games, max_concurrency=1))
+
+    assert results[0][0] == AgentType.RED
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_sync_adapter_does_not_block_event_loop():
+    class BlockingSpymaster(AISpymaster):
+        def offer_clue(self) -> Clue:
+            time.sleep(0.2)
+            return super().offer_clue()
+
+    game = get_concept_game()
+    embeddings = get_concept_embeddings(game)
+    spymaster = SyncSpymasterAdapter(
+        BlockingSpymaster(AgentType.RED, embeddings, CONCEPTS)
+    )
+    ticks = []
+
+    async def tick():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await spymaster.prefix_turn(game)
+        clue, _ = await asyncio.gather(spymaster.offer_clue(), tick())
+        return clue
+
+    clue = asyncio.run(main())
+
+    assert clue.clue == "fruit"
+    assert ticks[-1] - ticks[0] < 0.2
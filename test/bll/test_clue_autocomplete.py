@@ -0,0 +1,56 @@
+import pytest
+
+from app.bll.clue_autocomplete import ClueAutocomplete
+
+# Ordered like the clue words file, most common first.
+CLUE_WORDS = ["the", "then", "Theory", "tree", "theme", "thesis", "zebra", "the"]
+
+
+@pytest.fixture
+def autocomplete():
+    return ClueAutocomplete(CLUE_WORDS)
+
+
+def test_autocomplete_normalizes_and_deduplicates(autocomplete):
+    assert len(autocomplete) == 7
+    assert autocomplete.words == sorted(autocomplete.words)
+    assert "theory" in autocomplete.words
+
+
+def test_complete_ranks_by_vocabulary_order(autocomplete):
+    assert autocomplete.complete("the") == ("the", "then", "theory", "theme", "thesis")
+
+
+def test_complete_limit(autocomplete):
+    assert autocomplete.complete("th", limit=2) == ("the", "then")
+    assert autocomplete.complete("th", limit=0) == ()
+
+
+def test_complete_normalizes_prefix(autocomplete):
+    assert autocomplete.complete(" THEO ") == ("theory",)
+
+
+@pytest.mark.parametrize("prefix", ["thx", "zz", "a"])
+def test_complete_no_matches(autocomplete, prefix):
+    assert autocomplete.complete(prefix) == ()
+
+
+def test_prefix_range(autocomplete):
+    start, end = autocomplete.prefix_range("the")
+
+    assert autocomplete.words[start:end] == [
+        "the",
+        "theme",
+        "then",
+        "theory",
+        "thesis",
+    ]
+
+
+def test_complete_is_cached(autocomplete):
+    autocomplete.complete("the")
+    autocomplete.complete("THE")
+
+    cache_info = autocomplete._cached_complete.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
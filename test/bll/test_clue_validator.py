@@ -0,0 +1,96 @@
+import pytest
+
+from app.bll.clue_validator import (
+    ClueValidator,
+    ClueVocabulary,
+    InvalidClueException,
+    get_clue_validator,
+    stem,
+)
+from app.bll.types import Clue
+
+BOARD_WORDS = ["Apple", "running", "cities", "ice cream", "Tower"]
+
+
+@pytest.fixture
+def validator():
+    return ClueValidator(BOARD_WORDS)
+
+
+@pytest.mark.parametrize(
+    "word, other_form",
+    [("apples", "apple"), ("cities", "city"), ("boxes", "box"), ("baked", "bake")],
+)
+def test_stem(word, other_form):
+    assert stem(word) == stem(other_form)
+
+
+@pytest.mark.parametrize("word", ["is", "ice", "glass", "tower"])
+def test_stem_keeps_words_without_suffixes(word):
+    assert stem(word) in (word, word[:-1])
+    assert stem(word) != stem(word[:-1])
+
+
+@pytest.mark.parametrize("clue_word", ["fruit", "skyscraper", "town", "frozen"])
+def test_legal_clues(validator, clue_word):
+    assert validator.check(clue_word) is None
+    assert validator.is_legal(clue_word)
+
+
+@pytest.mark.parametrize(
+    "clue_word",
+    [
+        "apple",  # A board word
+        " TOWER ",  # A board word, normalized
+        "apples",  # The same stem as a board word
+        "city",  # The stem of a board word
+        "run",  # Not a stem we strip to, but a part of a board word
+        "tow",  # A part of a board word
+        "pineapple",  # Contains a board word
+        "watchtowers",  # Contains a board word
+        "supercities",  # Contains a board word
+    ],
+)
+def test_board_word_forms_are_illegal(validator, clue_word):
+    assert validator.check(clue_word) == (
+        f'"{clue_word.strip().lower()}" is a form of a word on the board.'
+    )
+
+
+@pytest.mark.parametrize("clue_word", ["", "   ", "two words"])
+def test_clue_must_be_a_single_word(validator, clue_word):
+    assert validator.check(clue_word) == "A clue must be a single word."
+
+
+def test_short_parts_are_legal(validator):
+    # Parts shorter than MIN_FORM_LENGTH are too common to rule out.
+    assert validator.is_legal("ap")
+
+
+def test_vocabulary():
+    vocabulary = ClueVocabulary(["Fruit", "town", "apple"])
+    validator = ClueValidator(BOARD_WORDS, vocabulary)
+
+    assert len(vocabulary) == 3
+    assert "FRUIT" in vocabulary
+    assert validator.is_legal("fruit")
+    assert validator.check("frozen") == '"frozen" is not an allowed clue word.'
+    assert not validator.is_legal("apple")
+
+
+def test_validate(validator):
+    validator.validate(Clue(clue="fruit", num_guesses=0))
+
+    with pytest.raises(InvalidClueException, match="form of a word on the board"):
+        validator.validate(Clue(clue="apples", num_guesses=2))
+    with pytest.raises(InvalidClueException, match="can't be negative"):
+        validator.validate(Clue(clue="fruit", num_guesses=-1))
+
+
+def test_get_clue_validator_is_cached():
+    vocabulary = ClueVocabulary(["fruit"])
+
+    validator = get_clue_validator(tuple(BOARD_WORDS), vocabulary)
+
+    assert get_clue_validator(tuple(BOARD_WORDS), vocabulary) is validator
+    assert get_clue_validator(tuple(BOARD_WORDS)) is not validator
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from app.bll.embeddings import WordEmbeddings
+
+
+def test_word_embeddings_normalizes_vectors():
+    embeddings = WordEmbeddings(["a", "b"], np.array([[3.0, 4.0], [0.0, 2.0]]))
+
+    np.testing.assert_allclose(np.linalg.norm(embeddings.vectors, axis=1), [1, 1])
+    assert embeddings.vectors.dtype == np.float32
+
+
+def test_word_embeddings_lookup_is_case_insensitive():
+    embeddings = WordEmbeddings(["Apple"], np.array([[1.0, 0.0]]))
+
+    assert "APPLE" in embeddings
+    assert embeddings.index_of(" apple ") == 0
+    assert embeddings.index_of("pear") is None
+
+
+def test_word_embeddings_vectors_for_unknown_word_is_zero():
+    embeddings = WordEmbeddings(["a"], np.array([[1.0, 0.0]]))
+
+    vectors = embeddings.vectors_for(["a", "unknown"])
+
+    np.testing.assert_allclose(vectors, [[1.0, 0.0], [0.0, 0.0]])
+
+
+def test_word_embeddings_mismatched_lengths():
+    with pytest.raises(ValueError, match="Got 2 words but 1 embedding vectors."):
+        WordEmbeddings(["a", "b"], np.array([[1.0, 0.0]]))
+
+
+def test_word_embeddings_from_text_lines():
+    embeddings = WordEmbeddings.from_text_lines(["cat 1 0\n", "\n", "dog 0 1\n"])
+
+    assert embeddings.words == ["cat", "dog"]
+    assert embeddings.dim == 2
@@ -3,11 +3,23 @@ import uuid
 import pytest
 from unittest.mock import create_autospec, patch, MagicMock
 
+from app.bll.clue_validator import ClueVocabulary, InvalidClueException
 from app.bll.defaults import DEFAULT_BOARD_SIZE
-from app.bll.game import Game, InvalidGuessException, CurrentTurnState
+from app.bll.game import (
+    MAX_DELTA_EVENTS,
+    Game,
+    InvalidGuessException,
+    CurrentTurnState,
+)
 from app.bll.board import Board
-from app.bll.types import AgentType, Coordinate, Clue, GameEndStatus
-from test.utils import get_test_board
+from app.bll.types import (
+    AgentType,
+    Coordinate,
+    Clue,
+    GameEndStatus,
+    TurnTimeLimits,
+)
+from test.utils import get_concept_game, get_test_board
 
 
 def test_get_game_description_for_operative():
@@ -147,6 +159,7 @@ def test_make_move_game_over():
 
     # Assertions
     assert result[1] == GameEndStatus.RED_VICTORY  # Game ends with RED victory
+    assert game.game_end_status == GameEndStatus.RED_VICTORY
 
 
 def test_make_move_invalid_guess():
@@ -159,7 +172,9 @@ def test_make_move_invalid_guess():
     mock_board.check_game_end.return_value = GameEndStatus.ONGOING
 
     # Create game with a basic turn state
-    turn_state = CurrentTurnState(team=AgentType.RED)
+    turn_state = CurrentTurnState(
+        team=AgentType.RED, clue=Clue(clue="keyword", num_guesses=1)
+    )
     game = Game(
         board=mock_board,
         game_id="game123",
@@ -203,3 +218,325 @@ def test_game_new_game():
 
     # Check that words_provider was used correctly
     words_provider.load_card_words.assert_called()  # Ensure it was called at least once
+
+
+def test_end_turn():
+    board = get_test_board()
+    game = Game(
+        board=board,
+        game_id="game123",
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn=CurrentTurnState(
+            team=AgentType.RED, clue=Clue(clue="keyword", num_guesses=2), guesses_made=1
+        ),
+    )
+
+    new_turn = game.end_turn()
+
+    assert new_turn.team == AgentType.BLUE
+    assert new_turn.clue is None
+    assert new_turn.guesses_made == 0
+    assert game.current_turn == new_turn
+
+
+def test_game_new_game_samples_card_words():
+    words_provider = MagicMock()
+    words_provider.load_card_words.return_value = [f"word{i}" for i in range(100)]
+
+    game = Game.new_game(words_provider, random_seed=7)
+    same_game = Game.new_game(words_provider, random_seed=7)
+
+    board_words = [card.word for row in game.board.words for card in row]
+    assert len(set(board_words)) == DEFAULT_BOARD_SIZE**2
+    assert set(board_words) != {f"word{i}" for i in range(DEFAULT_BOARD_SIZE**2)}
+    assert game.board == same_game.board
+
+
+def test_game_new_games():
+    words_provider = MagicMock()
+    words_provider.load_card_words.return_value = [f"word{i}" for i in range(100)]
+
+    games = Game.new_games(words_provider, 3, random_seed=7)
+
+    words_provider.load_card_words.assert_called_once()
+    assert len({game.game_id for game in games}) == 3
+    assert games[0].board == Game.new_game(words_provider, random_seed=7).board
+    assert games[2].board == Game.new_game(words_provider, random_seed=9).board
+
+
+def test_set_clue():
+    game = Game(
+        board=get_test_board(),
+        game_id="game123",
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn=CurrentTurnState(team=AgentType.RED),
+    )
+
+    game.set_clue(Clue(clue="keyword", num_guesses=2))
+
+    assert game.current_turn.clue == Clue(clue="keyword", num_guesses=2)
+
+
+@pytest.mark.parametrize(
+    "clue_word", ["word1", "WORD2", "keyword3", "ord", "password4"]
+)
+def test_set_clue_board_word_forms(clue_word):
+    game = Game(
+        board=get_test_board(),
+        game_id="game123",
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn=CurrentTurnState(team=AgentType.RED),
+    )
+
+    with pytest.raises(InvalidClueException, match="form of a word on the board"):
+        game.set_clue(Clue(clue=clue_word, num_guesses=1))
+    assert game.current_turn.clue is None
+
+
+def test_set_clue_vocabulary():
+    words_provider = MagicMock()
+    words_provider.load_card_words.return_value = [f"word{i}" for i in range(100)]
+    game = Game.new_game(
+        words_provider, clue_vocabulary=ClueVocabulary(["keyword", "other"])
+    )
+
+    game.set_clue(Clue(clue="Keyword", num_guesses=1))
+    game.end_turn()
+    with pytest.raises(InvalidClueException, match="not an allowed clue word"):
+        game.set_clue(Clue(clue="unknown", num_guesses=1))
+
+
+def test_set_clue_twice():
+    game = Game(
+        board=get_test_board(),
+        game_id="game123",
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn=CurrentTurnState(team=AgentType.RED),
+    )
+    game.set_clue(Clue(clue="keyword", num_guesses=2))
+
+    with pytest.raises(InvalidClueException, match="already given this turn"):
+        game.set_clue(Clue(clue="other", num_guesses=1))
+
+
+def test_make_move_without_clue():
+    game = Game(
+        board=get_test_board(),
+        game_id="game123",
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn=CurrentTurnState(team=AgentType.RED),
+    )
+
+    with pytest.raises(InvalidGuessException, match="No clue was given"):
+        game.make_move(Coordinate(x=0, y=0))
+
+
+def test_moves_after_game_end():
+    game = Game(
+        board=get_test_board(),
+        game_id="game123",
+        game_end_status=GameEndStatus.BLUE_VICTORY,
+        current_turn=CurrentTurnState(
+            team=AgentType.RED, clue=Clue(clue="keyword", num_guesses=2)
+        ),
+    )
+
+    with pytest.raises(InvalidGuessException, match="already over"):
+        game.make_move(Coordinate(x=0, y=0))
+    with pytest.raises(InvalidGuessException, match="already over"):
+        game.end_turn()
+    game.current_turn.clue = None
+    with pytest.raises(InvalidClueException, match="already over"):
+        game.set_clue(Clue(clue="keyword", num_guesses=2))
+
+
+def play_clue_and_guess(game):
+    team = game.current_turn.team
+    coordinate = game.board.agent_placements.positions[team][0]
+    game.set_clue(Clue(clue="keyword", num_guesses=1))
+    game.make_move(coordinate)
+    return team, coordinate
+
+
+def test_changes_are_versioned():
+    game = get_concept_game()
+
+    team, coordinate = play_clue_and_guess(game)
+    game.end_turn()
+
+    assert game.version == 3
+    assert [event.kind for event in game.history] == ["clue", "guess", "end_turn"]
+    assert [event.version for event in game.history] == [1, 2, 3]
+    assert game.history[1].guess == coordinate
+    assert game.history[1].outcome == team
+    assert game.get_game_description_for_operative().version == 3
+
+
+def test_get_delta():
+    game = get_concept_game()
+    team, coordinate = play_clue_and_guess(game)
+
+    delta = game.get_delta(1)
+
+    assert (delta.from_version, delta.version) == (1, 2)
+    assert [(card.coordinate, card.card_type) for card in delta.revealed] == [
+        (coordinate, team)
+    ]
+    assert delta.current_turn == game.current_turn
+    assert delta.game_end_status == GameEndStatus.ONGOING
+    assert game.get_delta(2).revealed == []
+
+
+@pytest.mark.parametrize("since_version", [-1, 3])
+def test_get_delta_unknown_version(since_version):
+    game = get_concept_game()
+    play_clue_and_guess(game)
+
+    assert game.get_delta(since_version) is None
+
+
+def test_get_delta_too_far_behind():
+    game = get_concept_game()
+    for _ in range(MAX_DELTA_EVENTS + 1):
+        game.end_turn()
+
+    assert game.get_delta(0) is None
+    assert game.get_delta(1) is not None
+
+
+def test_make_moves_stops_at_turn_end():
+    game = get_concept_game()
+    team = game.current_turn.team
+    other_team = AgentType.BLUE if team == AgentType.RED else AgentType.RED
+    game.set_clue(Clue(clue="keyword", num_guesses=2))
+    guesses = [
+        game.board.agent_placements.positions[team][0],
+        game.board.agent_placements.positions[other_team][0],
+        game.board.agent_placements.positions[team][1],
+    ]
+
+    guess_outcomes, game_end_status, current_turn, is_turn_over = game.make_moves(
+        guesses
+    )
+
+    assert guess_outcomes == [team, other_team]
+    assert is_turn_over
+    assert current_turn.team == other_team
+    assert game_end_status == GameEndStatus.ONGOING
+    assert len(game.board.discovered_agents) == 2
+    assert game.version == 3
+
+
+def test_make_moves_stops_at_game_end():
+    game = get_concept_game()
+    game.set_clue(Clue(clue="keyword", num_guesses=2))
+    guesses = [
+        game.board.agent_placements.positions[AgentType.BLACK][0],
+        game.board.agent_placements.positions[game.current_turn.team][0],
+    ]
+
+    guess_outcomes, game_end_status, _, _ = game.make_moves(guesses)
+
+    assert guess_outcomes == [AgentType.BLACK]
+    assert game_end_status != GameEndStatus.ONGOING
+
+
+def test_make_moves_invalid_guess():
+    game = get_concept_game()
+    team = game.current_turn.team
+    game.set_clue(Clue(clue="keyword", num_guesses=2))
+    coordinate = game.board.agent_placements.positions[team][0]
+
+    with pytest.raises(InvalidGuessException):
+        game.make_moves([coordinate, coordinate])
+
+
+def get_timed_game() -> Game:
+    game = get_concept_game()
+    game.turn_time_limits = TurnTimeLimits(clue_seconds=60, guess_seconds=120)
+    game._start_turn_timer()
+    return game
+
+
+def test_turn_deadlines():
+    game = get_timed_game()
+    clue_deadline = game.current_turn.deadline
+    team = game.current_turn.team
+
+    game.set_clue(Clue(clue="keyword", num_guesses=1))
+    guess_deadline = game.current_turn.deadline
+    game.make_move(game.board.agent_placements.positions[team][0])
+    game.end_turn()
+
+    assert guess_deadline - clue_deadline == pytest.approx(60, abs=1)
+    assert game.current_turn.deadline - guess_deadline == pytest.approx(-60, abs=1)
+    assert get_concept_game().current_turn.deadline is None
+
+
+def test_game_new_game_with_turn_time_limits():
+    words_provider = MagicMock()
+    words_provider.load_card_words.return_value = [f"word{i}" for i in range(100)]
+    limits = TurnTimeLimits(clue_seconds=60, guess_seconds=120)
+
+    game = Game.new_game(words_provider, turn_time_limits=limits)
+
+    assert game.turn_time_limits == limits
+    assert game.current_turn.deadline is not None
+
+
+def test_expire_turn():
+    game = get_timed_game()
+    team = game.current_turn.team
+    deadline = game.current_turn.deadline
+
+    with pytest.raises(InvalidGuessException, match="not timed out"):
+        game.expire_turn(now=deadline - 1)
+    new_turn = game.expire_turn(now=deadline)
+
+    assert new_turn.team != team
+    assert new_turn.deadline is not None
+    assert game.history[-1].kind == "timeout"
+    assert game.version == 1
+
+
+def test_expire_turn_without_deadline():
+    game = get_concept_game()
+
+    with pytest.raises(InvalidGuessException, match="not timed out"):
+        game.expire_turn()
+
+
+def test_game_end_clears_deadline():
+    game = get_timed_game()
+    game.set_clue(Clue(clue="keyword", num_guesses=1))
+
+    game.make_move(game.board.agent_placements.positions[AgentType.BLACK][0])
+
+    assert game.current_turn.deadline is None
+
+
+@pytest.mark.parametrize(
+    "end_status, current_team, winner",
+    [
+        (GameEndStatus.ONGOING, AgentType.RED, None),
+        (GameEndStatus.RED_VICTORY, AgentType.BLUE, AgentType.RED),
+        (GameEndStatus.BLUE_VICTORY, AgentType.RED, AgentType.BLUE),
+        (GameEndStatus.BLACK_REVEALED, AgentType.BLUE, AgentType.BLUE),
+    ],
+)
+def test_winner(end_status, current_team, winner):
+    game = get_concept_game()
+    game.game_end_status = end_status
+    game.current_turn = CurrentTurnState(team=current_team)
+
+    assert game.winner == winner
+
+
+def test_revealing_black_makes_the_other_team_win():
+    game = get_concept_game()
+    team = game.current_turn.team
+    game.set_clue(Clue(clue="fruit", num_guesses=1))
+    game.make_move(game.board.agent_placements.positions[AgentType.BLACK][0])
+
+    assert game.game_end_status == GameEndStatus.BLACK_REVEALED
+    assert game.winner not in (team, None)
@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from app.bll.game import Game
+from app.bll.game_analytics import GameAnalytics, GameStats
+from app.bll.types import AgentType, Clue, GameEndStatus
+from app.dal.local_dal import LocalDataAccess
+from test.utils import get_concept_game
+
+
+def finished_game(game_id: str, reveal: AgentType) -> Game:
+    """A concept game its starting team ends in one turn, by revealing the black card
+    or all of its own cards."""
+    game = get_concept_game()
+    game.game_id = game_id
+    game.set_clue(Clue(clue="Fruit", num_guesses=9))
+    for coordinate in game.board.agent_placements.positions[reveal]:
+        game.make_move(coordinate)
+        if game.game_end_status != GameEndStatus.ONGOING:
+            break
+    return game
+
+
+def save(dal: LocalDataAccess, *games: Game):
+    for game in games:
+        dal.save_game(game.game_id, game)
+
+
+@pytest.fixture
+def starting_color() -> AgentType:
+    return get_concept_game().current_turn.team
+
+
+@pytest.fixture
+def dal(tmp_path) -> LocalDataAccess:
+    (tmp_path / "data").mkdir()
+    return LocalDataAccess(tmp_path / "data")
+
+
+def test_game_stats(starting_color):
+    stats = GameStats()
+    stats.add_game(finished_game("a", AgentType.BLACK))
+    stats.add_game(finished_game("b", starting_color))
+
+    report = stats.report(top=10)
+
+    assert report.games == 2
+    assert report.starting_team_win_rate == 0.5
+    assert report.win_rate_by_starting_color == {starting_color: 0.5}
+    assert report.black_loss_rate == 0.5
+    assert report.average_turns == 1
+    # 9 correct guesses out of the 18 allowed, by the two uses of the clue.
+    assert report.correct_guesses_per_clue == 4.5
+    assert report.clue_hit_rate == 0.5
+    assert report.best_clues == []
+    words = stats.words
+    assert sum(word.appearances for word in words.values()) == 50
+    assert sum(word.reveals for word in words.values()) == 10
+    # Each card is revealed in one of the two games.
+    assert {frequency for _, frequency in report.most_revealed_words} == {0.5}
+    assert report.least_revealed_words[0][1] == 0
+
+
+def test_merged_stats_are_the_stats_of_all_games(starting_color):
+    games = [
+        finished_game("a", AgentType.BLACK),
+        finished_game("b", starting_color),
+        finished_game("c", starting_color),
+    ]
+    whole = GameStats()
+    for game in games:
+        whole.add_game(game)
+    first, second = GameStats(), GameStats()
+    first.add_game(games[0])
+    second.add_game(games[1])
+    second.add_game(games[2])
+
+    first.merge(second)
+
+    assert first == whole
+    assert first.report().best_clues == [("fruit", 6.0)]
+
+
+def test_only_finished_games_are_counted(dal, starting_color):
+    ongoing = get_concept_game()
+    ongoing.game_id = "ongoing"
+    save(dal, finished_game("a", AgentType.BLACK), ongoing)
+
+    stats = GameAnalytics(str(dal.root_dir), num_shards=4, max_workers=2).run()
+
+    assert stats.games == 1
+    assert stats.black_losses == 1
+
+
+def test_reruns_only_scan_new_and_changed_games(dal, tmp_path, starting_color):
+    ongoing = get_concept_game()
+    ongoing.game_id = "ongoing"
+    save(dal, finished_game("a", AgentType.BLACK), ongoing)
+    cache_path = tmp_path / "analytics.json"
+    analytics = GameAnalytics(str(dal.root_dir), str(cache_path), max_workers=2)
+    assert analytics.run().games == 1
+    assert not list(tmp_path.glob(".analytics.json.*"))
+
+    # A counted game changing would be counted again, if it was scanned again.
+    os.remove(dal._game_file("a"))
+    save(dal, finished_game("a", starting_color), finished_game("b", starting_color))
+    stats = analytics.run()
+    assert stats.games == 2
+    assert stats.black_losses == 1
+
+    save(dal, finished_game("ongoing", starting_color))
+    stats = analytics.run()
+    assert stats.games == 3
+    assert stats == GameAnalytics(str(dal.root_dir), str(cache_path)).run()
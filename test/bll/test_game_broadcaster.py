@@ -0,0 +1,134 @@
+import json
+from unittest.mock import patch
+
+from app.bll.game import Game
+from app.bll.game_broadcaster import (
+    GameBroadcaster,
+    Subscription,
+    serialize_snapshot,
+    serialize_update,
+    serialize_view,
+)
+from app.bll.types import Clue, GameDelta, GameState, Role
+from test.utils import get_concept_game
+
+
+def drain(subscription: Subscription) -> list[str]:
+    payloads = []
+    while not subscription._queue.empty():
+        payloads.append(subscription._queue.get_nowait())
+    return payloads
+
+
+def test_serialize_view():
+    game = get_concept_game()
+
+    assert Game.model_validate_json(serialize_view(game, Role.SPYMASTER)) == game
+    for role in (Role.OPERATIVE, Role.SPECTATOR):
+        view = GameState.model_validate_json(serialize_view(game, role))
+        assert view == game.get_game_description_for_operative()
+
+
+def test_serialize_update():
+    game = get_concept_game()
+    game.set_clue(Clue(clue="fruit", num_guesses=1))
+
+    delta = json.loads(serialize_update(game, Role.SPECTATOR, 0))
+    snapshot = json.loads(serialize_update(game, Role.SPYMASTER, None))
+    too_new = json.loads(serialize_update(game, Role.SPECTATOR, 5))
+
+    assert GameDelta.model_validate(delta).version == 1
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["version"] == 1
+    assert Game.model_validate(snapshot["state"]) == game
+    assert too_new["type"] == "snapshot"
+
+
+def test_subscription_resync():
+    subscription = Subscription("game", Role.SPECTATOR, max_queued=2)
+
+    assert subscription.push("1")
+    assert subscription.push("2")
+    assert not subscription.push("3")
+    subscription.resync("snapshot")
+
+    assert drain(subscription) == ["snapshot"]
+    assert subscription.num_resyncs == 1
+
+
+def test_publish_serializes_delta_once():
+    game = get_concept_game()
+    broadcaster = GameBroadcaster()
+    subscriptions = [
+        broadcaster.subscribe(game.game_id, role)
+        for role in [Role.SPECTATOR] * 50 + [Role.OPERATIVE, Role.SPYMASTER]
+    ]
+    other_game = broadcaster.subscribe("other-game", Role.SPECTATOR)
+    game.set_clue(Clue(clue="fruit", num_guesses=1))
+
+    with patch.object(
+        GameDelta,
+        "model_dump_json",
+        autospec=True,
+        side_effect=GameDelta.model_dump_json,
+    ) as dump:
+        broadcaster.publish(game)
+
+    payloads = [drain(subscription) for subscription in subscriptions]
+    assert dump.call_count == 1
+    assert all(len(queued) == 1 and queued[0] is payloads[0][0] for queued in payloads)
+    assert json.loads(payloads[0][0])["type"] == "delta"
+    assert drain(other_game) == []
+
+
+def test_publish_several_changes():
+    game = get_concept_game()
+    broadcaster = GameBroadcaster()
+    subscription = broadcaster.subscribe(game.game_id, Role.SPECTATOR)
+    game.set_clue(Clue(clue="fruit", num_guesses=1))
+    game.end_turn()
+
+    broadcaster.publish(game, since_version=0)
+
+    (update,) = drain(subscription)
+    assert json.loads(update)["from_version"] == 0
+    assert json.loads(update)["version"] == 2
+
+
+def test_publish_resyncs_slow_subscribers():
+    game = get_concept_game()
+    broadcaster = GameBroadcaster(max_queued=1)
+    slow_spectators = [broadcaster.subscribe(game.game_id, Role.SPECTATOR)] * 2
+    slow_spymaster = broadcaster.subscribe(game.game_id, Role.SPYMASTER)
+    game.set_clue(Clue(clue="fruit", num_guesses=1))
+    broadcaster.publish(game)
+    game.end_turn()
+
+    with patch(
+        "app.bll.game_broadcaster.serialize_snapshot", wraps=serialize_snapshot
+    ) as snapshot:
+        broadcaster.publish(game)
+
+    assert snapshot.call_count == 2
+    assert json.loads(drain(slow_spectators[0])[0])["version"] == 2
+    assert "agent_placements" in drain(slow_spymaster)[0]
+    assert slow_spymaster.num_resyncs == 1
+
+
+def test_unsubscribe():
+    broadcaster = GameBroadcaster()
+    first = broadcaster.subscribe("game", Role.SPECTATOR)
+    second = broadcaster.subscribe("game", Role.SPYMASTER)
+    broadcaster.subscribe("other-game", Role.SPECTATOR)
+
+    broadcaster.unsubscribe(first)
+    assert broadcaster.num_subscribers("game") == 1
+    broadcaster.unsubscribe(second)
+
+    assert broadcaster.num_subscribers("game") == 0
+    assert broadcaster.num_subscribers() == 1
+    assert "game" not in broadcaster._subscriptions
+
+
+def test_publish_without_subscribers():
+    GameBroadcaster().publish(get_concept_game())
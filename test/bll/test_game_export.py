@@ -0,0 +1,118 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from app.bll.game import Game
+from app.bll.game_export import (
+    ExportedGame,
+    GameExportFilter,
+    iter_exported_games,
+    read_cursor,
+)
+from app.bll.types import AgentType, Clue, GameEndStatus
+from app.dal.local_dal import LocalDataAccess
+from test.utils import get_concept_game
+
+
+def finished_game(game_id: str, reveal: AgentType) -> Game:
+    """A concept game its starting team ends by revealing the black card, or all of
+    its own cards."""
+    game = get_concept_game()
+    game.game_id = game_id
+    game.set_clue(Clue(clue="fruit", num_guesses=9))
+    for coordinate in game.board.agent_placements.positions[reveal]:
+        game.make_move(coordinate)
+        if game.game_end_status != GameEndStatus.ONGOING:
+            break
+    return game
+
+
+@pytest.fixture
+def dal(tmp_path):
+    dal = LocalDataAccess(tmp_path)
+    starting_color = get_concept_game().current_turn.team
+    games = [
+        finished_game("a", AgentType.BLACK),
+        get_concept_game(),
+        finished_game("c", starting_color),
+    ]
+    games[1].game_id = "b"
+    for game, updated_at in zip(games, [100, 200, 300]):
+        dal.save_game(game.game_id, game)
+        os.utime(dal._game_file(game.game_id), (updated_at, updated_at))
+    return dal
+
+
+def export(dal, **kwargs) -> list[dict]:
+    return [json.loads(line) for line in iter_exported_games(dal, **kwargs)]
+
+
+def test_only_finished_games_are_exported(dal):
+    records = export(dal)
+
+    assert [record["game_id"] for record in records] == ["a", "c"]
+    black, won = records
+    starting_color = get_concept_game().current_turn.team.value
+    assert black["end_status"] == "BLACK_REVEALED"
+    assert black["winner"] != starting_color
+    assert black["moves"][0] == {
+        "kind": "clue",
+        "team": starting_color,
+        "clue": "fruit",
+        "num_guesses": 9,
+    }
+    assert black["moves"][1]["outcome"] == "BLACK"
+    assert won["winner"] == starting_color
+    assert won["starting_color"] == starting_color
+    assert len(won["words"]) == 25
+    assert won["finished_at"] == "1970-01-01T00:05:00Z"
+
+
+def test_records_are_compact_lines(dal):
+    line = next(iter_exported_games(dal))
+
+    assert line.endswith("}\n") and line.count("\n") == 1
+    assert ", " not in line and ": " not in line
+    assert ExportedGame.model_validate_json(line).game_id == "a"
+
+
+def test_filter_by_end_status(dal):
+    export_filter = GameExportFilter(end_statuses={GameEndStatus.BLACK_REVEALED})
+
+    assert [
+        record["game_id"] for record in export(dal, export_filter=export_filter)
+    ] == ["a"]
+
+
+def test_filter_by_date(dal):
+    export_filter = GameExportFilter(
+        finished_after=datetime.fromtimestamp(150, timezone.utc),
+        finished_before=datetime(1970, 1, 1, 0, 10),
+    )
+
+    assert [
+        record["game_id"] for record in export(dal, export_filter=export_filter)
+    ] == ["c"]
+
+
+def test_resume_from_cursor(dal):
+    assert [record["game_id"] for record in export(dal, cursor="a")] == ["c"]
+    assert export(dal, cursor="c") == []
+
+
+def test_read_cursor_cuts_off_incomplete_line(dal, tmp_path):
+    export_file = tmp_path / "export.ndjson"
+    first, second = iter_exported_games(dal)
+    export_file.write_text(first + second[:20])
+
+    assert read_cursor(str(export_file)) == "a"
+    assert export_file.read_text() == first
+
+
+def test_read_cursor_of_empty_file(tmp_path):
+    export_file = tmp_path / "export.ndjson"
+    export_file.write_text("")
+
+    assert read_cursor(str(export_file)) is None
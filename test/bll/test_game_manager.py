@@ -0,0 +1,318 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.bll.clue_validator import ClueVocabulary, InvalidClueException
+from app.bll.game import InvalidGuessException
+from app.bll.game_manager import GameManager
+from app.bll.metrics import GAMES_CREATED, MOVES, WINS
+from app.bll.types import AgentType, Clue, Role, TurnTimeLimits
+from app.dal.base_data_access import StaleGameException
+from app.dal.local_dal import LocalDataAccess
+from test.utils import CONCEPTS, get_concept_game, write_concept_data_dir
+
+
+@pytest.fixture
+def game_manager(tmp_path):
+    dal = LocalDataAccess(write_concept_data_dir(tmp_path, get_concept_game()))
+    return GameManager(dal, ClueVocabulary(CONCEPTS))
+
+
+def test_create_game(game_manager):
+    game = asyncio.run(game_manager.create_game(random_seed=1))
+
+    assert asyncio.run(game_manager.get_game(game.game_id)) == game
+
+
+def test_create_games(game_manager):
+    with patch.object(
+        game_manager.dal, "save_games", side_effect=game_manager.dal.save_games
+    ) as save_games:
+        games = asyncio.run(game_manager.create_games(3, random_seed=1))
+
+    save_games.assert_called_once_with(games)
+    assert games[0].board == asyncio.run(game_manager.create_game(1)).board
+    assert [
+        game_manager.dal.get_game_by_id(game.game_id).model_dump() for game in games
+    ] == [game.model_dump() for game in games]
+
+
+def test_get_missing_game(game_manager):
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(game_manager.get_game("missing"))
+
+
+def test_give_clue_uses_vocabulary(game_manager):
+    async def give_clues():
+        game = await game_manager.create_game()
+        result = await game_manager.give_clue(
+            game.game_id, Clue(clue="fruit", num_guesses=2)
+        )
+        await game_manager.end_turn(game.game_id)
+        with pytest.raises(InvalidClueException, match="not an allowed clue"):
+            await game_manager.give_clue(game.game_id, Clue(clue="pear", num_guesses=1))
+        return result
+
+    result = asyncio.run(give_clues())
+
+    assert result.current_turn.clue == Clue(clue="fruit", num_guesses=2)
+
+
+def test_concurrent_guesses_are_serialized(game_manager):
+    async def guess_concurrently():
+        game = await game_manager.create_game(random_seed=5)
+        team = game.current_turn.team
+        await game_manager.give_clue(game.game_id, Clue(clue="fruit", num_guesses=3))
+        coordinates = game.board.agent_placements.positions[team][:3]
+        results = await asyncio.gather(
+            *(
+                game_manager.guess(game.game_id, coordinate)
+                for coordinate in coordinates
+            )
+        )
+        return await game_manager.get_game(game.game_id), team, results
+
+    game, team, results = asyncio.run(guess_concurrently())
+
+    assert len(game.board.discovered_agents) == 3
+    assert sorted(result.current_turn.guesses_made for result in results) == [1, 2, 3]
+    assert all(result.guess_outcome == team for result in results)
+
+
+def test_repeated_guess_is_rejected(game_manager):
+    async def guess_twice():
+        game = await game_manager.create_game(random_seed=5)
+        team = game.current_turn.team
+        await game_manager.give_clue(game.game_id, Clue(clue="fruit", num_guesses=3))
+        coordinate = game.board.agent_placements.positions[team][0]
+        return await asyncio.gather(
+            game_manager.guess(game.game_id, coordinate),
+            game_manager.guess(game.game_id, coordinate),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(guess_twice())
+
+    assert first.guess_outcome in (AgentType.RED, AgentType.BLUE)
+    assert isinstance(second, InvalidGuessException)
+
+
+def test_locks_are_released(game_manager):
+    async def play():
+        game = await game_manager.create_game()
+        await game_manager.end_turn(game.game_id)
+        return game.game_id
+
+    game_id = asyncio.run(play())
+
+    assert game_id not in game_manager._locks
+
+
+def test_reads_are_served_from_hot_cache(game_manager):
+    async def read_twice():
+        game = await game_manager.create_game()
+        with patch.object(
+            game_manager.dal, "get_game_by_id", side_effect=AssertionError
+        ):
+            return game, await game_manager.get_game(game.game_id)
+
+    game, cached = asyncio.run(read_twice())
+
+    assert cached is game
+
+
+def test_hot_cache_sees_changes_from_other_managers(game_manager):
+    other_manager = GameManager(game_manager.dal, ClueVocabulary(CONCEPTS))
+
+    async def change_elsewhere():
+        game = await game_manager.create_game()
+        await other_manager.end_turn(game.game_id)
+        return await game_manager.get_game(game.game_id)
+
+    game = asyncio.run(change_elsewhere())
+
+    assert game.version == 1
+
+
+def test_hot_cache_is_bounded(game_manager):
+    game_manager.hot_cache_size = 2
+
+    async def create_games():
+        return [await game_manager.create_game() for _ in range(3)]
+
+    games = asyncio.run(create_games())
+
+    assert list(game_manager._hot_games) == [game.game_id for game in games[1:]]
+
+
+def test_change_is_retried_on_newer_game(game_manager):
+    other_manager = GameManager(
+        LocalDataAccess(game_manager.dal.root_dir), ClueVocabulary(CONCEPTS)
+    )
+    save_game = game_manager.dal.save_game
+    num_saves = 0
+
+    def save_after_other_manager(game_id, game_state, expected_version=None):
+        # Another process stores a change between this one's read and save.
+        nonlocal num_saves
+        num_saves += 1
+        if num_saves == 1:
+            asyncio.run(other_manager.end_turn(game_id))
+        save_game(game_id, game_state, expected_version)
+
+    async def race():
+        game = await game_manager.create_game()
+        with patch.object(
+            game_manager.dal, "save_game", side_effect=save_after_other_manager
+        ):
+            return game, await game_manager.end_turn(game.game_id)
+
+    game, result = asyncio.run(race())
+
+    assert num_saves == 2
+    assert result.version == 2
+    assert result.current_turn.team == game.current_turn.team
+
+
+def test_change_gives_up_on_a_busy_game(game_manager):
+    async def race():
+        game = await game_manager.create_game()
+        with patch.object(
+            game_manager.dal, "save_game", side_effect=StaleGameException
+        ):
+            await game_manager.end_turn(game.game_id)
+
+    with pytest.raises(StaleGameException, match="gave up"):
+        asyncio.run(race())
+
+
+def test_guesses_are_atomic(game_manager):
+    async def guess():
+        game = await game_manager.create_game(random_seed=5)
+        team = game.current_turn.team
+        await game_manager.give_clue(game.game_id, Clue(clue="fruit", num_guesses=3))
+        coordinates = game.board.agent_placements.positions[team][:2]
+        subscription = game_manager.broadcaster.subscribe(game.game_id, Role.SPECTATOR)
+        result = await game_manager.guesses(game.game_id, coordinates)
+        with pytest.raises(InvalidGuessException):
+            await game_manager.guesses(
+                game.game_id, game.board.agent_placements.positions[team][2:3] * 2
+            )
+        stored = await game_manager.get_game(game.game_id)
+        return team, result, stored, await subscription.get()
+
+    team, result, stored, update = asyncio.run(guess())
+
+    assert result.guess_outcomes == [team, team]
+    assert result.version == stored.version == 3
+    assert len(stored.board.discovered_agents) == 2
+    assert json.loads(update)["from_version"] == 1
+    assert len(json.loads(update)["revealed"]) == 2
+
+
+def test_expire_turns(game_manager):
+    # The played game's guess deadline is long after the first clue deadline.
+    game_manager.turn_time_limits = TurnTimeLimits(clue_seconds=60, guess_seconds=600)
+
+    async def let_turns_time_out():
+        timed_out = await game_manager.create_game()
+        played = await game_manager.create_game()
+        deadline = timed_out.current_turn.deadline
+        await game_manager.give_clue(played.game_id, Clue(clue="fruit", num_guesses=1))
+        results = await game_manager.expire_turns(now=deadline + 1)
+        return timed_out, results, await game_manager.get_game(timed_out.game_id)
+
+    timed_out, results, stored = asyncio.run(let_turns_time_out())
+
+    assert [result.game_id for result in results] == [timed_out.game_id]
+    assert results[0].current_turn.team != timed_out.current_turn.team
+    assert stored.history[-1].kind == "timeout"
+    # The next turn's deadline is tracked, and the played game's guess deadline.
+    assert game_manager.turn_deadlines.deadline(timed_out.game_id) == (
+        stored.current_turn.deadline
+    )
+    assert len(game_manager.turn_deadlines) == 2
+
+
+def test_expire_turns_skips_turns_ended_elsewhere(game_manager):
+    game_manager.turn_time_limits = TurnTimeLimits(clue_seconds=60, guess_seconds=60)
+    other_manager = GameManager(
+        LocalDataAccess(game_manager.dal.root_dir), ClueVocabulary(CONCEPTS)
+    )
+
+    async def end_turn_elsewhere():
+        game = await game_manager.create_game()
+        deadline = game.current_turn.deadline
+        # The turn ends just in time, so the next one is due a minute later.
+        with patch("app.bll.game.time.time", return_value=deadline):
+            await other_manager.end_turn(game.game_id)
+        results = await game_manager.expire_turns(now=deadline + 1)
+        return game, results
+
+    game, results = asyncio.run(end_turn_elsewhere())
+
+    assert results == []
+    stored = game_manager.dal.get_game_by_id(game.game_id)
+    assert stored.history[-1].kind == "end_turn"
+    assert game_manager.turn_deadlines.deadline(game.game_id) == (
+        stored.current_turn.deadline
+    )
+
+
+def test_games_without_time_limits_have_no_deadlines(game_manager):
+    asyncio.run(game_manager.create_game())
+
+    assert len(game_manager.turn_deadlines) == 0
+
+
+def test_expire_turns_survives_broken_games(game_manager):
+    game_manager.turn_time_limits = TurnTimeLimits(clue_seconds=60, guess_seconds=60)
+
+    async def expire_with_broken_games():
+        deleted, broken, timed_out = [
+            await game_manager.create_game() for _ in range(3)
+        ]
+        game_manager.dal.delete_game(deleted.game_id)
+        load_game = game_manager._load_game
+
+        async def load_or_fail(game_id):
+            if game_id == broken.game_id:
+                raise RuntimeError("Corrupt game")
+            return await load_game(game_id)
+
+        with patch.object(game_manager, "_load_game", side_effect=load_or_fail):
+            results = await game_manager.expire_turns(
+                now=timed_out.current_turn.deadline + 1
+            )
+        return timed_out, results
+
+    timed_out, results = asyncio.run(expire_with_broken_games())
+
+    assert [result.game_id for result in results] == [timed_out.game_id]
+
+
+def test_moves_and_wins_are_counted(game_manager):
+    async def lose_to_black():
+        game = await game_manager.create_game(random_seed=2)
+        await game_manager.give_clue(game.game_id, Clue(clue="fruit", num_guesses=1))
+        black = game.board.agent_placements.positions[AgentType.BLACK][0]
+        await game_manager.guess(game.game_id, black)
+        return game.current_turn.team
+
+    def counts():
+        return (
+            GAMES_CREATED.labels().value,
+            MOVES.labels("clue").value,
+            MOVES.labels("guess").value,
+            WINS.labels("RED", "BLACK_REVEALED").value,
+            WINS.labels("BLUE", "BLACK_REVEALED").value,
+        )
+
+    before = counts()
+    loser = asyncio.run(lose_to_black())
+    after = counts()
+
+    red_wins = 1 if loser == AgentType.BLUE else 0
+    assert [a - b for a, b in zip(after, before)] == [1, 1, 1, red_wins, 1 - red_wins]
@@ -0,0 +1,68 @@
+from app.bll.ai_players import AIOperative, AISpymaster
+from app.bll.game_runner import play_game, play_guesses, play_turn
+from app.bll.types import AgentType, Clue, CurrentTurnState, GameEndStatus
+from test.utils import CONCEPTS, get_concept_embeddings, get_concept_game
+
+
+def test_play_turn():
+    game = get_concept_game()
+    game.current_turn = CurrentTurnState(team=AgentType.RED)
+    embeddings = get_concept_embeddings(game)
+
+    game_end_status = play_turn(
+        game,
+        AISpymaster(AgentType.RED, embeddings, CONCEPTS, max_num_guesses=3),
+        AIOperative(AgentType.RED, embeddings),
+    )
+
+    assert game_end_status == GameEndStatus.ONGOING
+    assert len(game.board.discovered_agents) == 3
+    assert game.current_turn == CurrentTurnState(team=AgentType.BLUE)
+
+
+def test_play_guesses_black_card():
+    game = get_concept_game()
+    game.current_turn = CurrentTurnState(
+        team=AgentType.RED, clue=Clue(clue="weapon", num_guesses=1)
+    )
+    embeddings = get_concept_embeddings(game)
+
+    game_end_status = play_guesses(game, AIOperative(AgentType.RED, embeddings))
+
+    assert game_end_status == GameEndStatus.BLACK_REVEALED
+
+
+def test_play_game():
+    game = get_concept_game()
+    embeddings = get_concept_embeddings(game)
+    players = {
+        team: (
+            AISpymaster(team, embeddings, CONCEPTS),
+            AIOperative(team, embeddings),
+        )
+        for team in (AgentType.RED, AgentType.BLUE)
+    }
+
+    winner, game_end_status, num_turns = play_game(game, players)
+
+    assert winner == AgentType.RED
+    assert game_end_status == GameEndStatus.RED_VICTORY
+    assert num_turns == 4
+
+
+def test_play_game_max_turns():
+    game = get_concept_game()
+    embeddings = get_concept_embeddings(game)
+    players = {
+        team: (
+            AISpymaster(team, embeddings, CONCEPTS, max_num_guesses=1),
+            AIOperative(team, embeddings),
+        )
+        for team in (AgentType.RED, AgentType.BLUE)
+    }
+
+    winner, game_end_status, num_turns = play_game(game, players, max_turns=3)
+
+    assert winner is None
+    assert game_end_status == GameEndStatus.ONGOING
+    assert num_turns == 3
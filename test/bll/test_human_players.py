@@ -2,6 +2,7 @@ import io
 
 import pytest
 from unittest.mock import MagicMock, patch
+from app.bll.clue_autocomplete import ClueAutocomplete
 from app.bll.human_players import HumanSpymaster, HumanOperative
 from app.bll.types import Clue, Coordinate, Card, GameState, AgentType
 
@@ -68,6 +69,20 @@ def test_human_spymaster_offer_clue():
         assert clue.num_guesses == 3
 
 
+@patch("sys.stdout", new_callable=io.StringIO)
+def test_human_spymaster_offer_clue_with_completions(mock_out):
+    autocomplete = ClueAutocomplete(["banana", "bandit", "band", "apple"])
+    spymaster = HumanSpymaster(AgentType.RED, autocomplete)
+
+    with patch("builtins.input", side_effect=["ban?", "xyz?", "bandit", "2"]):
+        clue = spymaster.offer_clue()
+
+    assert clue == Clue(clue="bandit", num_guesses=2)
+    output = mock_out.getvalue()
+    assert "Suggestions: banana, bandit, band" in output
+    assert "No clue words start with that." in output
+
+
 ### HumanOperative Tests ###
 
 
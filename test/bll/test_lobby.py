@@ -0,0 +1,217 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.bll.game_manager import GameManager
+from app.bll.lobby import Lobby, LobbyException
+from app.bll.types import AgentType, Role
+from app.dal.local_dal import LocalDataAccess
+from test.utils import get_concept_game, write_concept_data_dir
+
+
+@pytest.fixture
+def lobby(tmp_path):
+    dal = LocalDataAccess(write_concept_data_dir(tmp_path, get_concept_game()))
+    return Lobby(GameManager(dal))
+
+
+def join_all(lobby, players):
+    async def join():
+        return [await lobby.join(*player) for player in players]
+
+    return asyncio.run(join())
+
+
+def test_full_group_starts_a_game(lobby):
+    tickets = join_all(
+        lobby,
+        [
+            (Role.SPYMASTER, AgentType.RED),
+            (Role.OPERATIVE, None),
+            (Role.SPYMASTER, None),
+            (Role.OPERATIVE, AgentType.BLUE),
+        ],
+    )
+
+    assignments = [ticket.assignment for ticket in tickets]
+    assert len({assignment.game_id for assignment in assignments}) == 1
+    assert [(a.team, a.role) for a in assignments] == [
+        (AgentType.RED, Role.SPYMASTER),
+        (AgentType.RED, Role.OPERATIVE),
+        (AgentType.BLUE, Role.SPYMASTER),
+        (AgentType.BLUE, Role.OPERATIVE),
+    ]
+    assert lobby.num_waiting == 0
+    assert lobby.num_games_created == 1
+    assert lobby.game_manager.dal.get_game_by_id(assignments[0].game_id)
+
+
+def test_players_wait_for_a_compatible_group(lobby):
+    tickets = join_all(
+        lobby,
+        [
+            (Role.SPYMASTER, AgentType.RED),
+            (Role.SPYMASTER, AgentType.RED),
+            (Role.OPERATIVE, None),
+            (Role.OPERATIVE, None),
+        ],
+    )
+
+    assert all(ticket.assignment is None for ticket in tickets)
+    assert lobby.num_waiting == 4
+
+
+def test_players_are_matched_within_rating_bucket(lobby):
+    players = [
+        (Role.SPYMASTER, None, 1000),
+        (Role.SPYMASTER, None, 1000),
+        (Role.OPERATIVE, None, 1000),
+        (Role.OPERATIVE, None, 2000),
+    ]
+
+    tickets = join_all(lobby, players)
+    tickets += join_all(lobby, [(Role.OPERATIVE, None, 1050)])
+
+    assert [ticket.assignment is None for ticket in tickets] == [
+        False,
+        False,
+        False,
+        True,
+        False,
+    ]
+
+
+def test_players_are_matched_in_order(lobby):
+    first, second, *_ = join_all(
+        lobby,
+        [(Role.SPYMASTER, None)] * 3 + [(Role.OPERATIVE, None)] * 2,
+    )
+
+    assert first.assignment is not None
+    assert second.assignment is not None
+    assert lobby.num_waiting == 1
+
+
+def test_leave(lobby):
+    (ticket,) = join_all(lobby, [(Role.SPYMASTER, None)])
+
+    lobby.leave(ticket.ticket_id)
+
+    assert lobby.num_waiting == 0
+    assert lobby._queues == {}
+    with pytest.raises(LobbyException):
+        lobby.leave(ticket.ticket_id)
+    with pytest.raises(LobbyException):
+        lobby.get_ticket(ticket.ticket_id)
+
+
+def test_spectators_cannot_join(lobby):
+    with pytest.raises(LobbyException, match="cannot join as spectator"):
+        join_all(lobby, [(Role.SPECTATOR, None)])
+
+
+def test_wait_for_assignment(lobby):
+    async def wait_then_complete():
+        (ticket, *_) = [
+            await lobby.join(role, None)
+            for role in [Role.SPYMASTER, Role.SPYMASTER, Role.OPERATIVE]
+        ]
+        waiting = asyncio.create_task(ticket.wait(timeout=5))
+        await asyncio.sleep(0)
+        timed_out = await lobby.get_ticket(ticket.ticket_id).wait(timeout=0.01)
+        await lobby.join(Role.OPERATIVE, None)
+        return timed_out, await waiting
+
+    timed_out, assignment = asyncio.run(wait_then_complete())
+
+    assert timed_out is None
+    assert assignment.role == Role.SPYMASTER
+
+
+def test_failed_game_creation_requeues_waiting_players(lobby):
+    players = [(Role.SPYMASTER, None)] * 2 + [(Role.OPERATIVE, None)]
+    tickets = join_all(lobby, players)
+
+    with patch.object(lobby.game_manager, "create_game", side_effect=OSError):
+        with pytest.raises(OSError):
+            join_all(lobby, [(Role.OPERATIVE, None)])
+    # The player whose join failed never got their ticket, so it was dropped.
+    assert lobby.num_waiting == 3
+    (last,) = join_all(lobby, [(Role.OPERATIVE, None)])
+
+    assert all(ticket.assignment is not None for ticket in tickets + [last])
+    assert lobby.num_waiting == 0
+
+
+def test_matched_tickets_can_be_found_while_the_game_is_created(lobby):
+    create_game = lobby.game_manager.create_game
+
+    async def create_game_while_polling():
+        for ticket in tickets:
+            assert lobby.get_ticket(ticket.ticket_id) is ticket
+            assert ticket.assignment is None
+        return await create_game()
+
+    players = [(Role.SPYMASTER, None)] * 2 + [(Role.OPERATIVE, None)]
+    tickets = join_all(lobby, players)
+    with patch.object(
+        lobby.game_manager, "create_game", side_effect=create_game_while_polling
+    ):
+        join_all(lobby, [(Role.OPERATIVE, None)])
+
+    assert all(ticket.assignment is not None for ticket in tickets)
+
+
+def abandon(lobby, ticket):
+    ticket.last_seen -= lobby.ticket_ttl + 1
+
+
+def test_abandoned_tickets_are_not_matched(lobby):
+    players = [(Role.SPYMASTER, None)] * 2 + [(Role.OPERATIVE, None)] * 2
+    absent, *present = join_all(lobby, players[:3])
+    abandon(lobby, absent)
+
+    (last,) = join_all(lobby, players[3:])
+
+    # The group is still one spymaster short.
+    assert all(ticket.assignment is None for ticket in present + [last])
+    assert lobby.num_waiting == 3
+    with pytest.raises(LobbyException):
+        lobby.get_ticket(absent.ticket_id)
+
+    (spymaster,) = join_all(lobby, [(Role.SPYMASTER, None)])
+    assert all(ticket.assignment for ticket in present + [last, spymaster])
+
+
+def test_abandoned_tickets_are_dropped_on_join(lobby):
+    tickets = join_all(lobby, [(Role.SPYMASTER, AgentType.RED)] * 3)
+    abandon(lobby, tickets[0])
+    abandon(lobby, tickets[2])
+    # Polling a ticket moves it behind the ones seen less recently.
+    lobby.get_ticket(tickets[1].ticket_id)
+
+    join_all(lobby, [(Role.OPERATIVE, AgentType.BLUE)])
+
+    # The polled ticket and the new one are left.
+    assert lobby.num_waiting == 2
+    assert lobby.get_ticket(tickets[1].ticket_id) is tickets[1]
+    for ticket in tickets[0], tickets[2]:
+        with pytest.raises(LobbyException):
+            lobby.get_ticket(ticket.ticket_id)
+
+
+def test_waiting_for_an_assignment_keeps_a_ticket_alive(lobby):
+    async def wait_while_abandoned():
+        (ticket,) = [await lobby.join(Role.SPYMASTER, None)]
+        waiting = asyncio.create_task(ticket.wait(timeout=5))
+        await asyncio.sleep(0)
+        abandon(lobby, ticket)
+        stale_while_waiting = ticket.is_stale(lobby.ticket_ttl)
+        waiting.cancel()
+        return ticket, stale_while_waiting
+
+    ticket, stale_while_waiting = asyncio.run(wait_while_abandoned())
+
+    assert not stale_while_waiting
+    assert not ticket.is_stale(lobby.ticket_ttl)
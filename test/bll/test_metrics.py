@@ -0,0 +1,95 @@
+import math
+
+import pytest
+
+from app.bll.metrics import Metric, MetricsRegistry, timed
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_counter_by_labels(registry):
+    counter = registry.counter("moves_total", "Moves.", ("kind",))
+    counter.labels("guess").inc()
+    counter.labels("guess").inc(2)
+    counter.labels("clue").inc()
+
+    assert counter.labels("guess").value == 3
+    assert counter.labels("clue").value == 1
+
+
+def test_labels_must_match_label_names(registry):
+    counter = registry.counter("moves_total", "Moves.", ("kind",))
+
+    with pytest.raises(ValueError):
+        counter.labels("guess", "red")
+
+
+def test_metrics_must_make_values():
+    class Summary(Metric):
+        type_name = "summary"
+
+    with pytest.raises(TypeError):
+        Summary("latency", "Latency.", ())
+
+
+def test_registering_twice_returns_the_same_metric(registry):
+    counter = registry.counter("moves_total", "Moves.")
+
+    assert registry.counter("moves_total", "Moves.") is counter
+    with pytest.raises(ValueError):
+        registry.gauge("moves_total", "Moves.")
+
+
+def test_histogram_buckets(registry):
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 2):
+        histogram.observe(value)
+
+    value = histogram.labels()
+    assert value.counts == [2, 1, 1]
+    assert value.count == 4
+    assert value.sum == pytest.approx(2.65)
+
+
+def test_render_text_format(registry):
+    registry.counter("games_total", "Games.").inc(3)
+    registry.gauge("cache_entries", "Entries.", ("cache",)).labels('a"b').set(1.5)
+    registry.histogram("latency_seconds", "Latency.", ("op",), (0.1,)).labels(
+        "move"
+    ).observe(0.05)
+
+    assert registry.render().splitlines() == [
+        "# HELP games_total Games.",
+        "# TYPE games_total counter",
+        "games_total 3",
+        "# HELP cache_entries Entries.",
+        "# TYPE cache_entries gauge",
+        'cache_entries{cache="a\\"b"} 1.5',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{op="move",le="0.1"} 1',
+        'latency_seconds_bucket{op="move",le="+Inf"} 1',
+        'latency_seconds_sum{op="move"} 0.05',
+        'latency_seconds_count{op="move"} 1',
+    ]
+
+
+def test_timed_observes_calls_that_raise(registry):
+    histogram = registry.histogram("latency_seconds", "Latency.").labels()
+
+    @timed(histogram)
+    def fail():
+        raise KeyError
+
+    @timed(histogram)
+    def add(a, b=0):
+        return a + b
+
+    assert add(1, b=2) == 3
+    with pytest.raises(KeyError):
+        fail()
+    assert histogram.count == 2
+    assert 0 < histogram.sum < math.inf
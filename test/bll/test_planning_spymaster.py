@@ -0,0 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.bll.planning_spymaster import MonteCarloSpymaster
+from app.bll.types import AgentType, CurrentTurnState
+from test.utils import CONCEPTS, get_concept_embeddings, get_concept_game
+
+
+@pytest.fixture
+def concept_game():
+    game = get_concept_game()
+    game.current_turn = CurrentTurnState(team=AgentType.RED)
+    return game
+
+
+@pytest.fixture
+def concept_embeddings(concept_game):
+    return get_concept_embeddings(concept_game)
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def test_monte_carlo_spymaster_offer_clue(concept_game, concept_embeddings, executor):
+    spymaster = MonteCarloSpymaster(
+        AgentType.RED,
+        concept_embeddings,
+        CONCEPTS,
+        rollouts_per_candidate=4,
+        rollout_batch_size=2,
+        time_budget=30,
+        executor=executor,
+        random_seed=0,
+    )
+
+    spymaster.prefix_turn(concept_game)
+    clue = spymaster.offer_clue()
+
+    assert clue.clue == "fruit"
+    evaluations = spymaster.last_evaluations
+    assert {evaluation.clue.clue for evaluation in evaluations} == set(CONCEPTS)
+    assert all(evaluation.num_rollouts == 4 for evaluation in evaluations)
+    assert all(0.0 <= evaluation.win_probability <= 1.0 for evaluation in evaluations)
+    assert evaluations[0].win_probability == max(
+        evaluation.win_probability for evaluation in evaluations
+    )
+    assert all(
+        evaluation.win_probability_delta is not None for evaluation in evaluations
+    )
+
+
+def test_monte_carlo_spymaster_does_not_change_game(
+    concept_game, concept_embeddings, executor
+):
+    before = concept_game.model_copy(deep=True)
+    spymaster = MonteCarloSpymaster(
+        AgentType.RED,
+        concept_embeddings,
+        CONCEPTS,
+        rollouts_per_candidate=2,
+        time_budget=30,
+        executor=executor,
+    )
+
+    spymaster.evaluate_clues(concept_game)
+
+    assert concept_game == before
+
+
+def test_monte_carlo_spymaster_falls_back_to_greedy_on_deadline(
+    concept_game, concept_embeddings, executor
+):
+    spymaster = MonteCarloSpymaster(
+        AgentType.RED, concept_embeddings, CONCEPTS, time_budget=0, executor=executor
+    )
+
+    evaluations = spymaster.evaluate_clues(concept_game)
+
+    assert evaluations[0].clue.clue == "fruit"
+    assert all(evaluation.num_rollouts == 0 for evaluation in evaluations)
+    assert all(evaluation.win_probability is None for evaluation in evaluations)
+    greedy_scores = [evaluation.greedy_score for evaluation in evaluations]
+    assert greedy_scores == sorted(greedy_scores, reverse=True)
+
+
+def test_monte_carlo_spymaster_process_pool(concept_game, concept_embeddings):
+    spymaster = MonteCarloSpymaster(
+        AgentType.RED,
+        concept_embeddings,
+        CONCEPTS,
+        num_candidates=2,
+        rollouts_per_candidate=2,
+        time_budget=60,
+        max_workers=2,
+    )
+    try:
+        evaluations = spymaster.evaluate_clues(concept_game)
+    finally:
+        spymaster.close()
+
+    assert all(evaluation.num_rollouts == 2 for evaluation in evaluations)
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Keeps the tasks submitted, and counts the most unfinished at a time."""
+
+    def __init__(self, max_workers: int):
+        super().__init__(max_workers=max_workers)
+        self.futures = []
+        self.max_unfinished = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.futures.append(super().submit(fn, *args, **kwargs))
+        unfinished = sum(not future.done() for future in self.futures)
+        self.max_unfinished = max(self.max_unfinished, unfinished)
+        return self.futures[-1]
+
+
+def test_monte_carlo_spymaster_submits_batches_as_workers_free_up(
+    concept_game, concept_embeddings
+):
+    with CountingExecutor(max_workers=2) as executor:
+        spymaster = MonteCarloSpymaster(
+            AgentType.RED,
+            concept_embeddings,
+            CONCEPTS,
+            num_candidates=2,
+            rollouts_per_candidate=4,
+            rollout_batch_size=1,
+            time_budget=60,
+            executor=executor,
+            max_workers=2,
+        )
+        evaluations = spymaster.evaluate_clues(concept_game)
+
+    # 4 batches for each of the 2 candidates and the baseline.
+    assert len(executor.futures) == 12
+    assert executor.max_unfinished <= 2
+    assert all(evaluation.num_rollouts == 4 for evaluation in evaluations)
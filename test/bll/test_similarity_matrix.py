@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from app.bll.embeddings import WordEmbeddings
+from app.bll.similarity_matrix import SimilarityMatrices
+
+
+@pytest.fixture
+def embeddings():
+    rng = np.random.default_rng(0)
+    words = [f"card{i}" for i in range(6)] + [f"clue{i}" for i in range(10)]
+    return WordEmbeddings(words, rng.standard_normal((len(words), 8)))
+
+
+@pytest.fixture
+def card_words():
+    return [f"card{i}" for i in range(6)]
+
+
+@pytest.fixture
+def clue_words():
+    return [f"clue{i}" for i in range(10)]
+
+
+@pytest.mark.parametrize(
+    "dtype, tolerance", [("float32", 1e-6), ("float16", 1e-3), ("int8", 1 / 127)]
+)
+def test_similarity_matrices_build(
+    tmp_path, embeddings, card_words, clue_words, dtype, tolerance
+):
+    matrices = SimilarityMatrices.build(
+        embeddings, card_words, clue_words, tmp_path, dtype=dtype
+    )
+    card_vectors = embeddings.vectors_for(card_words)
+    clue_vectors = embeddings.vectors_for(clue_words)
+
+    assert isinstance(matrices.card_clue, np.memmap)
+    assert matrices.card_clue.dtype == np.dtype(dtype)
+    np.testing.assert_allclose(
+        matrices.card_clue_similarities(card_words),
+        card_vectors @ clue_vectors.T,
+        atol=tolerance,
+    )
+    np.testing.assert_allclose(
+        matrices.card_card_similarities(card_words),
+        card_vectors @ card_vectors.T,
+        atol=tolerance,
+    )
+
+
+def test_similarity_matrices_slicing(tmp_path, embeddings, card_words, clue_words):
+    matrices = SimilarityMatrices.build(
+        embeddings, card_words, clue_words, tmp_path, dtype="float32"
+    )
+    board = ["card4", "CARD1"]
+
+    card_clue = matrices.card_clue_similarities(board, np.array([2, 7]))
+    card_card = matrices.card_card_similarities(board)
+
+    vectors = embeddings.vectors_for(board)
+    np.testing.assert_allclose(
+        card_clue, vectors @ embeddings.vectors_for(["clue2", "clue7"]).T, atol=1e-6
+    )
+    np.testing.assert_allclose(card_card, vectors @ vectors.T, atol=1e-6)
+    assert card_clue.dtype == np.float32
+
+
+def test_similarity_matrices_drop_unknown_clues(tmp_path, embeddings, card_words):
+    matrices = SimilarityMatrices.build(
+        embeddings, card_words, ["clue1", "unknown", "clue3"], tmp_path
+    )
+
+    assert matrices.clue_words == ["clue1", "clue3"]
+    assert matrices.card_clue.shape == (len(card_words), 2)
+
+
+def test_similarity_matrices_unknown_card(tmp_path, embeddings, card_words, clue_words):
+    matrices = SimilarityMatrices.build(embeddings, card_words, clue_words, tmp_path)
+
+    assert "card0" in matrices
+    assert "unknown" not in matrices
+    with pytest.raises(ValueError, match="Card word unknown has no precomputed row."):
+        matrices.card_clue_similarities(["card0", "unknown"])
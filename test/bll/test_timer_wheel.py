@@ -0,0 +1,84 @@
+import math
+import random
+
+import pytest
+
+from app.bll.timer_wheel import TimerWheel
+
+
+def test_schedule_and_advance():
+    wheel = TimerWheel(tick=1, start=100)
+    wheel.schedule("a", 102.5)
+    wheel.schedule("b", 101)
+
+    assert wheel.advance(101.9) == ["b"]
+    assert wheel.advance(102.9) == []
+    assert wheel.advance(103) == ["a"]
+    assert len(wheel) == 0
+
+
+def test_deadlines_in_the_past_expire_on_next_tick():
+    wheel = TimerWheel(tick=1)
+    wheel.advance(10)
+    wheel.schedule("late", 3)
+
+    assert wheel.advance(10.5) == []
+    assert wheel.advance(11) == ["late"]
+
+
+def test_cancel_and_reschedule():
+    wheel = TimerWheel(tick=1)
+    wheel.schedule("a", 5)
+    wheel.schedule("b", 5)
+    wheel.schedule("a", 500)
+
+    assert wheel.cancel("b")
+    assert not wheel.cancel("b")
+    assert wheel.advance(10) == []
+    assert wheel.deadline("a") == 500
+    assert "a" in wheel
+    assert wheel.advance(500) == ["a"]
+
+
+@pytest.mark.parametrize("deadline", [63, 64, 65, 4095, 4096, 300_000, 10**9])
+def test_far_deadlines_cascade_down(deadline):
+    wheel = TimerWheel(tick=1, slots_per_level=64, num_levels=3)
+    wheel.schedule("a", deadline)
+
+    assert wheel.advance(deadline - 1) == []
+    assert wheel.advance(deadline) == ["a"]
+
+
+def test_idle_wheel_skips_ahead():
+    wheel = TimerWheel(tick=1, start=0)
+
+    wheel.advance(1.7e9)
+
+    assert wheel.now == 1.7e9
+
+
+def test_matches_brute_force():
+    rng = random.Random(0)
+    wheel = TimerWheel(tick=1, slots_per_level=4, num_levels=3)
+    deadlines = {}
+    now = 0.0
+    for _ in range(5000):
+        draw = rng.random()
+        key = rng.randrange(200)
+        if draw < 0.5:
+            deadlines[key] = now + rng.expovariate(1 / 30)
+            wheel.schedule(key, deadlines[key])
+        elif draw < 0.6:
+            assert wheel.cancel(key) == (deadlines.pop(key, None) is not None)
+        else:
+            now += rng.random() * 3
+            expired = wheel.advance(now)
+            due = {key for key, deadline in deadlines.items() if deadline <= now}
+            # Deadlines are rounded up to a tick, so the due ones in the current
+            # tick may not have expired yet.
+            assert set(expired) <= due
+            assert {
+                key for key in due if math.ceil(deadlines[key]) <= math.floor(now)
+            } <= set(expired)
+            for key in expired:
+                del deadlines[key]
@@ -0,0 +1,207 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.bll.game import Game
+from app.bll.tournament import (
+    BotConfig,
+    EloRatings,
+    MatchResult,
+    Tournament,
+    TournamentConfig,
+    _create_players,
+    round_robin_pairings,
+    swiss_pairings,
+)
+from app.bll.types import AgentType
+from app.dal.local_dal import LocalDataAccess
+from test.utils import get_concept_game, write_concept_data_dir
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return write_concept_data_dir(tmp_path, get_concept_game())
+
+
+@pytest.fixture
+def tournament_config(data_dir):
+    return TournamentConfig(
+        bots=[
+            BotConfig(name="careful", spymaster_params={"max_num_guesses": 2}),
+            BotConfig(name="bold", spymaster_params={"max_num_guesses": 4}),
+            BotConfig(
+                name="timid",
+                spymaster_params={"max_num_guesses": 1},
+                operative_params={"confidence_threshold": 0.9},
+            ),
+        ],
+        data_dir=str(data_dir),
+        workers=2,
+    )
+
+
+def make_result(red, blue, winner, match_id="0-0"):
+    return MatchResult(
+        match_id=match_id,
+        round=0,
+        red=red,
+        blue=blue,
+        winner=winner,
+        end_status="RED_VICTORY",
+        num_turns=5,
+    )
+
+
+def test_elo_ratings_update():
+    ratings = EloRatings(["a", "b"], k_factor=32)
+
+    ratings.update(make_result("a", "b", "a"))
+
+    assert ratings.ratings["a"] == pytest.approx(1516)
+    assert ratings.ratings["b"] == pytest.approx(1484)
+    assert ratings.games_played == {"a": 1, "b": 1}
+
+
+def test_elo_ratings_draw_between_equals():
+    ratings = EloRatings(["a", "b"])
+
+    ratings.update(make_result("a", "b", None))
+
+    assert ratings.ratings["a"] == ratings.ratings["b"] == 1500
+
+
+def test_round_robin_pairings():
+    pairings = round_robin_pairings(["a", "b", "c"])
+
+    assert len(pairings) == 6
+    assert set(pairings) == {
+        ("a", "b"),
+        ("b", "a"),
+        ("a", "c"),
+        ("c", "a"),
+        ("b", "c"),
+        ("c", "b"),
+    }
+
+
+def test_swiss_pairings_avoid_rematches():
+    ratings = EloRatings(["a", "b", "c", "d"])
+    ratings.ratings.update({"a": 1600, "b": 1550, "c": 1500, "d": 1450})
+
+    pairings = swiss_pairings(ratings, played={frozenset(("a", "b"))})
+
+    assert pairings == [("c", "a"), ("d", "b")]
+
+
+def test_tournament_run(tmp_path, tournament_config):
+    tournament = Tournament(tournament_config, tmp_path / "output")
+
+    standings = tournament.run()
+
+    assert len(tournament.results) == 6
+    assert sum(standing["games"] for standing in standings) == 12
+    assert sum(standing["rating"] for standing in standings) == pytest.approx(
+        4500, abs=0.5
+    )
+    results_lines = (tmp_path / "output" / "results.ndjson").read_text().splitlines()
+    assert len(results_lines) == 6
+    assert "board" not in json.loads(results_lines[0])
+    ratings_file = json.loads((tmp_path / "output" / "ratings.json").read_text())
+    assert ratings_file == standings
+
+
+def test_planning_spymasters_share_a_rollout_pool(data_dir):
+    bot = BotConfig(name="planner", spymaster="monte_carlo")
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        red, _ = _create_players(bot, AgentType.RED, str(data_dir), executor, 2)
+        blue, _ = _create_players(bot, AgentType.BLUE, str(data_dir), executor, 2)
+        red.close()
+
+        assert red.executor is blue.executor is executor
+        assert blue._max_workers == 2
+        assert not executor._shutdown_thread
+
+
+def test_tournament_with_planning_spymasters(tmp_path, data_dir):
+    planner_params = {
+        "num_candidates": 2,
+        "rollouts_per_candidate": 2,
+        "time_budget": 5,
+    }
+    config = TournamentConfig(
+        bots=[
+            BotConfig(name="greedy"),
+            BotConfig(
+                name="planner",
+                spymaster="monte_carlo",
+                spymaster_params=planner_params,
+            ),
+        ],
+        data_dir=str(data_dir),
+        workers=1,
+        rollout_workers=1,
+    )
+
+    tournament = Tournament(config, tmp_path / "output")
+    tournament.run()
+
+    assert len(tournament.results) == 2
+
+
+def test_tournament_resumes_after_crash(tmp_path, tournament_config):
+    output_dir = tmp_path / "output"
+    Tournament(tournament_config, output_dir).run()
+    results_file = output_dir / "results.ndjson"
+    lines = results_file.read_text().splitlines()
+    # Simulate a crash: two games never finished, and one was cut mid-write.
+    results_file.write_text("\n".join(lines[:3]) + "\n" + lines[3][:10])
+
+    resumed = Tournament(tournament_config, output_dir)
+    assert len(resumed.results) == 3
+    resumed.run()
+
+    assert len(resumed.results) == 6
+    assert len(results_file.read_text().splitlines()) == 6
+    assert {result.match_id for result in resumed.results.values()} == {
+        f"0-{i}" for i in range(6)
+    }
+
+
+def test_tournament_swiss(tmp_path, tournament_config):
+    tournament_config.pairing = "swiss"
+    tournament_config.num_rounds = 2
+    tournament = Tournament(tournament_config, tmp_path / "output")
+
+    tournament.run()
+
+    assert [len(matches) for matches in tournament.schedule] == [1, 1]
+    first, second = (matches[0] for matches in tournament.schedule)
+    assert {first.red, first.blue} != {second.red, second.blue}
+
+
+def test_swiss_rounds_give_the_lower_rated_bot_the_first_move(
+    tmp_path, tournament_config, data_dir
+):
+    tournament_config.pairing = "swiss"
+    tournament = Tournament(tournament_config, tmp_path / "output")
+    tournament.ratings.ratings.update({"careful": 1600, "bold": 1500, "timid": 1400})
+    dal = LocalDataAccess(data_dir)
+
+    for round_number in range(5):
+        (match,) = tournament._schedule_round(round_number)
+        game = Game.new_game(dal, random_seed=match.random_seed)
+        first_mover = (
+            match.red if game.current_turn.team == AgentType.RED else match.blue
+        )
+        assert first_mover == "bold"
+
+
+def test_tournament_duplicate_bot_names(tmp_path, data_dir):
+    config = TournamentConfig(
+        bots=[BotConfig(name="a"), BotConfig(name="a")], data_dir=str(data_dir)
+    )
+
+    with pytest.raises(ValueError, match="Bot names must be unique."):
+        Tournament(config, tmp_path / "output")
@@ -1,9 +1,15 @@
+import fcntl
 import re
+import threading
+import time
 
+import numpy as np
 import pytest
 from pathlib import Path
 from unittest.mock import patch
 
+from app.bll.ann_index import IVFIndex
+from app.dal.base_data_access import StaleGameException
 from app.dal.local_dal import LocalDataAccess
 from app.bll.game import Game
 from app.bll.types import Card, AgentType, Coordinate, GameEndStatus
@@ -109,6 +115,99 @@ def test_save_game_valid(temp_dir):
     assert saved_file.read_text() == "Game Data JSON"
 
 
+def test_save_and_load_game(temp_dir):
+    """Test that a saved game loads back equal, mid-turn."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    game = Game(
+        game_id="1",
+        board=create_mock_board(),
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn={"team": AgentType.BLUE, "clue": None, "guesses_made": 0},
+    )
+    game.board.reveal_card(Coordinate(x=0, y=1))
+
+    local_dal.save_game(game_id=game.game_id, game_state=game)
+
+    assert local_dal.get_game_by_id(game_id=game.game_id) == game
+
+
+def test_get_game_version(temp_dir):
+    """Test that the version of a saved game is read without loading the game."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    game = Game(
+        game_id="1",
+        board=create_mock_board(),
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn={"team": AgentType.RED, "clue": None, "guesses_made": 0},
+        version=3,
+    )
+    local_dal.save_game(game_id=game.game_id, game_state=game)
+
+    with patch("app.bll.game.Game.model_validate_json") as mock_validate:
+        assert local_dal.get_game_version(game_id=game.game_id) == 3
+    mock_validate.assert_not_called()
+
+
+def test_get_game_version_without_version_file(temp_dir):
+    """Test that games saved without a version file still report their version."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    game = Game(
+        game_id="1",
+        board=create_mock_board(),
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn={"team": AgentType.RED, "clue": None, "guesses_made": 0},
+        version=2,
+    )
+    local_dal.save_game(game_id=game.game_id, game_state=game)
+    (temp_dir / "games" / "1.version").unlink()
+
+    assert local_dal.get_game_version(game_id=game.game_id) == 2
+
+
+def test_save_game_expected_version(temp_dir):
+    """Test that saving with an expected version is a compare-and-swap."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    game = Game(
+        game_id="1",
+        board=create_mock_board(),
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn={"team": AgentType.RED, "clue": None, "guesses_made": 0},
+    )
+    local_dal.save_game(game_id=game.game_id, game_state=game)
+    game.version = 1
+    local_dal.save_game(game_id=game.game_id, game_state=game, expected_version=0)
+
+    game.version = 2
+    with pytest.raises(StaleGameException, match="at version 1, not 0"):
+        local_dal.save_game(game_id=game.game_id, game_state=game, expected_version=0)
+    with pytest.raises(StaleGameException, match="at version None, not 0"):
+        local_dal.save_game(game_id="2", game_state=game, expected_version=0)
+
+    assert local_dal.get_game_version(game_id=game.game_id) == 1
+    assert sorted(path.name for path in (temp_dir / "games").glob("*.json")) == [
+        "1.json"
+    ]
+
+
+def test_save_games(temp_dir):
+    """Test saving several new games at once."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    games = [
+        Game(
+            game_id=game_id,
+            board=create_mock_board(),
+            game_end_status=GameEndStatus.ONGOING,
+            current_turn={"team": AgentType.RED, "clue": None, "guesses_made": 0},
+        )
+        for game_id in ["1", "2"]
+    ]
+
+    local_dal.save_games(games)
+
+    assert [local_dal.get_game_by_id(game_id=game.game_id) for game in games] == games
+    assert local_dal.get_game_version(game_id="2") == 0
+
+
 def test_delete_game_existing_file(temp_dir):
     """Test deleting an existing game file."""
     game_id = 1
@@ -133,6 +232,53 @@ def test_delete_game_missing_file(temp_dir):
         local_dal.delete_game(game_id=game_id)
 
 
+def test_delete_game_removes_its_files(temp_dir):
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    game = Game(
+        game_id="1",
+        board=create_mock_board(),
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn={"team": AgentType.RED, "clue": None, "guesses_made": 0},
+    )
+    local_dal.save_game(game_id=game.game_id, game_state=game)
+
+    local_dal.delete_game(game_id=game.game_id)
+
+    assert list((temp_dir / "games").iterdir()) == []
+    with pytest.raises(StaleGameException):
+        local_dal.save_game(game_id=game.game_id, game_state=game, expected_version=0)
+
+
+def test_lock_waiters_move_to_the_new_lock_file(temp_dir):
+    """A process woken up on the lock file of a deleted game must not share the lock
+    with a process locking the new one."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    (temp_dir / "games").mkdir()
+    lock_path = temp_dir / "games" / "1.lock"
+    locked = threading.Event()
+
+    def lock():
+        with local_dal._locked("1"):
+            locked.set()
+
+    with lock_path.open("a") as old_lock:
+        fcntl.flock(old_lock, fcntl.LOCK_EX)
+        waiter = threading.Thread(target=lock)
+        waiter.start()
+        time.sleep(0.1)
+        # Delete the lock file under the lock, and lock the new one.
+        lock_path.unlink()
+        new_lock = lock_path.open("a")
+        fcntl.flock(new_lock, fcntl.LOCK_EX)
+    try:
+        assert not locked.wait(timeout=0.2)
+    finally:
+        new_lock.close()
+    waiter.join(timeout=5)
+
+    assert locked.is_set()
+
+
 def test_load_card_words_file_not_found(temp_dir):
     """Test loading card words when the file does not exist."""
     local_dal = LocalDataAccess(root_dir=temp_dir)
@@ -169,3 +315,87 @@ def test_load_clue_words_valid(temp_dir):
     result = local_dal.load_clue_words()
 
     assert result == clue_words
+
+
+def test_load_word_embeddings_file_not_found(temp_dir):
+    """Test loading word embeddings when the file does not exist."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    with pytest.raises(FileNotFoundError, match="Word embeddings file does not exist."):
+        local_dal.load_word_embeddings()
+
+
+def test_load_word_embeddings_valid(temp_dir):
+    """Test loading word embeddings when the file exists."""
+    embeddings_file = temp_dir / "word_embeddings.txt"
+    embeddings_file.write_text("cat 1.0 0.0\ndog 0.0 2.0\n")
+
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    result = local_dal.load_word_embeddings()
+
+    assert result.words == ["cat", "dog"]
+    assert result.vectors.shape == (2, 2)
+
+
+def test_load_clue_index_file_not_found(temp_dir):
+    """Test loading the clue index when it has not been built."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    with pytest.raises(FileNotFoundError, match="Clue index file does not exist."):
+        local_dal.load_clue_index()
+
+
+def test_save_and_load_clue_index(temp_dir):
+    """Test that a saved clue index is stored next to the word lists."""
+    index = IVFIndex.build(["a", "b"], np.eye(2, dtype=np.float32), num_lists=1)
+
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    local_dal.save_clue_index(index)
+    result = local_dal.load_clue_index()
+
+    assert (temp_dir / "clue_index.npz").exists()
+    assert result.words == ["a", "b"]
+
+
+def test_load_similarity_matrices_not_built(temp_dir):
+    """Test loading the similarity matrices before they were built."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    with pytest.raises(FileNotFoundError, match="Similarity matrices do not exist."):
+        local_dal.load_similarity_matrices()
+
+
+def test_iter_game_ids(temp_dir):
+    """Test listing the stored games in order, after a cursor."""
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    assert list(local_dal.iter_game_ids()) == []
+    for game_id in ["b", "c", "a"]:
+        local_dal.save_game(
+            game_id,
+            Game(
+                game_id=game_id,
+                board=create_mock_board(),
+                game_end_status=GameEndStatus.ONGOING,
+                current_turn={"team": AgentType.RED},
+            ),
+        )
+    (local_dal.games_dir / ".a.json.tmp").write_text("")
+
+    assert list(local_dal.iter_game_ids()) == ["a", "b", "c"]
+    assert list(local_dal.iter_game_ids(after="a")) == ["b", "c"]
+    assert list(local_dal.iter_game_ids(after="aa")) == ["b", "c"]
+
+
+def test_get_game_updated_at(temp_dir):
+    local_dal = LocalDataAccess(root_dir=temp_dir)
+    game = Game(
+        game_id="1",
+        board=create_mock_board(),
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn={"team": AgentType.RED},
+    )
+    local_dal.save_game("1", game)
+
+    assert (
+        local_dal.get_game_updated_at("1")
+        == (local_dal.games_dir / "1.json").stat().st_mtime
+    )
+    with pytest.raises(FileNotFoundError):
+        local_dal.get_game_updated_at("2")
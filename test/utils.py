@@ -1,5 +1,12 @@
+from pathlib import Path
+
+import numpy as np
+
 from app.bll.board import AgentPlacements, Board
-from app.bll.types import Card, AgentType
+from app.bll.defaults import DEFAULT_BOARD_SIZE
+from app.bll.embeddings import WordEmbeddings
+from app.bll.game import Game
+from app.bll.types import Card, AgentType, CurrentTurnState, GameEndStatus
 
 
 def get_test_board():
@@ -16,3 +23,74 @@ def get_test_board():
     agent_placements = AgentPlacements.random(random_seed=42)
     board = Board(words=words, agent_placements=agent_placements)
     return board
+
+
+CONCEPT_BY_AGENT_TYPE = {
+    AgentType.RED: "fruit",
+    AgentType.BLUE: "animal",
+    AgentType.INNOCENT: "vehicle",
+    AgentType.BLACK: "weapon",
+}
+CONCEPTS = list(CONCEPT_BY_AGENT_TYPE.values())
+
+
+def get_concept_game(random_seed: int = 42) -> Game:
+    """
+    Builds a full 5x5 game whose card words are named after their hidden agent type,
+    e.g. "red3" is a RED card.
+    """
+    agent_placements = AgentPlacements.random(random_seed=random_seed)
+    words = [
+        [
+            f"{agent_type.value.lower()}{x * DEFAULT_BOARD_SIZE + y}"
+            for y, agent_type in enumerate(row)
+        ]
+        for x, row in enumerate(agent_placements.shadow_board)
+    ]
+    board = Board.from_words_and_placements(words=words, placements=agent_placements)
+    return Game(
+        game_id="concept-game",
+        board=board,
+        game_end_status=GameEndStatus.ONGOING,
+        current_turn=CurrentTurnState(team=agent_placements.starting_color),
+    )
+
+
+def get_concept_embeddings(game: Game, noise: float = 0.05) -> WordEmbeddings:
+    """
+    Builds embeddings where every card word is close to the clue word of its concept,
+    and the concepts are orthogonal to each other.
+    """
+    rng = np.random.default_rng(0)
+    card_words = [card.word for row in game.board.words for card in row]
+    card_types = [
+        agent_type
+        for row in game.board.agent_placements.shadow_board
+        for agent_type in row
+    ]
+    words = CONCEPTS + card_words
+    vectors = np.zeros((len(words), len(CONCEPTS) + 4), dtype=np.float32)
+    for i in range(len(CONCEPTS)):
+        vectors[i, i] = 1.0
+    for i, agent_type in enumerate(card_types, start=len(CONCEPTS)):
+        vectors[i, CONCEPTS.index(CONCEPT_BY_AGENT_TYPE[agent_type])] = 1.0
+        vectors[i] += rng.normal(scale=noise, size=vectors.shape[1])
+    return WordEmbeddings(words, vectors)
+
+
+def write_concept_data_dir(data_dir: Path, game: Game) -> Path:
+    """
+    Writes a data directory (card words, clue words and embeddings) for the words of
+    a concept game, as read by LocalDataAccess.
+    """
+    embeddings = get_concept_embeddings(game)
+    card_words = [card.word for row in game.board.words for card in row]
+    (data_dir / "card_words.txt").write_text("\n".join(card_words))
+    (data_dir / "clue_words.txt").write_text("\n".join(CONCEPTS))
+    (data_dir / "word_embeddings.txt").write_text(
+        "\n".join(
+            " ".join([word, *map(str, vector)])
+            for word, vector in zip(embeddings.words, embeddings.vectors)
+        )
+    )
+    return data_dir